@@ -1,4 +1,6 @@
 import argparse
+import asyncio
+import importlib
 import subprocess
 import os
 import json
@@ -8,14 +10,16 @@ import shutil
 import webbrowser
 import traceback
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple, Any
 
 # --- Core Modules ---
 from src.config import threshold_registry
 from src.postprocess import generate_master_report
 from src.visualization import visualize_report
 from src.utils.logger import setup_logger
+from src.utils import json_io, probe_cache, worker_tuning
 
 # Initialize Logger
 logger = setup_logger("aqc_main")
@@ -47,6 +51,15 @@ VALIDATORS = [
     ("video", "validate_avsync"),
 ]
 
+# Modules that support the --hwaccel flag
+HWACCEL_SUPPORTED = ["validate_structure", "validate_frames", "validate_black_freeze"]
+
+# Validators kept in their own interpreter (ML model state, heavy native memory)
+ISOLATED_VALIDATORS = {"validate_artifacts"}
+
+# --fix corrects loudness once this validator's report asks for it
+CORRECTION_TRIGGER = "validate_loudness"
+
 def check_dependencies() -> None:
     """Ensure ffmpeg dependencies are installed."""
     if not shutil.which("ffmpeg"):
@@ -56,6 +69,20 @@ def check_dependencies() -> None:
         logger.critical("FFprobe not found in PATH. Please install FFmpeg.")
         sys.exit(1)
 
+def _emit_progress(pct: int, step: str) -> None:
+    """
+    Writes one `[PROGRESS] <pct> - <step>` line (parsed by the Java backend)
+    straight to the stdout file descriptor: a single unbuffered write, no
+    print/flush pair. Falls back to print when stdout has no real fd.
+    """
+    line = f"[PROGRESS] {pct} - {step}\n"
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        print(line, end="", flush=True)
+        return
+    os.write(fd, line.encode("utf-8"))
+
 def print_governance_header(mode: str) -> Dict[str, Any]:
     """
     Displays and returns Compliance & Governance info at startup.
@@ -81,63 +108,145 @@ def print_governance_header(mode: str) -> Dict[str, Any]:
     
     return gov
 
-def run_validator_with_retry(category: str, module: str, input_video: Path, outdir: Path, mode: str, hwaccel: Optional[str] = None) -> Dict[str, Any]:
+def load_validators() -> Dict[str, Callable[..., Dict[str, Any]]]:
     """
-    Executes a single validator module as a subprocess with retry logic.
+    Imports every validator module once and returns its in-process `run` entry point.
+    Modules listed in ISOLATED_VALIDATORS, or that fail to import, are left out
+    and fall back to the subprocess path.
     """
-    report_path = outdir / f"report_{module}.json"
-    module_path = f"src.validators.{category}.{module}"
-    
+    entry_points = {}
+    for category, module in VALIDATORS:
+        fn = _import_validator(category, module)
+        if fn is not None:
+            entry_points[module] = fn
+    return entry_points
+
+def _import_validator(category: str, module: str) -> Optional[Callable[..., Dict[str, Any]]]:
+    if module in ISOLATED_VALIDATORS:
+        return None
+    try:
+        mod = importlib.import_module(f"src.validators.{category}.{module}")
+        return getattr(mod, "run")
+    except Exception as e:
+        logger.warning(f"{module} unavailable in-process ({e}). Using subprocess isolation.")
+        return None
+
+def _validator_task(category: str, module: str, input_video: Path, outdir: Path, mode: str, hwaccel: Optional[str]) -> Dict[str, Any]:
+    """
+    Pool worker entry point. Imports the validator inside the worker process
+    (cached in sys.modules for later tasks) and runs it with retries.
+    """
+    validator_fn = _import_validator(category, module)
+    return run_validator_with_retry(category, module, input_video, outdir, mode, hwaccel, validator_fn)
+
+class ValidatorSetupError(RuntimeError):
+    """Raised when an isolated validator cannot even be imported (not worth retrying)."""
+
+def _isolated_cmd(category: str, module: str, input_video: Path, report_path: Path, mode: str, hwaccel: Optional[str]) -> List[str]:
     cmd = [
-        sys.executable, "-m", module_path,
+        sys.executable, "-m", f"src.validators.{category}.{module}",
         "--input", str(input_video),
         "--output", str(report_path),
         "--mode", mode
     ]
-    
+
     if hwaccel and hwaccel != "none":
         cmd.extend(["--hwaccel", hwaccel])
+    return cmd
 
-    for attempt in range(1, MAX_RETRIES + 2):
-        start = time.time()
-        status = "UNKNOWN"
-        
-        try:
-            result = subprocess.run(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-            )
-            duration = round(time.time() - start, 2)
-            
-            # 1. Check Exit Code & File Existence
-            if result.returncode == 0 and report_path.exists():
-                try:
-                    with open(report_path, "r", encoding="utf-8") as f:
-                        d = json.load(f)
-                        status = d.get("effective_status", d.get("status", "UNKNOWN"))
-                    
-                    # Log successful execution
-                    logger.info(f" + {module:<30} | {status:<10} | {duration}s")
-                    return {
-                        "module": module,
-                        "status": status,
-                        "duration_sec": duration,
-                        "report": str(report_path)
-                    }
-                except json.JSONDecodeError:
-                    logger.warning(f"{module} produced corrupt JSON on attempt {attempt}")
-            else:
-                # Log failure
-                if attempt > MAX_RETRIES:
-                    logger.error(f"{module} error:\n{result.stderr[:200]}")
-                else:
-                    logger.warning(f"{module} failed (Exit: {result.returncode}) on attempt {attempt}")
+def _isolated_report(module: str, returncode: int, stderr_bytes: bytes, report_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Interprets a finished validator subprocess. Returns the parsed report, or None on failure.
+    """
+    if returncode != 0 or not report_path.exists():
+        stderr = (stderr_bytes or b"").decode("utf-8", "replace")
+        logger.warning(f"{module} failed (Exit: {returncode}):\n{stderr[:200]}")
+        if "ImportError" in stderr or "ModuleNotFoundError" in stderr:
+            raise ValidatorSetupError(f"{module} cannot be imported")
+        return None
 
-        except Exception as e:
-            logger.error(f"Execution error on {module}: {e}")
+    return json_io.read_json(report_path)
+
+def _run_isolated(category: str, module: str, input_video: Path, report_path: Path, mode: str, hwaccel: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Executes a validator in a separate interpreter. Returns the parsed report, or None on failure.
+    """
+    # stdout (chatty progress) is discarded; stderr stays raw bytes and is
+    # only decoded on the failure path
+    result = subprocess.run(
+        _isolated_cmd(category, module, input_video, report_path, mode, hwaccel),
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    return _isolated_report(module, result.returncode, result.stderr, report_path)
+
+async def _forward_lines(stream: asyncio.StreamReader, module: str) -> None:
+    """
+    Copies a child's stdout to ours line by line, as it arrives, prefixed with
+    "[module] " so interleaved output (including untagged prints) stays attributable.
+    """
+    prefix = f"[{module}] ".encode()
+    async for line in stream:
+        sys.stdout.buffer.write(prefix + line)
+        sys.stdout.flush()
+
+async def _run_isolated_async(category: str, module: str, input_video: Path, report_path: Path, mode: str, hwaccel: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Same as _run_isolated, but awaits the child so other validators proceed meanwhile.
+    The child's output is streamed to our stdout live, interleaved with the
+    other validators' output. If we are cancelled or forwarding fails, the
+    child is killed and reaped rather than left running.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *_isolated_cmd(category, module, input_video, report_path, mode, hwaccel),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, limit=1 << 20
+    )
+    try:
+        _, stderr, _ = await asyncio.gather(_forward_lines(proc.stdout, module), proc.stderr.read(), proc.wait())
+    finally:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+    return _isolated_report(module, proc.returncode, stderr, report_path)
 
-        # Wait before retry
-        if attempt <= MAX_RETRIES:
-            time.sleep(RETRY_DELAY_SEC)
+def _classify_failure(e: Exception) -> Tuple[str, bool]:
+    """
+    Returns (reason, retryable) for a failed validator attempt.
+    """
+    # Deterministic failures: retrying cannot help
+    if isinstance(e, json.JSONDecodeError):
+        return "corrupt JSON", False
+    if isinstance(e, (ImportError, ValidatorSetupError)):
+        return f"import failure: {e}", False
+    # Transient failures: I/O, timeouts, memory pressure
+    if isinstance(e, (OSError, subprocess.TimeoutExpired, MemoryError)):
+        return f"{type(e).__name__}: {e}", True
+    return f"{type(e).__name__}: {e}", False
+
+def _backoff_delay(attempt: int) -> float:
+    # Exponential backoff before retry
+    return RETRY_DELAY_SEC * 2 ** (attempt - 1)
+
+def _success_result(module: str, report: Dict[str, Any], report_path: Path, duration: float, failures: List[str]) -> Dict[str, Any]:
+    status = report.get("effective_status", report.get("status", "UNKNOWN"))
+
+    if failures:
+        logger.warning(f"{module} succeeded after {len(failures)} retr{'y' if len(failures) == 1 else 'ies'} ({'; '.join(failures)})")
+    # Log successful execution
+    logger.info(f" + {module:<30} | {status:<10} | {duration}s")
+    return {
+        "module": module,
+        "status": status,
+        "duration_sec": duration,
+        "report": str(report_path),
+        # Parsed report, handed to the Master Report without a re-read
+        "report_data": report
+    }
+
+def _crash_result(module: str, report_path: Path, failures: List[str]) -> Dict[str, Any]:
+    logger.error(f"{module} failed after {len(failures)} attempt(s): {'; '.join(failures)}")
 
     # Fallback if all retries fail
     logger.error(f" ! {module:<30} | CRASHED    | 0.0s")
@@ -147,144 +256,284 @@ def run_validator_with_retry(category: str, module: str, input_video: Path, outd
         "module": module,
         "status": "CRASHED",
         "effective_status": "CRASHED",
-        "details": {"error": "Module failed after retries", "log": "Subprocess error"}
+        "details": {"error": "Module failed after retries", "log": "Validator error"}
     }
-    with open(report_path, "w", encoding="utf-8") as f:
-        json.dump(crash_data, f, indent=4)
+    json_io.write_json(report_path, crash_data)
 
     return {
         "module": module,
         "status": "CRASHED",
         "duration_sec": 0.0,
-        "report": str(report_path)
+        "report": str(report_path),
+        "report_data": crash_data
     }
 
+def run_validator_with_retry(category: str, module: str, input_video: Path, outdir: Path, mode: str, hwaccel: Optional[str] = None, validator_fn: Optional[Callable[..., Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Executes a single validator module with retry logic.
+    Runs in-process when `validator_fn` is given, otherwise as an isolated subprocess.
+    """
+    report_path = outdir / f"report_{module}.json"
+    failures: List[str] = []
+
+    for attempt in range(1, MAX_RETRIES + 2):
+        start = time.time()
+        retryable = True
+        
+        try:
+            if validator_fn is not None:
+                report = validator_fn(str(input_video), str(report_path), mode, hwaccel)
+            else:
+                report = _run_isolated(category, module, input_video, report_path, mode, hwaccel)
+
+            if report is not None and report_path.exists():
+                return _success_result(module, report, report_path, round(time.time() - start, 2), failures)
+            failures.append("no report")
+        except Exception as e:
+            reason, retryable = _classify_failure(e)
+            failures.append(reason)
+
+        if not retryable or attempt > MAX_RETRIES:
+            break
+        time.sleep(_backoff_delay(attempt))
+
+    return _crash_result(module, report_path, failures)
+
+async def run_isolated_with_retry_async(category: str, module: str, input_video: Path, outdir: Path, mode: str, hwaccel: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Async twin of run_validator_with_retry for subprocess-isolated validators.
+    """
+    report_path = outdir / f"report_{module}.json"
+    failures: List[str] = []
+
+    for attempt in range(1, MAX_RETRIES + 2):
+        start = time.time()
+        retryable = True
+
+        try:
+            report = await _run_isolated_async(category, module, input_video, report_path, mode, hwaccel)
+            if report is not None and report_path.exists():
+                return _success_result(module, report, report_path, round(time.time() - start, 2), failures)
+            failures.append("no report")
+        except Exception as e:
+            reason, retryable = _classify_failure(e)
+            failures.append(reason)
+
+        if not retryable or attempt > MAX_RETRIES:
+            break
+        await asyncio.sleep(_backoff_delay(attempt))
+
+    return _crash_result(module, report_path, failures)
+
+async def _run_validators_async(input_video: Path, outdir: Path, mode: str, hwaccel: str, max_parallel: int, total_steps: int,
+                                fix: bool = False) -> List[Dict[str, Any]]:
+    """
+    Schedules every validator concurrently, bounded by a Semaphore(max_parallel).
+    In-process validators run on a ProcessPoolExecutor; isolated ones are awaited
+    as asyncio subprocesses, so they never tie up a pool worker while they wait.
+    With `fix`, loudness correction starts as soon as validate_loudness asks
+    for it, alongside the validators still running.
+    Results come back in VALIDATORS order.
+    """
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(max_parallel)
+    completed = 0
+    correction: Optional[asyncio.Task] = None
+
+    pooled = sum(1 for _, module in VALIDATORS if module not in ISOLATED_VALIDATORS)
+    workers = max(1, min(max_parallel, pooled))
+    # One native thread per worker; pin to cores only when the pool spans them all
+    pin_workers = workers >= (os.cpu_count() or 1)
+
+    # Fresh pool per run: workers inherit this run's environment (e.g. AQC_PROBE_CACHE)
+    with ProcessPoolExecutor(max_workers=workers, initializer=worker_tuning.init_worker,
+                             initargs=(pin_workers,)) as pool:
+
+        async def run_one(category: str, module: str) -> Dict[str, Any]:
+            nonlocal completed, correction
+            use_accel = hwaccel if (module in HWACCEL_SUPPORTED) else None
+            async with sem:
+                try:
+                    if module in ISOLATED_VALIDATORS:
+                        res = await run_isolated_with_retry_async(category, module, input_video, outdir, mode, use_accel)
+                    else:
+                        try:
+                            res = await loop.run_in_executor(pool, _validator_task, category, module, input_video, outdir, mode, use_accel)
+                        except BrokenProcessPool:
+                            # A native crash (in this or another pooled validator) took the
+                            # pool down: rerun this one in its own interpreter, with retries
+                            logger.warning(f"{module}: validator pool broke; retrying in an isolated subprocess")
+                            res = await run_isolated_with_retry_async(category, module, input_video, outdir, mode, use_accel)
+                except Exception as e:
+                    res = _crash_result(module, outdir / f"report_{module}.json", [f"worker failure: {e}"])
+
+            # Single event loop thread: the counter needs no lock
+            completed += 1
+            progress_pct = int(((completed - 1) / total_steps) * 100)  # Same scale as the serial loop (<90)
+            _emit_progress(progress_pct, f"Finished {module}")
+
+            if fix and module == CORRECTION_TRIGGER and _needs_correction(res):
+                correction = asyncio.create_task(run_correction_async(input_video, outdir))
+            return res
+
+        results = list(await asyncio.gather(*(run_one(category, module) for category, module in VALIDATORS)))
+
+    if correction is not None:
+        await correction
+    return results
+
+def _needs_correction(result: Dict[str, Any]) -> bool:
+    """
+    Whether a finished validate_loudness run asks for auto-correction. Its
+    status is what the Master Report would show, so no need to wait for that.
+    """
+    audio_status = result.get("status", "PASSED")
+    if audio_status in ["REJECTED", "WARNING"]:
+        logger.warning(f"Audio QC Status is {audio_status}. Initiating repair...")
+        return True
+    logger.info("Audio passed QC. No correction needed.")
+    return False
+
+def _correction_cmd(input_video: Path, output_video: Path) -> List[str]:
+    return [
+        sys.executable, "-m", "src.postprocess.correct_loudness",
+        "--input", str(input_video), "--output", str(output_video)
+    ]
+
 def run_correction(input_video: Path, outdir: Path) -> None:
     """Attempts to auto-correct audio loudness."""
     logger.info("\n--- AUTO-CORRECTION (Loudness) ---")
     output_video = outdir / f"fixed_{input_video.name}"
-    cmd = [
-        sys.executable, "-m", "src.postprocess.correct_loudness",
-        "--input", str(input_video), "--output", str(output_video)
-    ]
     try:
-        subprocess.run(cmd, check=True)
+        subprocess.run(_correction_cmd(input_video, output_video), check=True)
         logger.info(f" [SUCCESS] Corrected file saved to: {output_video}")
     except subprocess.CalledProcessError:
         logger.error(" [FAILED] Correction workflow failed.")
 
-def main():
-    check_dependencies()
-
-    parser = argparse.ArgumentParser(description="AQC Core QC Pipeline")
-    parser.add_argument("--input", required=True, help="Path to input video file")
-    parser.add_argument("--outdir", required=True, help="Base directory to save reports")
-    parser.add_argument("--mode", choices=["strict", "netflix_hd", "youtube", "ott"], default="strict", help="QC Profile")
-    parser.add_argument("--fix", action="store_true", help="Attempt to fix audio loudness errors")
-    parser.add_argument("--hwaccel", default="none", help="Hardware acceleration device (e.g., cuda, vulkan, none)")
-
-    args = parser.parse_args()
+async def run_correction_async(input_video: Path, outdir: Path) -> None:
+    """Same as run_correction, but awaits the child so validators proceed meanwhile."""
+    logger.info("\n--- AUTO-CORRECTION (Loudness) ---")
+    output_video = outdir / f"fixed_{input_video.name}"
+    proc = await asyncio.create_subprocess_exec(*_correction_cmd(input_video, output_video))
+    if await proc.wait() == 0:
+        logger.info(f" [SUCCESS] Corrected file saved to: {output_video}")
+    else:
+        logger.error(" [FAILED] Correction workflow failed.")
 
-    input_video = Path(args.input).resolve()
-    base_outdir = Path(args.outdir).resolve()
-    
-    if not input_video.exists():
-        logger.critical(f"Input file not found: {input_video}")
-        sys.exit(1)
+def run_pipeline(input_video: Path, base_outdir: Path, mode: str = "strict", fix: bool = False,
+                 hwaccel: str = "none", max_parallel: int = 1, open_dashboard: bool = False) -> Path:
+    """
+    Runs every validator on `input_video` and builds the Master Report + dashboard.
+    Importable so batch/segment runners can reuse a warm interpreter.
 
+    Returns:
+        Path: Location of Master_Report.json (may not exist if every validator failed).
+    """
     # Output folder setup
     outdir = base_outdir / f"{input_video.stem}_qc_report"
     outdir.mkdir(parents=True, exist_ok=True)
 
+    # Probe the input once; validators (and pool workers) read the shared blob
+    probe_cache.prime(input_video, outdir)
+
     # 1. Governance Info
-    gov_info = print_governance_header(args.mode)
+    print_governance_header(mode)
     
-    if args.hwaccel != "none":
-        logger.info(f" [ACCEL] Hardware Acceleration Requested: {args.hwaccel}")
+    if hwaccel != "none":
+        logger.info(f" [ACCEL] Hardware Acceleration Requested: {hwaccel}")
 
     results = []
 
-    # Define modules that support the --hwaccel flag
-    HWACCEL_SUPPORTED = ["validate_structure", "validate_frames"]
-
     total_steps = len(VALIDATORS) + 1  # +1 for report generation
-    
-    for i, (category, module) in enumerate(VALIDATORS):
-        # Calculate progress
-        progress_pct = int(((i) / total_steps) * 100)
-        print(f"[PROGRESS] {progress_pct} - Running {module}...")
-        sys.stdout.flush()
+    max_parallel = max(1, max_parallel)
 
-        # Determine if we should pass the acceleration flag
-        use_accel = args.hwaccel if (module in HWACCEL_SUPPORTED) else None
-        
-        res = run_validator_with_retry(category, module, input_video, outdir, args.mode, use_accel)
-        results.append(res)
+    # Validators are independent DAG nodes (same input, disjoint outputs);
+    # only the Master Report below depends on all of them.
+    if max_parallel == 1:
+        # Import validators once; they share this interpreter's module cache
+        validator_fns = load_validators()
+
+        for i, (category, module) in enumerate(VALIDATORS):
+            # Calculate progress
+            progress_pct = int(((i) / total_steps) * 100)
+            _emit_progress(progress_pct, f"Running {module}...")
+
+            # Determine if we should pass the acceleration flag
+            use_accel = hwaccel if (module in HWACCEL_SUPPORTED) else None
+            
+            res = run_validator_with_retry(category, module, input_video, outdir, mode, use_accel, validator_fns.get(module))
+            results.append(res)
+            if fix and module == CORRECTION_TRIGGER and _needs_correction(res):
+                run_correction(input_video, outdir)
+    else:
+        logger.info(f" [PARALLEL] Running {len(VALIDATORS)} validators, up to {max_parallel} at a time")
+        results = asyncio.run(_run_validators_async(input_video, outdir, mode, hwaccel, max_parallel, total_steps, fix))
 
     # 3. AGGREGATION
     reports = [r["report"] for r in results if Path(r["report"]).exists()]
+    # Reports the validators handed back already parsed; generate_master skips re-reading them
+    preloaded = {r["report"]: r["report_data"] for r in results if r.get("report_data") is not None}
     master_report_path = outdir / "Master_Report.json"
     dashboard_path = outdir / "dashboard.html"
 
     if reports:
-        print(f"[PROGRESS] 90 - Generating Master Report...")
-        sys.stdout.flush()
+        _emit_progress(90, "Generating Master Report...")
         logger.info("\n--- GENERATING REPORTS ---")
         
-        # Generate Master JSON
-        subprocess.run([
-            sys.executable, "-m", "src.postprocess.generate_master_report",
-            "--inputs", *reports, "--output", str(master_report_path), "--profile", args.mode
-        ])
+        # Generate Master JSON (governance embedded by the generator, one write)
+        master_data = None
+        try:
+            master_data = generate_master_report.generate_master(
+                reports, master_report_path, mode, threshold_registry.get_governance_info(mode), preloaded
+            )
+        except Exception as e:
+            logger.error(f"Master Report generation failed: {e}")
         
-        # Inject Governance Info
         if master_report_path.exists():
-            try:
-                with open(master_report_path, "r") as f:
-                    data = json.load(f)
-                
-                data["governance"] = gov_info
-                
-                with open(master_report_path, "w") as f:
-                    json.dump(data, f, indent=4)
-                
-                logger.info(f" [OK] Master Report: {master_report_path.name} (Governance Signed)")
-            except Exception as e:
-                logger.warning(f"Failed to sign Master Report: {e}")
+            logger.info(f" [OK] Master Report: {master_report_path.name} (Governance Signed)")
 
             # Generate Dashboard
-            subprocess.run([
-                sys.executable, "-m", "src.visualization.visualize_report",
-                "--input", str(master_report_path), "--output", str(dashboard_path)
-            ])
-            logger.info(f" [OK] Dashboard:      {dashboard_path.name}")
-
-            # Auto-Correction Logic
-            if args.fix:
-                try:
-                    with open(master_report_path, "r", encoding="utf-8") as f:
-                        master = json.load(f)
-                    audio_module = master.get("modules", {}).get("validate_loudness", {})
-                    audio_status = audio_module.get("effective_status", "PASSED")
-                    if audio_status in ["REJECTED", "WARNING"]:
-                        logger.warning(f"Audio QC Status is {audio_status}. Initiating repair...")
-                        run_correction(input_video, outdir)
-                    else:
-                        logger.info("Audio passed QC. No correction needed.")
-                except Exception as e:
-                    logger.warning(f"Could not parse Master Report for correction check: {e}")
+            try:
+                visualize_report.create_interactive_dashboard(str(master_report_path), str(dashboard_path), master_data)
+                logger.info(f" [OK] Dashboard:      {dashboard_path.name}")
+            except Exception as e:
+                logger.error(f"Dashboard generation failed: {e}")
 
-    print(f"[PROGRESS] 100 - Analysis Complete")
-    sys.stdout.flush()
+    _emit_progress(100, "Analysis Complete")
     logger.info("\n[DONE] QC pipeline completed")
 
-    if dashboard_path.exists():
+    if open_dashboard and dashboard_path.exists():
         logger.info("Opening Dashboard...")
         try:
             webbrowser.open(dashboard_path.absolute().as_uri())
         except:
             pass
 
+    return master_report_path
+
+def main():
+    check_dependencies()
+
+    parser = argparse.ArgumentParser(description="AQC Core QC Pipeline")
+    parser.add_argument("--input", required=True, help="Path to input video file")
+    parser.add_argument("--outdir", required=True, help="Base directory to save reports")
+    parser.add_argument("--mode", choices=["strict", "netflix_hd", "youtube", "ott"], default="strict", help="QC Profile")
+    parser.add_argument("--fix", action="store_true", help="Attempt to fix audio loudness errors")
+    parser.add_argument("--hwaccel", default="none", help="Hardware acceleration device (e.g., cuda, vulkan, none)")
+    parser.add_argument("--max-parallel", type=int, default=min(os.cpu_count() or 1, len(VALIDATORS)),
+                        help="Max validators run concurrently (1 = serial, in-process)")
+
+    args = parser.parse_args()
+
+    input_video = Path(args.input).resolve()
+    base_outdir = Path(args.outdir).resolve()
+    
+    if not input_video.exists():
+        logger.critical(f"Input file not found: {input_video}")
+        sys.exit(1)
+
+    run_pipeline(input_video, base_outdir, args.mode, args.fix, args.hwaccel, args.max_parallel, open_dashboard=True)
+
 if __name__ == "__main__":
     try:
         main()
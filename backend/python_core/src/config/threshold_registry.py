@@ -1,5 +1,8 @@
 import json
 import hashlib
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
 
 # ---------------------------------------------------------
 # 1. PER-PLATFORM COMPLIANCE PROFILES
@@ -131,34 +134,110 @@ LICENSE_MANIFEST = {
 # ---------------------------------------------------------
 # 3. LOGIC & VERSIONING
 # ---------------------------------------------------------
+@lru_cache(maxsize=8)
 def get_profile(profile_name):
     """
     Returns the requested profile configuration or defaults to 'strict'.
+    Profiles are frozen (read-only at every level); use copy_profile() for
+    a mutable copy.
     """
     # Fallback to strict if unknown
-    cfg = PROFILES.get(profile_name, PROFILES["strict"])
-    return cfg
+    return PROFILES.get(profile_name, PROFILES["strict"])
 
 def get_thresholds(profile_name):
     """Alias for get_profile to maintain backward compatibility with new modules."""
     return get_profile(profile_name)
 
+def _compute_config_hash(cfg):
+    # Sort keys to ensure consistent hashing
+    cfg_str = json.dumps(cfg, sort_keys=True)
+    return hashlib.sha256(cfg_str.encode()).hexdigest()[:8]
+
+def _freeze(obj):
+    """Recursively wraps dicts in MappingProxyType and turns lists into tuples."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+def _thaw(obj):
+    if isinstance(obj, MappingProxyType):
+        return {k: _thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [_thaw(v) for v in obj]
+    return obj
+
+def copy_profile(profile_name):
+    """
+    Mutable deep copy of a profile (MappingProxyType cannot be deep-copied).
+    """
+    return _thaw(get_profile(profile_name))
+
+# Profiles never change after import: hash each one exactly once
+# (on the plain dicts, before freezing)
+_HASH_CACHE = {name: _compute_config_hash(cfg) for name, cfg in PROFILES.items()}
+
+# Freeze the singleton so no module can mutate thresholds for the whole process
+PROFILES = _freeze(PROFILES)
+
+@lru_cache(maxsize=8)
 def get_config_hash(profile_name):
     """
     3. Versioned Configuration
     Generates a unique SHA256 short-hash for the specific configuration state.
     This guarantees Reproducibility: if the hash is the same, the pass/fail criteria were identical.
     """
-    cfg = get_profile(profile_name)
-    # Sort keys to ensure consistent hashing
-    cfg_str = json.dumps(cfg, sort_keys=True)
-    return hashlib.sha256(cfg_str.encode()).hexdigest()[:8]
+    name = profile_name if profile_name in PROFILES else "strict"
+    return _HASH_CACHE[name]
 
-def get_governance_info(profile_name):
+def _build_governance(profile_name):
     cfg = get_profile(profile_name)
     return {
         "active_profile": profile_name,
         "config_version_hash": get_config_hash(profile_name),
         "compliance_standard": cfg.get("description", "Custom"),
         "licenses": LICENSE_MANIFEST
-    }
\ No newline at end of file
+    }
+
+# Governance blocks are built once at import and kept frozen, so no caller
+# can edit the block (or LICENSE_MANIFEST) that later runs embed
+_GOVERNANCE_CACHE = {name: _freeze(_build_governance(name)) for name in PROFILES}
+
+def get_governance_info(profile_name):
+    """
+    Governance block for `profile_name`, as a fresh mutable copy (safe to
+    embed in a report and serialize).
+    """
+    gov = _GOVERNANCE_CACHE.get(profile_name)
+    if gov is None:
+        gov = _freeze(_build_governance(profile_name))
+    return _thaw(gov)
+
+# ---------------------------------------------------------
+# 4. SIGNAL PROFILES (config/signal_profiles.json)
+# ---------------------------------------------------------
+SIGNAL_PROFILES_PATH = Path(__file__).parent / "signal_profiles.json"
+
+# Pipeline mode -> profile key in signal_profiles.json; anything else is STRICT
+SIGNAL_PROFILE_KEYS = {"netflix": "NETFLIX_HD", "youtube": "YOUTUBE"}
+
+@lru_cache(maxsize=8)
+def _load_signal_profiles(path_str):
+    """Parsed, frozen "profiles" block of one signal profiles file ({} if absent)."""
+    path = Path(path_str)
+    if not path.exists():
+        return MappingProxyType({})
+    with open(path, "r") as f:
+        return _freeze(json.load(f).get("profiles", {}))
+
+def get_signal_profile(mode, validator):
+    """
+    Mutable copy of `validator`'s section of the signal profile for `mode`,
+    or None when the file, profile or section is missing. The file is read
+    and parsed once per process.
+    """
+    profiles = _load_signal_profiles(str(SIGNAL_PROFILES_PATH))
+    profile = profiles.get(SIGNAL_PROFILE_KEYS.get(mode.lower(), "STRICT"), {})
+    section = profile.get(validator)
+    return _thaw(section) if section is not None else None
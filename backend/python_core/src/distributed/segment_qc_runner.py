@@ -1,18 +1,68 @@
 import argparse
+import atexit
+import csv
+import multiprocessing
 import subprocess
 import sys
 import os
 import shutil
 import json
-import csv
+import hashlib
 import time
+import numpy as np
 from pathlib import Path
 from concurrent.futures import ProcessPoolExecutor, as_completed
 
-def split_video(input_path, segment_dir, segment_time=300):
+# Add project root to sys.path for internal imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.utils import json_io
+
+# Optional streaming parser: merge segment reports without materializing them
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+STATUS_RANK = {"PASSED": 1, "WARNING": 2, "REJECTED": 3, "ERROR": 4}
+
+# Segment cache (see iter_cached_segments). Opt-in: only used when a cache
+# directory is passed (--cache-dir) or AQC_CACHE_DIR is set.
+CACHE_DIR_ENV = "AQC_CACHE_DIR"
+CACHE_MAX_GB_ENV = "AQC_CACHE_MAX_GB"
+DEFAULT_CACHE_MAX_GB = 20
+FINGERPRINT_HEAD_BYTES = 1 << 20
+# A lock this old is left over from a crashed run and may be taken over
+CACHE_LOCK_STALE_SEC = 6 * 3600
+
+# Persistent worker pool (see get_pool)
+_POOL = None
+
+# How often to check segments.csv for new rows while ffmpeg is splitting
+SPLIT_POLL_SEC = 0.25
+
+def _parse_segment_row(row):
+    """
+    (filename, start_time) from one complete segments.csv row (bytes), or None
+    for blank/malformed rows. ffmpeg CSV-quotes names containing commas or
+    quotes, and start times can be negative (e.g. -0.021333), so the row goes
+    through csv.reader rather than a plain split.
+    """
+    text = row.decode("utf-8").strip("\r")
+    if not text:
+        return None
+    try:
+        fields = next(csv.reader([text]))
+        return fields[0], float(fields[1])
+    except (StopIteration, IndexError, ValueError):
+        return None
+
+def iter_segments(input_path, segment_dir, segment_time=300):
     """
     Splits video into chunks using stream copy (fast, no quality loss).
-    Returns a list of (segment_filename, start_time_seconds).
+    Yields (segment_path, start_time_seconds) as soon as ffmpeg finishes each
+    chunk, so QC can start while the rest of the file is still being split.
+    Raises CalledProcessError if ffmpeg fails.
     """
     input_path = Path(input_path).resolve()
     segment_dir = Path(segment_dir).resolve()
@@ -22,12 +72,15 @@ def split_video(input_path, segment_dir, segment_time=300):
     seg_prefix = input_path.stem
     out_pattern = segment_dir / f"{seg_prefix}_%03d.mp4"
     list_file = segment_dir / "segments.csv"
+    if list_file.exists():
+        list_file.unlink()
 
     print(f"[SPLIT] Slicing {input_path.name} into {segment_time}s chunks...")
     
     # FFmpeg command to segment
     # -c copy: Instant split (snaps to nearest keyframe)
-    # -segment_list_type csv: Generates a list with exact start/end times
+    # -segment_list_type csv: Generates a list with exact start/end times,
+    #   one row appended per finished chunk
     cmd = [
         "ffmpeg", "-y",
         "-i", str(input_path),
@@ -40,49 +93,338 @@ def split_video(input_path, segment_dir, segment_time=300):
         str(out_pattern)
     ]
     
-    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-    
-    # Parse the CSV to get exact start times (crucial for accurate reporting)
-    segments = []
-    if list_file.exists():
-        with open(list_file, 'r') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                # CSV Format: filename, start_time, end_time
-                if row:
-                    seg_name = row[0]
-                    start_time = float(row[1])
-                    segments.append((segment_dir / seg_name, start_time))
-    
-    print(f"[SPLIT] Created {len(segments)} segments.")
-    return segments
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Tail the CSV (crucial for accurate reporting: exact start times)
+    consumed = 0
+    pending = b""
+    count = 0
+    try:
+        while True:
+            finished = proc.poll() is not None
+            if list_file.exists():
+                with open(list_file, 'rb') as f:
+                    f.seek(consumed)
+                    chunk = f.read()
+                    consumed = f.tell()
+                pending += chunk
+                *rows, pending = pending.split(b"\n")
+                for row in rows:
+                    # CSV Format: filename, start_time, end_time
+                    parsed = _parse_segment_row(row)
+                    if parsed:
+                        count += 1
+                        yield segment_dir / parsed[0], parsed[1]
+            if finished:
+                break
+            time.sleep(SPLIT_POLL_SEC)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+    print(f"[SPLIT] Created {count} segments.")
+
+def split_video(input_path, segment_dir, segment_time=300):
+    """
+    Splits video into chunks and returns a list of (segment_filename, start_time_seconds).
+    """
+    return list(iter_segments(input_path, segment_dir, segment_time))
+
+def _input_fingerprint(input_path, segment_time):
+    """
+    Cheap identity for a source file: SHA1 of the first 1 MiB + size + mtime.
+    Never reads the whole (possibly multi-GB) file.
+    """
+    st = input_path.stat()
+    h = hashlib.sha1()
+    with open(input_path, "rb") as f:
+        h.update(f.read(FINGERPRINT_HEAD_BYTES))
+    h.update(f"{st.st_size}:{st.st_mtime_ns}:{segment_time}".encode())
+    return h.hexdigest()
+
+def _link_into(src, dst):
+    """Hardlink src -> dst; symlink across filesystems; copy as a last resort."""
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        try:
+            dst.symlink_to(src)
+        except OSError:
+            shutil.copy2(src, dst)
+
+def _acquire_lock(lock):
+    """
+    Creates the lock file atomically. False if another run holds it; a lock
+    older than CACHE_LOCK_STALE_SEC is assumed dead and taken over.
+    """
+    try:
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        pass
+    try:
+        if time.time() - lock.stat().st_mtime < CACHE_LOCK_STALE_SEC:
+            return False
+        lock.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        return False
+
+def _release_lock(lock):
+    try:
+        lock.unlink()
+    except FileNotFoundError:
+        pass
+
+def _evict_lru(cache_root, max_bytes, keep=None):
+    """
+    Deletes least recently used entries (oldest .complete marker; hits touch
+    it) until the cache fits in max_bytes. Entries locked by another run are
+    skipped, as is `keep`.
+    """
+    entries = []
+    for entry in cache_root.iterdir():
+        if not entry.is_dir():
+            continue
+        marker = entry / ".complete"
+        try:
+            used = (marker if marker.exists() else entry).stat().st_mtime
+            size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+        except OSError:
+            continue  # Removed by another run while scanning
+        entries.append((used, size, entry))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        if entry == keep:
+            continue
+        lock = entry.with_name(entry.name + ".lock")
+        if not _acquire_lock(lock):
+            continue
+        try:
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            print(f"[SPLIT] Evicted cached segments {entry.name}")
+        finally:
+            _release_lock(lock)
+
+def iter_cached_segments(input_path, temp_dir, cache_root, segment_time=300, max_bytes=None):
+    """
+    Same contract as iter_segments, backed by a per-input cache under
+    cache_root. Repeat runs of the same input link the existing chunks into
+    temp_dir instead of rewriting them. Each entry is guarded by a lock file;
+    if another run holds it, this run splits uncached into temp_dir. After a
+    new split the cache is trimmed to max_bytes (least recently used first).
+    """
+    input_path = Path(input_path).resolve()
+    temp_dir = Path(temp_dir).resolve()
+    temp_dir.mkdir(parents=True, exist_ok=True)
+
+    cache_root = Path(cache_root).expanduser().resolve()
+    cache_root.mkdir(parents=True, exist_ok=True)
+    key = _input_fingerprint(input_path, segment_time)
+    cache_dir = cache_root / key
+    marker = cache_dir / ".complete"
+    lock = cache_root / f"{key}.lock"
+
+    if not _acquire_lock(lock):
+        print(f"[SPLIT] Cache entry {key} is in use; splitting without the cache.")
+        yield from iter_segments(input_path, temp_dir, segment_time)
+        return
+
+    if marker.exists():
+        # Hit: link everything before yielding so a slow consumer doesn't hold the lock
+        print(f"[SPLIT] Cache hit: reusing segments from {cache_dir}")
+        linked = []
+        try:
+            marker.touch()  # LRU recency
+            data = (cache_dir / "segments.csv").read_bytes()
+            for row in data.split(b"\n"):
+                parsed = _parse_segment_row(row)
+                if parsed:
+                    name, start_time = parsed
+                    dst = temp_dir / name
+                    _link_into(cache_dir / name, dst)
+                    linked.append((dst, start_time))
+        finally:
+            _release_lock(lock)
+        yield from linked
+        return
+
+    completed = False
+    try:
+        # Miss: split straight into the cache, then expose each chunk in temp_dir
+        if cache_dir.exists():
+            shutil.rmtree(cache_dir)  # Stale partial split
+        for seg_path, start_time in iter_segments(input_path, cache_dir, segment_time):
+            dst = temp_dir / seg_path.name
+            _link_into(seg_path, dst)
+            yield dst, start_time
+        marker.touch()
+        completed = True
+    finally:
+        _release_lock(lock)
+
+    if completed and max_bytes is not None:
+        _evict_lru(cache_root, max_bytes, keep=cache_dir)
+
+def _segment_source(input_path, temp_dir, cache_dir=None, cache_max_gb=None, segment_time=300):
+    """
+    iter_segments, or iter_cached_segments when a cache directory is given
+    (falling back to AQC_CACHE_DIR). Without either nothing is cached.
+    """
+    cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        return iter_segments(input_path, temp_dir, segment_time)
+    if cache_max_gb is None:
+        cache_max_gb = float(os.environ.get(CACHE_MAX_GB_ENV, DEFAULT_CACHE_MAX_GB))
+    return iter_cached_segments(input_path, temp_dir, cache_dir, segment_time,
+                                max_bytes=int(cache_max_gb * (1 << 30)))
+
+def _worker_init(mode):
+    """
+    Pool initializer: pays the heavy imports (NumPy/OpenCV/Librosa, every
+    validator module) once per worker instead of once per segment.
+    Also caps native threads and pins the worker to a core (see worker_tuning).
+
+    The worker's fds 1 and 2 go to devnull first, so validator log handlers
+    and ffmpeg children it spawns stay off the console (as the per-segment
+    subprocesses did); results come back through the pool.
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+    os.close(devnull)
+
+    from src.utils import worker_tuning
+    worker_tuning.init_worker(pin=True)
+
+    import numpy  # noqa: F401
+    import cv2  # noqa: F401
+    try:
+        import librosa  # noqa: F401
+    except ImportError:
+        pass
+
+    import main
+    from src.config import threshold_registry
+
+    main.load_validators()
+    threshold_registry.get_profile(mode)
+
+def get_pool(mode="strict"):
+    """
+    Module-level worker pool, created on first use and reused by every
+    run_segmented_qc call in this process (batch mode).
+    """
+    global _POOL
+    if _POOL is None:
+        # forkserver: workers start from a clean server process rather than
+        # copying this (possibly large) interpreter with fork
+        ctx = multiprocessing.get_context("forkserver") if sys.platform.startswith("linux") else None
+        _POOL = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=ctx,
+            initializer=_worker_init,
+            initargs=(mode,)
+        )
+        atexit.register(_POOL.shutdown)
+    return _POOL
 
 def process_segment(args):
     """
     Worker function to run QC on a single segment.
+    Runs the pipeline in the (already warm) worker interpreter, validators serially.
     """
-    seg_path, seg_start_time, output_base, mode, main_script = args
-    
+    seg_path, seg_start_time, output_base, mode = args
+    import main
+
     # Dedicated output folder for this segment
     seg_out_dir = output_base / seg_path.stem
     seg_out_dir.mkdir(parents=True, exist_ok=True)
-    
-    cmd = [
-        sys.executable, str(main_script),
-        "--input", str(seg_path),
-        "--outdir", str(seg_out_dir),
-        "--mode", mode
-    ]
-    
-    # Run QC (Silence output to prevent console chaos)
-    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    
-    report_path = seg_out_dir / "Master_Report.json"
+
+    # Run QC (output already silenced by _worker_init)
+    report_path = main.run_pipeline(seg_path, seg_out_dir, mode, max_parallel=1)
+
     return (seg_path.name, seg_start_time, report_path)
 
-def merge_reports(original_path, segment_results, final_report_path):
+def _iter_segment_report(json_path):
+    """
+    Yields ("status", value) and ("event", event_dict) for one segment Master Report.
+    With ijson only `overall_status` and `modules.<name>.events.item` objects
+    are built; everything else (metrics, timeseries) is skipped while parsing.
+    """
+    if ijson is None:
+        data = json_io.read_json(json_path)
+        yield "status", data.get("overall_status", "PASSED")
+        for module_data in data.get("modules", {}).values():
+            for event in module_data.get("events", []):
+                yield "event", event
+        return
+
+    with open(json_path, "rb") as f:
+        builder = None
+        depth = 0
+        for prefix, kind, value in ijson.parse(f, use_float=True):
+            if builder is not None:
+                builder.event(kind, value)
+                if kind in ("start_map", "start_array"):
+                    depth += 1
+                elif kind in ("end_map", "end_array"):
+                    depth -= 1
+                    if depth == 0:
+                        yield "event", builder.value
+                        builder = None
+                continue
+
+            if kind == "start_map" and prefix.endswith(".events.item"):
+                parts = prefix.split(".")
+                if len(parts) == 4 and parts[0] == "modules":
+                    builder = ijson.ObjectBuilder()
+                    builder.event(kind, value)
+                    depth = 1
+            elif prefix == "overall_status" and kind == "string":
+                yield "status", value
+
+def _shift_events(events, offset):
+    """
+    Adds `offset` to start_time/end_time of every event (rounded to ms),
+    one NumPy add + round per column instead of per event.
+    """
+    for key in ("start_time", "end_time"):
+        idx = [i for i, e in enumerate(events) if key in e]
+        if not idx:
+            continue
+        times = np.fromiter((events[i][key] for i in idx), dtype=np.float64, count=len(idx))
+        shifted = np.round(times + offset, 3).tolist()
+        for i, t in zip(idx, shifted):
+            events[i][key] = t
+
+def _segment_status(json_path):
+    """Reads only overall_status from a segment report (stops at the first hit)."""
+    if not json_path.exists():
+        return "ERROR"
+    for kind, item in _iter_segment_report(json_path):
+        if kind == "status":
+            return item
+    return "PASSED"
+
+def merge_reports(original_path, segment_results, final_report_path, extra_metadata=None):
     """
     Merges multiple JSON reports into one, shifting timestamps.
+    `extra_metadata` is merged into the report's metadata block.
     """
     print("[MERGE] Aggregating results...")
     
@@ -97,85 +439,101 @@ def merge_reports(original_path, segment_results, final_report_path):
         "events": [] # Flattened events list
     }
     
+    if extra_metadata:
+        master_agg["metadata"].update(extra_metadata)
+    
     worst_status = "PASSED"
-    status_rank = {"PASSED": 1, "WARNING": 2, "REJECTED": 3, "ERROR": 4}
     
     for seg_name, offset, json_path in segment_results:
         if not json_path.exists():
             continue
             
-        with open(json_path, 'r') as f:
-            data = json.load(f)
-            
-        # Update Status Logic
-        seg_status = data.get("overall_status", "PASSED")
-        if status_rank.get(seg_status, 0) > status_rank.get(worst_status, 0):
-            worst_status = seg_status
-            
         # Merge Module Metrics (Averaging is hard, we keep last or max logic? 
         # For simplicity, we skip merging raw metrics and focus on EVENTS)
+        seg_status = "PASSED"
+        seg_events = []
         
-        # Merge Events with Time Offset
-        for module_name, module_data in data.get("modules", {}).items():
-            for event in module_data.get("events", []):
-                # Shift timestamps
-                if "start_time" in event:
-                    event["start_time"] = round(event["start_time"] + offset, 3)
-                if "end_time" in event:
-                    event["end_time"] = round(event["end_time"] + offset, 3)
-                
-                # Tag origin
-                event["details"] = f"[{seg_name}] " + event.get("details", "")
-                
-                # Add to master list
-                master_agg["events"].append(event)
-                
-                # Propagate failure to top level
-                if "status" not in master_agg: 
-                    master_agg["status"] = "PASSED"
+        # Stream Events (mutated in place, no copies)
+        for kind, item in _iter_segment_report(json_path):
+            if kind == "status":
+                seg_status = item
+            else:
+                seg_events.append(item)
+
+        # Shift timestamps for the whole segment at once
+        _shift_events(seg_events, offset)
+        
+        # Tag origin
+        tag = f"[{seg_name}] "
+        for event in seg_events:
+            event["details"] = tag + event.get("details", "")
+        
+        # Add to master list
+        master_agg["events"].extend(seg_events)
+        
+        # Propagate failure to top level
+        if seg_events and "status" not in master_agg: 
+            master_agg["status"] = "PASSED"
+
+        # Update Status Logic
+        if STATUS_RANK.get(seg_status, 0) > STATUS_RANK.get(worst_status, 0):
+            worst_status = seg_status
                 
     master_agg["overall_status"] = worst_status
     
     # Save Final Report
-    with open(final_report_path, 'w') as f:
-        json.dump(master_agg, f, indent=4)
+    json_io.write_json(final_report_path, master_agg)
         
     return worst_status
 
-def run_segmented_qc(input_file, outdir, mode="strict"):
+def run_segmented_qc(input_file, outdir, mode="strict", fail_fast=False, cache_dir=None, cache_max_gb=None):
     input_path = Path(input_file).resolve()
     outdir = Path(outdir).resolve()
     temp_dir = outdir / "temp_segments"
     
-    script_dir = Path(__file__).parent
-    main_script = (script_dir.parent / "main.py").resolve()
+    # 1. SPLIT + 2. DISTRIBUTE (overlapped)
+    # Segments are submitted as ffmpeg finishes them instead of after the split.
+    results = [] # Store (seg_name, start_time, report_path)
+    print(f"[PARALLEL] Spinning up workers; segments are queued as they are split...")
     
-    # 1. SPLIT
+    executor = get_pool(mode)
+    futures = {}
     try:
-        segments = split_video(input_path, temp_dir, segment_time=300)
+        for seg_path, start_time in _segment_source(input_path, temp_dir, cache_dir, cache_max_gb, segment_time=300):
+            task = (seg_path, start_time, temp_dir, mode)
+            futures[executor.submit(process_segment, task)] = task
     except Exception as e:
         print(f"[ERROR] Split failed: {e}")
+        for future in futures:
+            future.cancel()
         return
 
-    # 2. DISTRIBUTE
-    tasks = []
-    print(f"[PARALLEL] Spinning up workers for {len(segments)} segments...")
-    
-    for seg_path, start_time in segments:
-        tasks.append((seg_path, start_time, temp_dir, mode, main_script))
-        
-    results = [] # Store (seg_name, start_time, report_path)
-    
-    with ProcessPoolExecutor() as executor:
-        futures = {executor.submit(process_segment, t): t for t in tasks}
-        for future in as_completed(futures):
-            res = future.result()
-            results.append(res)
-            print(f" + Finished segment: {res[0]}")
+    stopped_early = False
+    for future in as_completed(futures):
+        res = future.result()
+        results.append(res)
+        print(f" + Finished segment: {res[0]}")
+
+        # Verdict is "worst segment wins": once one is REJECTED the rest
+        # only refine the event list, so skip them when asked to.
+        if fail_fast and STATUS_RANK.get(_segment_status(res[2]), 0) >= STATUS_RANK["REJECTED"]:
+            # Cancel only our pending work; the shared pool stays up for reuse
+            cancelled = sum(1 for f in futures if f.cancel())
+            print(f"[FAIL-FAST] {res[0]} rejected; cancelled {cancelled} pending segment(s).")
+            stopped_early = True
+            break
 
     # 3. MERGE
+    extra_metadata = None
+    if fail_fast:
+        extra_metadata = {
+            "fail_fast": True,
+            "stopped_early": stopped_early,
+            "segments_merged": len(results),
+            "segments_total": len(futures)
+        }
     final_report = outdir / "Segmented_Master_Report.json"
-    final_status = merge_reports(input_path, results, final_report)
+    final_status = merge_reports(input_path, results, final_report, extra_metadata)
     
     print(f"\n[DONE] Final Status: {final_status}")
     print(f"Report: {final_report}")
@@ -188,6 +546,9 @@ if __name__ == "__main__":
     parser.add_argument("--input", required=True)
     parser.add_argument("--outdir", required=True)
     parser.add_argument("--mode", default="strict")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop scheduling segments once one is REJECTED")
+    parser.add_argument("--cache-dir", help=f"Reuse split segments across runs (default: ${CACHE_DIR_ENV}, off if unset)")
+    parser.add_argument("--cache-max-gb", type=float, help=f"Cache size limit, LRU eviction (default: ${CACHE_MAX_GB_ENV} or {DEFAULT_CACHE_MAX_GB})")
     args = parser.parse_args()
     
-    run_segmented_qc(args.input, args.outdir, args.mode)
\ No newline at end of file
+    run_segmented_qc(args.input, args.outdir, args.mode, args.fail_fast, args.cache_dir, args.cache_max_gb)
\ No newline at end of file
@@ -1,26 +1,74 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-import subprocess
-import threading
-import os
-import sys
-
-class AQCLauncher:
-    def __init__(self, root):
-        self.root = rootimport tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+import asyncio
+import atexit
+import codecs
+import html
 import subprocess
 import threading
 import os
 import sys
 import webbrowser
 from pathlib import Path
+from urllib.parse import quote
+
+# Long-lived worker container, reused across batches in one GUI session
+LIVE_CONTAINER = "aqc_live"
+
+# Folder opener, resolved once for this platform. POSIX openers run
+# detached so the caller never has to reap them.
+if os.name == 'nt': # Windows
+    _open_folder = os.startfile
+else:
+    _FOLDER_OPENER = 'open' if sys.platform == 'darwin' else 'xdg-open' # Mac / Linux
+
+    def _open_folder(path):
+        subprocess.Popen([_FOLDER_OPENER, path], close_fds=True, start_new_session=True)
+
+# Auto-open the report index only for small batches
+AUTO_OPEN_MAX_REPORTS = 10
+
+# Batch output is read in chunks of up to this many bytes, not line by line
+STREAM_CHUNK = 1 << 16
+
+def write_report_index(out_path, report_dirs):
+    """
+    Writes <out_path>/index.html linking every report dashboard, so a batch
+    opens as one browser tab. Returns the index path, or None if no report
+    has a dashboard.
+    """
+    links = []
+    for entry in sorted(report_dirs, key=lambda e: e.name):
+        if os.path.exists(os.path.join(entry.path, "dashboard.html")):
+            href = f"{quote(entry.name)}/dashboard.html"
+            links.append(f'    <li><a href="{href}">{html.escape(entry.name)}</a></li>')
+    if not links:
+        return None
+
+    index_path = Path(out_path) / "index.html"
+    index_path.write_text(
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>AQC Reports</title></head>\n"
+        "<body>\n<h1>AQC Reports</h1>\n<ul>\n" + "\n".join(links) + "\n</ul>\n</body></html>\n",
+        encoding="utf-8"
+    )
+    return index_path
 
 class AQCLauncher:
     def __init__(self, root):
         self.root = root
+        self._container_id = None
+        self._live_mounts = None
+        self._proc = None
+        self._cancel_event = threading.Event()
+        atexit.register(self._stop_container)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # One event loop thread drives every docker subprocess; batches are
+        # coroutines on it rather than one OS thread each
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="aqc-docker-loop", daemon=True).start()
         self.root.title("AQC System - Boss Edition")
-        self.root.geometry("600x500")
+        self.root.geometry("600x550")
         
         # Styles
         style = ttk.Style()
@@ -36,6 +84,8 @@ class AQCLauncher:
         frame_in.pack(fill="x", padx=20, pady=5)
         
         self.input_dir = tk.StringVar()
+        self._in_abs = ""
+        self.input_dir.trace_add("write", lambda *_: setattr(self, "_in_abs", os.path.abspath(self.input_dir.get())))
         entry_in = ttk.Entry(frame_in, textvariable=self.input_dir, width=50)
         entry_in.pack(side="left", padx=5)
         btn_in = ttk.Button(frame_in, text="Browse...", command=self.browse_input)
@@ -46,6 +96,8 @@ class AQCLauncher:
         frame_out.pack(fill="x", padx=20, pady=5)
         
         self.output_dir = tk.StringVar()
+        self._out_abs = ""
+        self.output_dir.trace_add("write", lambda *_: setattr(self, "_out_abs", os.path.abspath(self.output_dir.get())))
         entry_out = ttk.Entry(frame_out, textvariable=self.output_dir, width=50)
         entry_out.pack(side="left", padx=5)
         btn_out = ttk.Button(frame_out, text="Browse...", command=self.browse_output)
@@ -64,7 +116,10 @@ class AQCLauncher:
 
         # --- RUN BUTTON ---
         self.btn_run = ttk.Button(root, text="START QC BATCH", command=self.start_thread)
-        self.btn_run.pack(pady=20, ipadx=20, ipady=10)
+        self.btn_run.pack(pady=(20, 5), ipadx=20, ipady=10)
+
+        self.btn_cancel = ttk.Button(root, text="Cancel", command=self.cancel, state="disabled")
+        self.btn_cancel.pack()
 
         # --- STATUS ---
         self.status_var = tk.StringVar(value="Ready")
@@ -85,24 +140,119 @@ class AQCLauncher:
             return
         
         self.btn_run.config(state="disabled")
+        self.btn_cancel.config(state="normal")
+        self._cancel_event.clear()
         self.status_var.set("Running... (Check Console for Progress)")
         
-        # Run in separate thread to keep GUI responsive
-        t = threading.Thread(target=self.run_docker)
-        t.start()
-
-    def run_docker(self):
-        in_path = os.path.abspath(self.input_dir.get())
-        out_path = os.path.abspath(self.output_dir.get())
+        # Tk variables are read here, on the GUI thread; absolute paths are
+        # kept current by the StringVar traces
+        in_path = self._in_abs
+        out_path = self._out_abs
         mode = self.profile.get()
 
-        # Construct Docker Command
+        # Schedule on the background loop to keep GUI responsive
+        asyncio.run_coroutine_threadsafe(self._run_docker_async(in_path, out_path, mode), self._loop)
+
+    def cancel(self):
+        self._cancel_event.set()
+        self.btn_cancel.config(state="disabled")
+        self.status_var.set("Cancelling...")
+        self._loop.call_soon_threadsafe(self._terminate)
+
+    def _terminate(self):
+        # Runs on the loop thread. Killing the `docker exec` client does not
+        # stop the batch inside the container, so drop the container too.
+        if self._proc is not None and self._proc.returncode is None:
+            self._proc.terminate()
+        self._stop_container()
+
+    def on_close(self):
+        self._stop_container()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self.root.destroy()
+
+    async def _run_cmd(self, cmd, capture=False):
+        """Awaits a subprocess; raises CalledProcessError like subprocess.run(check=True)."""
+        pipe = asyncio.subprocess.PIPE if capture else None
+        proc = await asyncio.create_subprocess_exec(*cmd, stdout=pipe, stderr=pipe)
+        stdout, _ = await proc.communicate()
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+        return stdout.decode().strip() if capture else None
+
+    async def _stream_cmd(self, cmd):
+        """
+        Runs `cmd`, echoing its output to the console and its latest line to
+        the status bar. Output is taken a chunk at a time, so a burst of log
+        lines costs one console write and one status update, not one each.
+        Raises CalledProcessError on a non-zero exit.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+        self._proc = proc
+        # Incremental: a chunk may end inside a multi-byte character
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        partial = ""
+        try:
+            while True:
+                chunk = await proc.stdout.read(STREAM_CHUNK)
+                if not chunk:
+                    break
+                text = decoder.decode(chunk)
+                sys.stdout.write(text)
+                sys.stdout.flush()
+                # Latest complete, non-blank line; the unfinished tail waits for the next chunk
+                lines = (partial + text).split("\n")
+                partial = lines.pop()
+                latest = next((s for s in map(str.strip, reversed(lines)) if s), None)
+                if latest:
+                    self.root.after(0, self.status_var.set, latest)
+            if partial.strip():
+                print(flush=True)
+                self.root.after(0, self.status_var.set, partial.strip())
+            returncode = await proc.wait()
+        finally:
+            self._proc = None
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
+
+    async def _ensure_container(self, in_path, out_path):
+        """
+        Starts the idle worker container on first use (or when the mounted
+        folders change) so later batches only pay for a `docker exec`.
+        """
+        mounts = (in_path, out_path)
+        if self._container_id is not None and self._live_mounts == mounts:
+            return
+
+        # Also clears a stale container left behind by a crashed session
+        self._stop_container(force=True)
+
         # Note: We mount the host paths to /data/input and /data/output inside the container
         cmd = [
-            "docker", "run", "--rm",
+            "docker", "run", "-d", "--rm",
+            "--name", LIVE_CONTAINER,
             "-v", f"{in_path}:/data/input",
             "-v", f"{out_path}:/data/output",
-            "aqc_system",
+            "--entrypoint", "sleep",
+            "aqc_system", "infinity"
+        ]
+        self._container_id = await self._run_cmd(cmd, capture=True)
+        self._live_mounts = mounts
+
+    def _stop_container(self, force=False):
+        if self._container_id is None and not force:
+            return
+        subprocess.run(["docker", "rm", "-f", LIVE_CONTAINER], capture_output=True)
+        self._container_id = None
+        self._live_mounts = None
+
+    async def _run_docker_async(self, in_path, out_path, mode):
+        # Construct Docker Command (runs inside the live container)
+        cmd = [
+            "docker", "exec", LIVE_CONTAINER,
             "python", "batch_runner.py",
             "--input_dir", "/data/input",
             "--output_dir", "/data/output",
@@ -111,155 +261,48 @@ class AQCLauncher:
         ]
 
         try:
+            await self._ensure_container(in_path, out_path)
+
             # Run the Batch Process
-            # On Windows, shell=True helps find the docker path, but usually not needed if PATH is set.
-            # Using text=True to capture output if needed.
-            process = subprocess.run(cmd, check=True, text=True)
+            # Progress lines stream to the status bar (and the console).
+            await self._stream_cmd(cmd)
             
             self.root.after(0, lambda: messagebox.showinfo("Success", "QC Batch Completed!"))
             
             # --- SMART RESULT OPENING ---
             
             # 1. Open the Output Folder Window (Always)
-            if os.name == 'nt': # Windows
-                os.startfile(out_path)
-            elif sys.platform == 'darwin': # Mac
-                subprocess.Popen(['open', out_path])
-            else: # Linux
-                subprocess.Popen(['xdg-open', out_path])
-
-            # 2. Smart Browser Launch (Only if < 10 files)
+            _open_folder(out_path)
+
+            # 2. Smart Browser Launch (Only if < 10 files), one tab via an index page
             # Scan the output directory for "qc_report" folders
-            report_dirs = [d for d in Path(out_path).iterdir() if d.is_dir() and d.name.endswith('_qc_report')]
+            # (scandir: DirEntry caches the type, no extra stat per entry)
+            with os.scandir(out_path) as it:
+                report_dirs = [e for e in it if e.name.endswith('_qc_report') and e.is_dir(follow_symlinks=False)]
             
-            if len(report_dirs) > 0 and len(report_dirs) < 10:
-                self.root.after(0, lambda: self.status_var.set(f"Opening {len(report_dirs)} reports in browser..."))
-                for report_folder in report_dirs:
-                    dashboard_path = report_folder / "dashboard.html"
-                    if dashboard_path.exists():
-                        webbrowser.open(dashboard_path.as_uri())
+            if 0 < len(report_dirs) < AUTO_OPEN_MAX_REPORTS:
+                index_path = write_report_index(out_path, report_dirs)
+                if index_path is not None:
+                    self.root.after(0, lambda: self.status_var.set(f"Opening {len(report_dirs)} reports in browser..."))
+                    webbrowser.open(index_path.as_uri())
             
             # -----------------------------
 
             self.root.after(0, lambda: self.status_var.set("Done."))
             
         except subprocess.CalledProcessError as e:
+            if self._cancel_event.is_set():
+                self.root.after(0, lambda: self.status_var.set("Cancelled."))
+                return
             self.root.after(0, lambda: messagebox.showerror("Error", f"Docker process failed.\nEnsure Docker Desktop is running.\n\nExit Code: {e.returncode}"))
             self.root.after(0, lambda: self.status_var.set("Failed."))
         except Exception as e:
             self.root.after(0, lambda: messagebox.showerror("Error", f"An unexpected error occurred:\n{str(e)}"))
         finally:
             self.root.after(0, lambda: self.btn_run.config(state="normal"))
+            self.root.after(0, lambda: self.btn_cancel.config(state="disabled"))
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = AQCLauncher(root)
     root.mainloop()
-        self.root.title("AQC System - Boss Edition")
-        self.root.geometry("600x450")
-        
-        # Styles
-        style = ttk.Style()
-        style.configure("TButton", padding=6, font=('Helvetica', 10))
-        style.configure("TLabel", font=('Helvetica', 10))
-
-        # --- HEADER ---
-        lbl_title = tk.Label(root, text="Automated Quality Control System", font=('Helvetica', 16, 'bold'))
-        lbl_title.pack(pady=20)
-
-        # --- INPUT FOLDER ---
-        frame_in = ttk.LabelFrame(root, text="1. Select Video Source Folder", padding=10)
-        frame_in.pack(fill="x", padx=20, pady=5)
-        
-        self.input_dir = tk.StringVar()
-        entry_in = ttk.Entry(frame_in, textvariable=self.input_dir, width=50)
-        entry_in.pack(side="left", padx=5)
-        btn_in = ttk.Button(frame_in, text="Browse...", command=self.browse_input)
-        btn_in.pack(side="left")
-
-        # --- OUTPUT FOLDER ---
-        frame_out = ttk.LabelFrame(root, text="2. Select Report Destination", padding=10)
-        frame_out.pack(fill="x", padx=20, pady=5)
-        
-        self.output_dir = tk.StringVar()
-        entry_out = ttk.Entry(frame_out, textvariable=self.output_dir, width=50)
-        entry_out.pack(side="left", padx=5)
-        btn_out = ttk.Button(frame_out, text="Browse...", command=self.browse_output)
-        btn_out.pack(side="left")
-
-        # --- PROFILE SELECTION ---
-        frame_prof = ttk.LabelFrame(root, text="3. Select QC Profile", padding=10)
-        frame_prof.pack(fill="x", padx=20, pady=5)
-        
-        self.profile = tk.StringVar(value="strict")
-        profiles = [("Strict (Broadcast)", "strict"), ("YouTube (Web)", "youtube"), ("Netflix (HD Spec)", "netflix_hd")]
-        
-        for text, mode in profiles:
-            rb = ttk.Radiobutton(frame_prof, text=text, variable=self.profile, value=mode)
-            rb.pack(anchor="w")
-
-        # --- RUN BUTTON ---
-        self.btn_run = ttk.Button(root, text="START QC BATCH", command=self.start_thread)
-        self.btn_run.pack(pady=20, ipadx=20, ipady=10)
-
-        # --- STATUS ---
-        self.status_var = tk.StringVar(value="Ready")
-        lbl_status = tk.Label(root, textvariable=self.status_var, fg="blue")
-        lbl_status.pack(pady=5)
-
-    def browse_input(self):
-        path = filedialog.askdirectory()
-        if path: self.input_dir.set(path)
-
-    def browse_output(self):
-        path = filedialog.askdirectory()
-        if path: self.output_dir.set(path)
-
-    def start_thread(self):
-        if not self.input_dir.get() or not self.output_dir.get():
-            messagebox.showwarning("Missing Info", "Please select both Input and Output folders.")
-            return
-        
-        self.btn_run.config(state="disabled")
-        self.status_var.set("Running... (Check Console for Progress)")
-        
-        # Run in separate thread to keep GUI responsive
-        t = threading.Thread(target=self.run_docker)
-        t.start()
-
-    def run_docker(self):
-        in_path = os.path.abspath(self.input_dir.get())
-        out_path = os.path.abspath(self.output_dir.get())
-        mode = self.profile.get()
-
-        # Construct Docker Command
-        # Note: We mount the host paths to /data/input and /data/output inside the container
-        cmd = [
-            "docker", "run", "--rm",
-            "-v", f"{in_path}:/data/input",
-            "-v", f"{out_path}:/data/output",
-            "aqc_system",
-            "python", "batch_runner.py",
-            "--input_dir", "/data/input",
-            "--output_dir", "/data/output",
-            "--mode", mode,
-            "--workers", "4"
-        ]
-
-        try:
-            # On Windows, we need shell=True to find the docker command easily in some envs
-            # We capture output to print to the console window launching this app
-            process = subprocess.run(cmd, check=True, text=True)
-            
-            self.root.after(0, lambda: messagebox.showinfo("Success", "QC Batch Completed!\nCheck the output folder."))
-            self.root.after(0, lambda: self.status_var.set("Done."))
-        except subprocess.CalledProcessError as e:
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Docker process failed.\nEnsure Docker Desktop is running.\n\nError code: {e.returncode}"))
-            self.root.after(0, lambda: self.status_var.set("Failed."))
-        finally:
-            self.root.after(0, lambda: self.btn_run.config(state="normal"))
-
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = AQCLauncher(root)
-    root.mainloop()
\ No newline at end of file
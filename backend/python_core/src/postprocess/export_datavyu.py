@@ -22,19 +22,21 @@ def export_datavyu_csv(report_path, output_path):
     if not events:
         print("Warning: No events found in report.")
         
-    rows = standardizer.get_datavyu_rows(events)
-    
     # Write to CSV
     # Datavyu typically accepts a flexible CSV but having a header is good practice for import mapping.
     # Columns: onset, offset, code01, code02, comment
+    # Rows are streamed straight from the report, never held as a list.
     
     try:
+        count = 0
         with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=["onset", "offset", "code01", "code02", "comment"])
-            writer.writeheader()
-            writer.writerows(rows)
+            writer = csv.writer(f)
+            writer.writerow(standardizer.DATAVYU_COLUMNS)
+            for row in standardizer.iter_datavyu_rows(events):
+                writer.writerow(row)
+                count += 1
             
-        print(f"Successfully exported {len(rows)} events to {output_path}")
+        print(f"Successfully exported {count} events to {output_path}")
         return True
     except Exception as e:
         print(f"Failed to write CSV: {e}")
@@ -1,8 +1,9 @@
 import argparse
-import json
 import time
 from pathlib import Path
 
+from src.utils import json_io
+
 def stitch_events(events, tolerance=0.1):
     """
     Merges overlapping or adjacent events of the same type.
@@ -42,16 +43,24 @@ def stitch_events(events, tolerance=0.1):
     # Final sort by time for the report
     return sorted(stitched, key=lambda x: x.get("start_time", 0))
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--inputs", nargs="+", required=True, help="List of JSON report paths")
-    parser.add_argument("--output", required=True, help="Path to save Master JSON")
-    parser.add_argument("--profile", default="strict")
-    args = parser.parse_args()
+def generate_master(inputs, output, profile="strict", governance=None, preloaded=None):
+    """
+    Aggregates per-module reports into the Master Report in a single write.
+
+    Args:
+        inputs: List of module JSON report paths.
+        output: Path to save Master JSON.
+        profile: QC profile name.
+        governance: Optional governance block embedded as-is (no post-hoc rewrite).
+        preloaded: Optional {report path: parsed report} for reports the caller
+            already holds; those paths are not read again.
 
+    Returns:
+        dict: The Master Report data.
+    """
     master_data = {
         "timestamp": time.ctime(),
-        "profile": args.profile,
+        "profile": profile,
         "overall_status": "PASSED",
         "modules": {},
         "aggregated_events": [] # New consolidated timeline
@@ -66,16 +75,19 @@ def main():
     
     all_raw_events = []
 
-    print(f"Aggregating {len(args.inputs)} reports...")
+    print(f"Aggregating {len(inputs)} reports...")
+
+    preloaded = preloaded or {}
 
-    for report_path in args.inputs:
+    for report_path in inputs:
         path = Path(report_path)
-        if not path.exists():
+        data = preloaded.get(str(report_path))
+        if data is None and not path.exists():
             continue
             
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if data is None:
+                data = json_io.read_json(path)
             
             module_name = data.get("module", path.stem)
             status = data.get("effective_status", data.get("status", "UNKNOWN"))
@@ -115,11 +127,28 @@ def main():
     # 3. Stitch and Deduplicate
     master_data["aggregated_events"] = stitch_events(all_raw_events)
 
-    # Save Master Report
-    with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(master_data, f, indent=4)
+    if governance is not None:
+        master_data["governance"] = governance
+
+    # Save Master Report (indented: it is the human-facing artifact)
+    json_io.write_json(output, master_data)
         
-    print(f"Master Report generated: {args.output}")
+    print(f"Master Report generated: {output}")
+    return master_data
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--inputs", nargs="+", required=True, help="List of JSON report paths")
+    parser.add_argument("--output", required=True, help="Path to save Master JSON")
+    parser.add_argument("--profile", default="strict")
+    parser.add_argument("--governance-json", default=None, help="Path to a precomputed governance JSON block")
+    args = parser.parse_args()
+
+    governance = None
+    if args.governance_json:
+        governance = json_io.read_json(args.governance_json)
+
+    generate_master(args.inputs, args.output, args.profile, governance)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
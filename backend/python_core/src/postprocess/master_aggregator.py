@@ -1,6 +1,66 @@
-import json
 from pathlib import Path
 
+import numpy as np
+
+from src.utils import json_io
+
+# Time-based fields shifted by the segment offset
+_TIME_KEYS = frozenset(('timestamp', 'start_sec', 'end_sec', 'start_time', 'end_time'))
+
+# Below this, NumPy array setup costs more than the plain Python loop
+VECTORIZE_MIN_ITEMS = 64
+
+# Status escalation as ints: worst status == max rank. Statuses outside
+# this scale (e.g. CRASHED) never escalate, as before.
+STATUS_RANK = {"PASSED": 0, "WARNING": 1, "REJECTED": 2}
+STATUS_NAMES = ("PASSED", "WARNING", "REJECTED")
+
+# Row layout of the stitching buffer: sort/merge keys as contiguous columns,
+# plus a reference to the event dict that ends up in the JSON report
+_EVENT_DTYPE = np.dtype([
+    ('type', 'O'),
+    ('start_time', 'f8'),
+    ('end_time', 'f8'),
+    ('details', 'O'),
+    ('event', 'O')
+])
+
+class _EventBuffer:
+    """
+    Growable structured array of events (capacity doubles when full).
+    """
+    def __init__(self, capacity=1024):
+        self._rows = np.empty(max(1, capacity), dtype=_EVENT_DTYPE)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, evt):
+        if self._size == len(self._rows):
+            grown = np.empty(2 * len(self._rows), dtype=_EVENT_DTYPE)
+            grown[:self._size] = self._rows[:self._size]
+            self._rows = grown
+        self._rows[self._size] = (
+            evt.get("type", "unknown"),
+            evt.get("start_time", 0),
+            evt.get("end_time", 0),
+            evt.get("details"),
+            evt
+        )
+        self._size += 1
+
+    @property
+    def rows(self):
+        return self._rows[:self._size]
+
+    @classmethod
+    def from_events(cls, events):
+        buf = cls(len(events))
+        for evt in events:
+            buf.append(evt)
+        return buf
+
 class MasterAggregator:
     """
     Stitches segment-level results into a unified master report.
@@ -21,37 +81,6 @@ class MasterAggregator:
             "modules": {}
         }
 
-    def aggregate(self):
-        for segment in self.segments_results:
-            offset_sec = segment['start_time']
-            # We need to know FPS to calculate frame offset, 
-            # but most validators provide time-based details.
-            
-            for report in segment['reports']:
-                module_name = report.get('module', 'unknown')
-                if module_name not in self.master_report['modules']:
-                    self.master_report['modules'][module_name] = {
-                        "status": "PASSED",
-                        "details": {}
-                    }
-                
-                module_master = self.master_report['modules'][module_name]
-                
-                # Update Status (Escalation logic)
-                status = report.get('effective_status', report.get('status', 'PASSED'))
-                if status == "REJECTED":
-                    module_master["status"] = "REJECTED"
-                elif status == "WARNING" and module_master["status"] != "REJECTED":
-                    module_master["status"] = "WARNING"
-                
-                # Merge Details with Offsets
-                details = report.get('details', {})
-                self._merge_details(module_name, module_master['details'], details, offset_sec)
-
-        # Final Master Status
-        self.master_report["status"] = self._calculate_overall_status()
-        return self.master_report
-
     def _merge_details(self, module, master_details, segment_details, offset_sec):
         """
         Custom merging logic per validator type.
@@ -63,24 +92,18 @@ class MasterAggregator:
                     master_details[key] = []
                 
                 # Adjust time-based values in lists
-                adjusted_list = []
-                for item in value:
-                    if isinstance(item, dict):
+                if len(value) >= VECTORIZE_MIN_ITEMS:
+                    adjusted_list = self._offset_items(value, offset_sec)
+                else:
+                    adjusted_list = []
+                    for item in value:
+                        if not isinstance(item, dict) or _TIME_KEYS.isdisjoint(item):
+                            adjusted_list.append(item)
+                            continue
                         new_item = item.copy()
-                        if 'timestamp' in new_item:
-                            new_item['timestamp'] = round(new_item['timestamp'] + offset_sec, 3)
-                        if 'start_sec' in new_item:
-                            new_item['start_sec'] = round(new_item['start_sec'] + offset_sec, 3)
-                        if 'end_sec' in new_item:
-                            new_item['end_sec'] = round(new_item['end_sec'] + offset_sec, 3)
-                        # Support for new validator keys
-                        if 'start_time' in new_item:
-                            new_item['start_time'] = round(new_item['start_time'] + offset_sec, 3)
-                        if 'end_time' in new_item:
-                            new_item['end_time'] = round(new_item['end_time'] + offset_sec, 3)
+                        for k in _TIME_KEYS.intersection(new_item):
+                            new_item[k] = round(new_item[k] + offset_sec, 3)
                         adjusted_list.append(new_item)
-                    else:
-                        adjusted_list.append(item)
                 
                 master_details[key].extend(adjusted_list)
             else:
@@ -99,97 +122,142 @@ class MasterAggregator:
                         elif "offset" in key.lower() or "error" in key.lower():
                             master_details[key] = max(master_details[key], value)
 
-    def _calculate_overall_status(self):
-        statuses = [m['status'] for m in self.master_report['modules'].values()]
-        if "REJECTED" in statuses: return "REJECTED"
-        if "WARNING" in statuses: return "WARNING"
-        return "PASSED"
+    @staticmethod
+    def _offset_items(items, offset_sec):
+        """
+        Vectorized form of the per-item offset loop for large lists: one
+        NumPy add + round per time field instead of a Python round() per value.
+        """
+        adjusted = [
+            item.copy() if isinstance(item, dict) and not _TIME_KEYS.isdisjoint(item) else item
+            for item in items
+        ]
+        dicts = [item for item in adjusted if isinstance(item, dict)]
+
+        for field in _TIME_KEYS:
+            holders = [d for d in dicts if field in d]
+            if not holders:
+                continue
+            values = np.fromiter((d[field] for d in holders), dtype=np.float64, count=len(holders))
+            shifted = np.round(values + offset_sec, 3).tolist()
+            for d, v in zip(holders, shifted):
+                d[field] = v
+
+        return adjusted
 
     def _stitch_events(self, events, tolerance=0.1):
         """
         Merges overlapping or adjacent events of the same type.
+        Accepts a list of event dicts or an _EventBuffer; merge boundaries are
+        found on the buffer columns, only the merged details are built in Python.
         """
-        if not events: return []
-        
-        # Sort by Type, then Start Time
-        sorted_events = sorted(events, key=lambda x: (x.get("type", "unknown"), x.get("start_time", 0)))
-        
+        if not len(events): return []
+        if not isinstance(events, _EventBuffer):
+            events = _EventBuffer.from_events(events)
+        rows = events.rows
+
+        # Sort by Type, then Start Time (lexsort is stable)
+        type_names, type_codes = np.unique(rows['type'], return_inverse=True)
+        order = np.lexsort((rows['start_time'], type_codes))
+        codes = type_codes[order]
+        starts = rows['start_time'][order]
+        ends = rows['end_time'][order]
+        details = rows['details'][order]
+        evts = rows['event'][order]
+
+        # A group starts on a type change or when the start is past the
+        # furthest end seen so far for that type (+ tolerance)
+        is_head = np.ones(len(order), dtype=bool)
+        type_bounds = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1], True])
+        for lo, hi in zip(type_bounds[:-1], type_bounds[1:]):
+            if hi - lo < 2:
+                continue
+            s, e = starts[lo:hi], ends[lo:hi]
+            if np.all(e >= s):
+                reach = np.maximum.accumulate(e)[:-1]
+                is_head[lo + 1:hi] = s[1:] > reach + tolerance
+            else:
+                # Inverted intervals: the running end of a group can drop
+                # below an earlier group's, so follow the groups one by one
+                curr_end = e[0]
+                for i in range(1, hi - lo):
+                    if s[i] > curr_end + tolerance:
+                        curr_end = e[i]
+                    else:
+                        is_head[lo + i] = False
+                        curr_end = max(curr_end, e[i])
+
+        heads = np.flatnonzero(is_head)
+        group_ends = np.r_[heads[1:], len(order)]
+
+        # Heads come out in (type, start) order; the stable argsort on the
+        # start column gives the final timeline order without key callbacks
         stitched = []
-        if not sorted_events: return []
-        
-        current = sorted_events[0]
-        
-        for next_evt in sorted_events[1:]:
-            # Check if same type
-            if current.get("type") == next_evt.get("type"):
-                # Check overlap or adjacency
-                curr_end = current.get("end_time", 0)
-                next_start = next_evt.get("start_time", 0)
-                
-                if next_start <= (curr_end + tolerance):
-                    # Merge: Extend current end time
-                    current["end_time"] = max(curr_end, next_evt.get("end_time", 0))
-                    # Append details if unique
-                    if next_evt.get("details") not in current.get("details", ""):
-                        current["details"] += f" | {next_evt.get('details')}"
-                    continue
-            
-            # No merge, push current and move on
+        for idx in np.argsort(starts[heads], kind="stable"):
+            lo, hi = heads[idx], group_ends[idx]
+            current = evts[lo]
+            if hi - lo > 1:
+                # Merge: Extend current end time
+                current["end_time"] = float(ends[lo:hi].max())
+                # Append details if unique
+                seen_details = {current.get("details", "")}
+                for d in details[lo + 1:hi]:
+                    if d not in seen_details:
+                        seen_details.add(d)
+                        current["details"] += f" | {d}"
             stitched.append(current)
-            current = next_evt
-        
-        stitched.append(current)
-        return sorted(stitched, key=lambda x: x.get("start_time", 0))
+
+        return stitched
 
     def aggregate(self):
-        # ... (Existing aggregation logic)
+        """
+        Single pass over every segment report: escalates module status, merges
+        offset details and collects events for stitching as it goes.
+        """
+        modules = self.master_report['modules']
+        self.event_buffer = _EventBuffer()
+        event_buffer = self.event_buffer
+
         for segment in self.segments_results:
             offset_sec = segment['start_time']
             for report in segment['reports']:
-                module_name = report.get('module', 'unknown')
-                if module_name not in self.master_report['modules']:
-                    self.master_report['modules'][module_name] = {
+                report_get = report.get
+                module_name = report_get('module', 'unknown')
+                module_master = modules.get(module_name)
+                if module_master is None:
+                    module_master = modules[module_name] = {
                         "status": "PASSED",
-                        "details": {}
+                        "details": {},
+                        "_rank": 0
                     }
-                
-                module_master = self.master_report['modules'][module_name]
-                
-                # Update Status
-                status = report.get('effective_status', report.get('status', 'PASSED'))
-                if status == "REJECTED":
-                    module_master["status"] = "REJECTED"
-                elif status == "WARNING" and module_master["status"] != "REJECTED":
-                    module_master["status"] = "WARNING"
-                
+
+                # Update Status (Escalation logic)
+                status = report_get('effective_status', report_get('status', 'PASSED'))
+                module_master["_rank"] = max(module_master["_rank"], STATUS_RANK.get(status, 0))
+
                 # Merge Details with Offsets
-                details = report.get('details', {})
-                self._merge_details(module_name, module_master['details'], details, offset_sec)
-
-        # Final Master Status
-        self.master_report["status"] = self._calculate_overall_status()
-        
-        # --- NEW: Generate Aggregated Events for Dashboard ---
-        all_raw_events = []
-        for module_name, module_data in self.master_report['modules'].items():
-            # Get events from details (preferred) or top-level (legacy)
-            details = module_data.get("details", {})
-            events = details.get("events", [])
-            
-            # If not in details, check top-level (though _merge_details puts them in details usually)
-            if not events:
-                events = module_data.get("events", [])
-
-            for e in events:
-                # Add source module if missing
-                if "source_module" not in e:
-                    e["source_module"] = module_name
-                all_raw_events.append(e)
-
-        self.master_report["aggregated_events"] = self._stitch_events(all_raw_events)
-        
+                details = report_get('details', {})
+                master_details = module_master['details']
+                self._merge_details(module_name, master_details, details, offset_sec)
+
+                # Collect the offset copies just appended, for the dashboard timeline
+                seg_events = details.get('events')
+                if seg_events and isinstance(seg_events, list):
+                    for e in master_details['events'][-len(seg_events):]:
+                        if isinstance(e, dict):
+                            e.setdefault("source_module", module_name)
+                            event_buffer.append(e)
+
+        # Final Module / Master Status
+        overall = 0
+        for module_master in modules.values():
+            rank = module_master.pop("_rank")
+            module_master["status"] = STATUS_NAMES[rank]
+            overall = max(overall, rank)
+        self.master_report["status"] = STATUS_NAMES[overall]
+        self.master_report["aggregated_events"] = self._stitch_events(event_buffer)
+
         return self.master_report
 
     def save(self, output_path):
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(self.master_report, f, indent=4)
+        json_io.write_json(output_path, self.master_report)
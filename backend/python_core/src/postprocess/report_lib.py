@@ -1,6 +1,7 @@
-import json
 from pathlib import Path
 
+from src.utils import json_io
+
 class TimecodeHelper:
     @staticmethod
     def seconds_to_smpte(seconds, fps=24):
@@ -55,11 +56,15 @@ class ReportStandardizer:
     def __init__(self, fps=24):
         self.fps = fps
 
-    def load_report(self, path):
-        """Loads JSON report and ensures access to aggregated events."""
+    def load_report(self, path, data=None):
+        """
+        Loads JSON report and ensures access to aggregated events.
+        `data` is the already-parsed report, if the caller has it; `path` is not read then.
+        """
+        if data is not None:
+            return self._ensure_aggregated_events(data)
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = json_io.read_json(path)
             return self._ensure_aggregated_events(data)
         except Exception as e:
             print(f"[ERROR] Failed to load report {path}: {e}")
@@ -144,9 +149,11 @@ class ReportStandardizer:
             "color": self.COLOR_MAP.get(category, self.COLOR_MAP["Other"])
         }
 
-    def get_datavyu_rows(self, events):
-        """Generates rows for Datavyu CSV import."""
-        rows = []
+    # Column order of the Datavyu CSV (see iter_datavyu_rows)
+    DATAVYU_COLUMNS = ("onset", "offset", "code01", "code02", "comment")
+
+    def iter_datavyu_rows(self, events):
+        """Yields Datavyu CSV rows as tuples in DATAVYU_COLUMNS order."""
         for evt in events:
             std = self.normalize_event(evt)
             
@@ -156,11 +163,14 @@ class ReportStandardizer:
             # Datavyu format requires specific columns often interact with scripts
             # We will adhere to: onset (ms), offset (ms), code01, code02, comment
             
-            rows.append({
-                "onset": int(start * 1000),
-                "offset": int(end * 1000),
-                "code01": std["datavyu_code"],
-                "code02": std["original_severity"],
-                "comment": f"{std['human_name']}: {evt.get('details', '')}"
-            })
-        return rows
+            yield (
+                int(start * 1000),
+                int(end * 1000),
+                std["datavyu_code"],
+                std["original_severity"],
+                f"{std['human_name']}: {evt.get('details', '')}"
+            )
+
+    def get_datavyu_rows(self, events):
+        """Generates rows for Datavyu CSV import."""
+        return [dict(zip(self.DATAVYU_COLUMNS, row)) for row in self.iter_datavyu_rows(events)]
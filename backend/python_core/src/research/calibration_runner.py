@@ -5,93 +5,446 @@ import os
 import time
 import sys
 import hashlib
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple, Optional, Iterator
 import numpy as np
 import cv2
 
+# Optional JIT for the fused per-frame field reductions
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+# Optional libav decoder; OpenCV's VideoCapture is the fallback
+try:
+    import av
+    import av.filter
+    HAS_AV = True
+except ImportError:
+    HAS_AV = False
+
 # Ensure src modules can be imported
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+# Frame tags read back from the fused signalstats + cropdetect pass
+FRAME_TAGS = (
+    "lavfi.signalstats.VREP", "lavfi.signalstats.YMIN", "lavfi.signalstats.YMAX",
+    "lavfi.cropdetect.w", "lavfi.cropdetect.h", "lavfi.cropdetect.x", "lavfi.cropdetect.y",
+)
+
+# File identity: BLAKE2b over the first and last MiB plus the size
+FINGERPRINT_EDGE_BYTES = 1 << 20
+
+# Bump whenever an analysis changes what it measures, so entries of older
+# reports are recomputed instead of reused
+ANALYSIS_VERSION = 1
+
+# SSIM stabilizers for 8-bit data: (0.01*255)^2, (0.03*255)^2
+SSIM_C1, SSIM_C2 = 6.5025, 58.5225
+
+def _cuda_available() -> bool:
+    """True when OpenCV was built with the CUDA arithm module and sees a device."""
+    try:
+        return (hasattr(cv2, "cuda")
+                and hasattr(cv2.cuda, "absdiff")
+                and hasattr(cv2.cuda, "createGpuMatFromCudaMemory")
+                and cv2.cuda.getCudaEnabledDeviceCount() > 0)
+    except cv2.error:
+        return False
+
+def _nvdec_available() -> bool:
+    """True when OpenCV also has cudacodec, i.e. can decode on NVDEC."""
+    return hasattr(cv2, "cudacodec") and _cuda_available()
+
+def _fingerprint(path: Path) -> str:
+    """
+    Cheap content identity for a (possibly multi-GB) sample: hashes the head
+    and tail of the file and its size, never the whole file.
+    """
+    size = path.stat().st_size
+    h = hashlib.blake2b(size.to_bytes(8, "little"), digest_size=16)
+    with open(path, "rb") as f:
+        h.update(f.read(FINGERPRINT_EDGE_BYTES))
+        if size > FINGERPRINT_EDGE_BYTES:
+            f.seek(-min(FINGERPRINT_EDGE_BYTES, size - FINGERPRINT_EDGE_BYTES), os.SEEK_END)
+            h.update(f.read())
+    return h.hexdigest()
+
+def _field_metrics(n, sum_e, sum_o, sq_e, sq_o, sum_eo, sq_diff):
+    """
+    PSNR and SSIM approximation of one even/odd field pair, from raw sums
+    over the n pixels of a field.
+    """
+    rmse = math.sqrt(sq_diff / n)
+    psnr = 20 * math.log10(255.0 / rmse) if rmse > 0 else 100.0
+
+    mu1, mu2 = sum_e / n, sum_o / n
+    var1, var2 = sq_e / n - mu1 * mu1, sq_o / n - mu2 * mu2
+    covar = sum_eo / n - mu1 * mu2
+    ssim = ((2*mu1*mu2 + SSIM_C1)*(2*covar + SSIM_C2)) / ((mu1**2 + mu2**2 + SSIM_C1)*(var1 + var2 + SSIM_C2))
+    return psnr, ssim
+
+def _field_sums(gray, prev, has_prev):
+    """
+    One pass over the field pair of an even-height frame: sums, sums of
+    squares, cross product, squared even/odd difference and absolute
+    odd/prev-frame-odd difference (if has_prev). Walks row pairs 2y/2y+1 of
+    the frame itself, so no field views are built.
+    Compiled with Numba when available (see below); never called uncompiled.
+    """
+    h, w = gray.shape[0] // 2, gray.shape[1]
+    s1 = 0
+    s2 = 0
+    ss1 = 0
+    ss2 = 0
+    sp = 0
+    sd2 = 0
+    sprev = 0
+    for y in prange(h):
+        for x in range(w):
+            a = np.int64(gray[2 * y, x])
+            b = np.int64(gray[2 * y + 1, x])
+            s1 += a
+            s2 += b
+            ss1 += a * a
+            ss2 += b * b
+            sp += a * b
+            d = a - b
+            sd2 += d * d
+            if has_prev:
+                sprev += abs(b - np.int64(prev[2 * y + 1, x]))
+    return s1, s2, ss1, ss2, sp, sd2, sprev
+
+if HAS_NUMBA:
+    _field_sums = njit(parallel=True, cache=True, fastmath=True)(_field_sums)
+
+# 8-bit pixel formats whose first plane is the luma plane
+_Y_PLANE_FORMATS = frozenset({
+    "gray", "yuv420p", "yuvj420p", "yuv422p", "yuvj422p", "yuv444p", "yuvj444p",
+    "yuv411p", "yuv410p", "nv12", "nv21",
+})
+
+def _luma(frame: "av.VideoFrame") -> np.ndarray:
+    """
+    Luma of a decoded PyAV frame. For planar 8-bit YUV this is a zero-copy
+    view of the Y plane (row stride = linesize); other formats go through
+    libswscale's gray conversion.
+    """
+    if frame.format.name in _Y_PLANE_FORMATS:
+        plane = frame.planes[0]
+        return np.frombuffer(plane, np.uint8).reshape(plane.height, plane.line_size)[:, :plane.width]
+    return frame.to_ndarray(format="gray")
+
+def _open_gray_frames(file_path: Path, max_frames: Optional[int] = None) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Opens `file_path` and returns an iterator over every other frame as 8-bit
+    grayscale, paired with the number of frames decoded so far. Decoding stops
+    after `max_frames` when set. Raises if the file cannot be opened.
+    """
+    if HAS_AV:
+        container = av.open(str(file_path))
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+
+        def frames():
+            try:
+                for i, frame in enumerate(container.decode(stream)):
+                    if max_frames is not None and i >= max_frames:
+                        break
+                    if i % 2 != 0: # Skip every other frame for speed
+                        continue
+                    yield i + 1, _luma(frame)
+            finally:
+                container.close()
+        return frames()
+
+    cap = cv2.VideoCapture(str(file_path))
+    if not cap.isOpened():
+        raise IOError("Could not open file")
+
+    def frames():
+        try:
+            i = 0
+            while max_frames is None or i < max_frames:
+                if i % 2 != 0:
+                    # Skipped frames are only decoded, never retrieved or converted
+                    if not cap.grab():
+                        break
+                    i += 1
+                    continue
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                i += 1
+                yield i, cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        finally:
+            cap.release()
+    return frames()
+
+def _open_nvdec_gray_frames(file_path: Path, max_frames: Optional[int] = None) -> Iterator[Tuple[int, "cv2.cuda_GpuMat"]]:
+    """
+    Same contract as _open_gray_frames, but decodes on NVDEC and yields
+    device-resident GpuMats, so frames never touch host memory.
+    """
+    reader = cv2.cudacodec.createVideoReader(str(file_path))
+    # Newer builds can hand out luma only; otherwise convert BGRA on the device
+    native_gray = hasattr(cv2.cudacodec, "ColorFormat_GRAY")
+    if native_gray:
+        reader.set(cv2.cudacodec.ColorFormat_GRAY)
+    gray = cv2.cuda_GpuMat()
+
+    def frames():
+        i = 0
+        while max_frames is None or i < max_frames:
+            if i % 2 != 0: # Skip every other frame for speed
+                if not reader.grab():
+                    break
+                i += 1
+                continue
+            ret, frame = reader.nextFrame()
+            if not ret:
+                break
+            i += 1
+            yield i, frame if native_gray else cv2.cuda.cvtColor(frame, cv2.COLOR_BGRA2GRAY, gray)
+    return frames()
+
+def _worker_init():
+    """
+    Pool initializer: compiles (or loads from cache) the field kernel so the
+    first real frame isn't compile-bound. Runs in the workers only; Numba's
+    thread pool must not be started in the parent before workers are created.
+    """
+    if HAS_NUMBA:
+        dummy = np.zeros((64, 64), dtype=np.uint8)
+        _field_sums(dummy, dummy, False)
+
+class CudaFieldStats:
+    """
+    Device-side field divergence for one file. Buffers are allocated once and
+    reused; per frame there is at most one grayscale upload (none for NVDEC
+    frames) and only scalar sums come back to the host.
+    """
+    def __init__(self):
+        self.gray = cv2.cuda_GpuMat()
+        self.diff = cv2.cuda_GpuMat()
+        self.prod = cv2.cuda_GpuMat()
+        self.prev_odd = cv2.cuda_GpuMat()
+        self.has_prev = False
+
+    def _fields(self, gray):
+        # Even/odd rows as strided views over the same device buffer
+        h, w = gray.size()[1] // 2, gray.size()[0]
+        ptr, step = gray.cudaPtr(), gray.step
+        even = cv2.cuda.createGpuMatFromCudaMemory(h, w, cv2.CV_8UC1, ptr, step * 2)
+        odd = cv2.cuda.createGpuMatFromCudaMemory(h, w, cv2.CV_8UC1, ptr + step, step * 2)
+        return even, odd
+
+    def compute(self, gray):
+        """
+        Returns (psnr, ssim, temp_div or None) for one 8-bit grayscale frame,
+        given as a host array or an already device-resident GpuMat.
+        """
+        if isinstance(gray, cv2.cuda_GpuMat):
+            even, odd = self._fields(gray)
+        else:
+            self.gray.upload(gray)
+            even, odd = self._fields(self.gray)
+        n = even.size()[0] * even.size()[1]
+
+        self.diff = cv2.cuda.absdiff(even, odd, self.diff)
+        sq_diff = cv2.cuda.sqrSum(self.diff)[0]
+        self.prod = cv2.cuda.multiply(even, odd, self.prod, dtype=cv2.CV_32F)
+        psnr, ssim = _field_metrics(
+            n,
+            cv2.cuda.sum(even)[0], cv2.cuda.sum(odd)[0],
+            cv2.cuda.sqrSum(even)[0], cv2.cuda.sqrSum(odd)[0],
+            cv2.cuda.sum(self.prod)[0], sq_diff
+        )
+
+        temp_div = None
+        if self.has_prev:
+            self.diff = cv2.cuda.absdiff(odd, self.prev_odd, self.diff)
+            temp_div = cv2.cuda.sum(self.diff)[0] / n
+        self.prev_odd = odd.copyTo(self.prev_odd)
+        self.has_prev = True
+
+        return psnr, ssim, temp_div
+
 class CalibrationRunner:
-    def __init__(self, input_dir: str, output_file: str, mode: str = "full"):
+    def __init__(self, input_dir: str, output_file: str, mode: str = "full", use_gpu: bool = False):
         self.input_dir = Path(input_dir)
         self.output_file = Path(output_file)
         self.mode = mode
+        # Device support is probed in the workers, not here: CUDA must not be
+        # initialised before the process pool forks
+        self.use_gpu = use_gpu
         self.results = {
             "metadata": {
                 "timestamp": time.time(),
                 "mode": mode,
-                "input_dir": str(input_dir)
+                "input_dir": str(input_dir),
+                "analysis_version": ANALYSIS_VERSION,
+                "use_gpu": use_gpu
             },
             "files": [],
             "benchmarks": {}
         }
 
     def _get_files(self) -> List[Path]:
-        extensions = {".mp4", ".mov", ".mkv", ".avi", ".mxf"}
+        # Extension check on the bare name; a Path is only built per match.
+        # Hidden entries (.git, .DS_Store, ...) are skipped without descending.
+        extensions = {"mp4", "mov", "mkv", "avi", "mxf"}
         files = []
-        for root, _, filenames in os.walk(self.input_dir):
-            for f in filenames:
-                if Path(f).suffix.lower() in extensions:
-                    files.append(Path(root) / f)
+        stack = [str(self.input_dir)]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.name[0] == ".":
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        dot = entry.name.rfind(".")
+                        if dot > 0 and entry.name[dot + 1:].lower() in extensions:
+                            files.append(Path(entry.path))
         return files
 
-    def run_signalstats(self, file_path: Path) -> Dict[str, Any]:
+    def _filter_frames_av(self, file_path: Path) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[Dict[str, str]]]:
+        """
+        Pushes decoded frames through an in-process signalstats -> cropdetect
+        graph and reads the tags straight off each frame's metadata.
+        Returns (vrep, ymin, ymax, last crop tags).
+        """
+        # If mode is 'micro-batch', we limit to first 30 seconds.
+        max_time = 30.0 if self.mode == "micro-batch" else None
+        with av.open(str(file_path)) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+
+            graph = av.filter.Graph()
+            graph.link_nodes(
+                graph.add_buffer(template=stream),
+                graph.add("signalstats", "stat=vrep"),
+                graph.add("cropdetect", "24:16:0"),
+                graph.add("buffersink")
+            ).configure()
+
+            # Sized from the container's frame count, grown if that was short or unknown
+            size = stream.frames or 1024
+            vrep = np.empty(size, dtype=np.float32)
+            ymin = np.empty(size, dtype=np.int16)
+            ymax = np.empty(size, dtype=np.int16)
+            n = 0
+            crop = None
+
+            def drain():
+                nonlocal n, crop, vrep, ymin, ymax
+                while True:
+                    try:
+                        out = graph.vpull()
+                    except (av.error.BlockingIOError, av.error.EOFError):
+                        return
+                    tags = out.metadata
+                    if n == len(vrep):
+                        vrep, ymin, ymax = (np.resize(a, 2 * n) for a in (vrep, ymin, ymax))
+                    vrep[n] = float(tags.get("lavfi.signalstats.VREP", 0))
+                    ymin[n] = int(tags.get("lavfi.signalstats.YMIN", 16))
+                    ymax[n] = int(tags.get("lavfi.signalstats.YMAX", 235))
+                    n += 1
+                    # cropdetect with reset=0 accumulates, so the last tagged frame wins
+                    if "lavfi.cropdetect.w" in tags:
+                        crop = tags
+
+            for frame in container.decode(stream):
+                if max_time is not None and frame.time is not None and frame.time > max_time:
+                    break
+                graph.vpush(frame)
+                drain()
+            graph.vpush(None)
+            drain()
+
+        return vrep[:n], ymin[:n], ymax[:n], crop
+
+    def _filter_frames_ffprobe(self, file_path: Path) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[Dict[str, str]]]:
         """
-        Runs signalstats filter to get VREP, YMIN, YMAX, SATMAX.
+        Same as _filter_frames_av, through an ffprobe lavfi graph and its JSON
+        frame dump. Used when PyAV is not installed.
         """
         cmd = [
-            "ffprobe", "-v", "error", "-f", "lavfi",
-            f"-i", f"movie={file_path.as_posix().replace(':', '\\:')},signalstats",
-            "-show_entries", "frame=pkt_pts_time:frame_tags=YMIN,YMAX,SATMAX,lavfi.signalstats.VREP",
+            "ffprobe", "-v", "error", "-threads", "0", "-f", "lavfi",
+            "-i", "movie=" + file_path.as_posix().replace(':', '\\:') + ",signalstats=stat=vrep,cropdetect=24:16:0",
+            "-show_entries", "frame=pkt_pts_time:frame_tags=" + ",".join(FRAME_TAGS),
             "-of", "json"
         ]
-        
-        start_time = time.time()
-        try:
-            # For micro-batch benchmarking, we might limit frames, but for calibration we need full scan.
-            # If mode is 'micro-batch', we limit to first 30 seconds.
-            if self.mode == "micro-batch":
-                cmd.extend(["-read_intervals", "%+30"])
+        # For micro-batch benchmarking, we might limit frames, but for calibration we need full scan.
+        # If mode is 'micro-batch', we limit to first 30 seconds.
+        if self.mode == "micro-batch":
+            cmd.extend(["-read_intervals", "%+30"])
 
-            res = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            duration = time.time() - start_time
+        res = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        frames = json.loads(res.stdout).get("frames", [])
             
-            data = json.loads(res.stdout)
-            frames = data.get("frames", [])
-            
-            # Process VREP Spikes
-            vrep_values = []
-            ymin_values = []
-            ymax_values = []
-            
-            for f in frames:
-                tags = f.get("tags", {})
-                vrep_values.append(float(tags.get("lavfi.signalstats.VREP", 0)))
-                ymin_values.append(int(tags.get("YMIN", 16)))
-                ymax_values.append(int(tags.get("YMAX", 235)))
-                
-            # Spike Detection Logic
-            # A 'spike' is defined as VREP > 5.0
-            # A 'dropout event' is multiple spikes in close succession.
-            spikes = [v for v in vrep_values if v > 5.0]
+        n = len(frames)
+        tags = [f.get("tags", {}) for f in frames]
+        vrep = np.fromiter((float(t.get("lavfi.signalstats.VREP", 0)) for t in tags), dtype=np.float32, count=n)
+        ymin = np.fromiter((int(t.get("lavfi.signalstats.YMIN", 16)) for t in tags), dtype=np.int16, count=n)
+        ymax = np.fromiter((int(t.get("lavfi.signalstats.YMAX", 235)) for t in tags), dtype=np.int16, count=n)
+        # cropdetect with reset=0 accumulates, so the last tagged frame wins
+        crop = next((t for t in reversed(tags) if "lavfi.cropdetect.w" in t), None)
+
+        return vrep, ymin, ymax, crop
+
+    def run_ffmpeg_analysis(self, file_path: Path) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Runs signalstats (VREP, YMIN, YMAX) and cropdetect in one decode pass.
+        Both filters only tag frame metadata, so they chain without a split.
+        Returns (signals, geometry).
+        """
+        start_time = time.time()
+        try:
+            if HAS_AV:
+                vrep, ymin, ymax, crop = self._filter_frames_av(file_path)
+            else:
+                vrep, ymin, ymax, crop = self._filter_frames_ffprobe(file_path)
+        except Exception as e:
+            error = {"status": "error", "error": str(e)}
+            return error, dict(error)
+        duration = time.time() - start_time
+        n = len(vrep)
             
-            return {
-                "status": "success",
-                "duration_sec": duration,
-                "frames_processed": len(frames),
-                "fps": len(frames) / duration if duration > 0 else 0,
-                "metrics": {
-                    "vrep_max": max(vrep_values) if vrep_values else 0,
-                    "vrep_mean": np.mean(vrep_values) if vrep_values else 0,
-                    "vrep_spike_count": len(spikes),
-                    "ymin_min": min(ymin_values) if ymin_values else 255,
-                    "ymax_max": max(ymax_values) if ymax_values else 0
-                }
+        # Spike Detection Logic
+        # A 'spike' is defined as VREP > 5.0
+        # A 'dropout event' is multiple spikes in close succession.
+        signals = {
+            "status": "success",
+            "duration_sec": duration,
+            "frames_processed": n,
+            "fps": n / duration if duration > 0 else 0,
+            "metrics": {
+                "vrep_max": float(vrep.max(initial=0.0)),
+                "vrep_mean": float(vrep.mean()) if n else 0,
+                "vrep_spike_count": int(np.count_nonzero(vrep > 5.0)),
+                "ymin_min": int(ymin.min(initial=255)),
+                "ymax_max": int(ymax.max(initial=0))
             }
-        except Exception as e:
-            return {"status": "error", "error": str(e)}
+        }
+        
+        if crop is None:
+            return signals, {"status": "no_crop_detected"}
+        geometry = {
+            "status": "success",
+            "w": int(crop["lavfi.cropdetect.w"]),
+            "h": int(crop["lavfi.cropdetect.h"]),
+            "x": int(crop["lavfi.cropdetect.x"]),
+            "y": int(crop["lavfi.cropdetect.y"])
+        }
+        return signals, geometry
 
     def run_ssim_interlace_check(self, file_path: Path) -> Dict[str, Any]:
         """
@@ -99,137 +452,194 @@ class CalibrationRunner:
         """
         # We need to reuse logic from validate_interlace.py, but since we are researching,
         # we will implement the core collector here to keep it independent.
-        cap = cv2.VideoCapture(str(file_path))
-        if not cap.isOpened():
-            return {"status": "error", "error": "Could not open file"}
-            
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
         # Micro-batch limit
-        max_frames = 30 * 25 if self.mode == "micro-batch" else frame_count
+        max_frames = 30 * 25 if self.mode == "micro-batch" else None
         
-        psnr_vals = []
-        ssim_vals = []
-        temp_div_vals = []
+        # NVDEC decode only on request (--gpu); it hands frames over as GpuMats
+        nvdec = self.use_gpu and _nvdec_available()
+        try:
+            if nvdec:
+                frames = _open_nvdec_gray_frames(file_path, max_frames)
+            else:
+                frames = _open_gray_frames(file_path, max_frames)
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
         
-        prev_odd = None
+        # Per-frame (psnr, ssim, temp_div) rows; temp_div is NaN on the first
+        # frame. Sized for the micro-batch budget, grown on demand otherwise.
+        vals = np.empty((max_frames // 2 + 1 if max_frames else 1024, 3), dtype=np.float32)
+        k = 0
+        
+        prev_gray = None
+        # Field math on the GPU only on request (--gpu) and when OpenCV has CUDA;
+        # NVDEC frames are GpuMats, and nvdec already implies both
+        gpu_stats = CudaFieldStats() if self.use_gpu and _cuda_available() else None
         
         start_time = time.time()
         read_frames = 0
         
-        while read_frames < max_frames:
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            if read_frames % 2 != 0: # Skip every other frame for speed
-                read_frames += 1
-                continue
+        # PyAV/OpenCV can fail mid-file (corrupt packet, lost GPU); report it as
+        # this file's interlace error instead of failing the whole run
+        try:
+            for read_frames, gray in frames:
+                if gpu_stats is not None:
+                    psnr, ssim, temp_div = gpu_stats.compute(gray)
+                else:
+                    # Crop to an even height so both fields have the same rows
+                    gray = gray[:gray.shape[0] // 2 * 2]
+                    n = gray.size // 2
                 
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            h, w = gray.shape
-            
-            even = gray[0::2, :]
-            odd = gray[1::2, :]
-            min_h = min(even.shape[0], odd.shape[0])
-            even = even[:min_h, :]
-            odd = odd[:min_h, :]
+                    temp_div = None
+                    if HAS_NUMBA:
+                        # Fused single pass over the row pairs of the frame
+                        sums = _field_sums(gray, gray if prev_gray is None else prev_gray, prev_gray is not None)
+                        psnr, ssim = _field_metrics(n, *sums[:6])
+                        if prev_gray is not None:
+                            temp_div = sums[6] / n
+                        # Each decoded frame owns its buffer, so a view is safe to keep
+                        prev_gray = gray
+                    else:
+                        even = gray[0::2]
+                        odd = gray[1::2]
+                    
+                        # PSNR: cv2.norm takes the L2 distance on the uint8 fields
+                        # directly (no wrap-around, no float64 difference image)
+                        rmse = cv2.norm(even, odd, cv2.NORM_L2) / math.sqrt(even.size)
+                        psnr = 20 * math.log10(255.0 / rmse) if rmse > 0 else 100.0
+                    
+                        # SSIM Approx (Mean/Var): mean and deviation in one
+                        # meanStdDev sweep per field, covariance from E[xy] on an
+                        # int32 product, so no float64 centred copies
+                        mu1, sd1 = (float(v[0, 0]) for v in cv2.meanStdDev(even))
+                        mu2, sd2 = (float(v[0, 0]) for v in cv2.meanStdDev(odd))
+                        var1, var2 = sd1 * sd1, sd2 * sd2
+                        covar = cv2.sumElems(cv2.multiply(even, odd, dtype=cv2.CV_32S))[0] / even.size - mu1 * mu2
+                        ssim = ((2*mu1*mu2 + SSIM_C1)*(2*covar + SSIM_C2)) / ((mu1**2 + mu2**2 + SSIM_C1)*(var1 + var2 + SSIM_C2))
+                    
+                        # Temp Div
+                        if prev_gray is not None:
+                            temp_div = np.mean(np.abs(odd.astype(np.int16) - prev_gray[1::2]))
+                        prev_gray = gray
             
-            # PSNR
-            diff = even - odd
-            rmse = np.sqrt(np.mean(diff**2))
-            psnr = 20 * np.log10(255.0 / rmse) if rmse > 0 else 100.0
-            psnr_vals.append(psnr)
-            
-            # SSIM Approx (Mean/Var)
-            mu1, mu2 = np.mean(even), np.mean(odd)
-            var1, var2 = np.var(even), np.var(odd)
-            covar = np.mean((even - mu1) * (odd - mu2))
-            c1, c2 = 6.5025, 58.5225
-            ssim = ((2*mu1*mu2 + c1)*(2*covar + c2)) / ((mu1**2 + mu2**2 + c1)*(var1 + var2 + c2))
-            ssim_vals.append(ssim)
-            
-            # Temp Div
-            if prev_odd is not None:
-                temp_div = np.mean(np.abs(odd - prev_odd))
-                temp_div_vals.append(temp_div)
-            prev_odd = odd.copy()
-            
-            read_frames += 1
+                if k == len(vals):
+                    vals = np.resize(vals, (2 * k, 3))
+                vals[k] = (psnr, ssim, np.nan if temp_div is None else temp_div)
+                k += 1
+        except Exception as e:
+            return {"status": "error", "error": f"failed after {k} frames: {e}"}
             
-        cap.release()
         duration = time.time() - start_time
+        psnr_vals, ssim_vals, temp_div_vals = vals[:k, 0], vals[:k, 1], vals[1:k, 2]
         
         return {
             "status": "success",
             "duration_sec": duration,
             "fps": read_frames / duration if duration > 0 else 0,
             "metrics": {
-                "avg_psnr": np.mean(psnr_vals) if psnr_vals else 0,
-                "min_psnr": np.min(psnr_vals) if psnr_vals else 0,
-                "avg_ssim": np.mean(ssim_vals) if ssim_vals else 0,
-                "min_ssim": np.min(ssim_vals) if ssim_vals else 0,
-                "avg_temp_div": np.mean(temp_div_vals) if temp_div_vals else 0
+                "avg_psnr": float(psnr_vals.mean()) if k else 0,
+                "min_psnr": float(psnr_vals.min()) if k else 0,
+                "avg_ssim": float(ssim_vals.mean()) if k else 0,
+                "min_ssim": float(ssim_vals.min()) if k else 0,
+                "avg_temp_div": float(temp_div_vals.mean()) if k > 1 else 0
             }
         }
 
-    def run_cropdetect(self, file_path: Path) -> Dict[str, Any]:
+    def _process_file(self, f: Path) -> Dict[str, Any]:
         """
-        Runs cropdetect to find active area.
+        Runs the ffmpeg pass and the interlace check of one file concurrently.
+        They share no state and mostly wait on ffprobe or decode, which release the GIL.
         """
-        # Run on a few intervals: Start, Middle, End
-        # We'll use start for now as per simple calibration
-        cmd = [
-            "ffmpeg", "-hide_banner", "-ss", "10", "-i", str(file_path),
-            "-vf", "cropdetect=24:16:0", "-frames:v", "10", "-f", "null", "-"
-        ]
+        print(f"Processing {f.name}...")
+        file_data = {
+            "filename": f.name, 
+            "path": str(f),
+            "signals": {},
+            "interlace": {},
+            "geometry": {}
+        }
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            # 1. Signal Stats (VREP) + Geometry, 2. Interlace (SSIM)
+            ffmpeg = pool.submit(self.run_ffmpeg_analysis, f)
+            interlace = pool.submit(self.run_ssim_interlace_check, f)
+
+            file_data["signals"], file_data["geometry"] = ffmpeg.result()
+            file_data["interlace"] = interlace.result()
+
+        return file_data
+
+    def _load_previous(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Entries of an existing report at output_file from a run with the same
+        mode, analysis version and GPU setting (GPU and CPU paths can differ
+        slightly), keyed by fingerprint. Entries with a failed analysis are
+        left out so they are retried.
+        """
+        if not self.output_file.exists():
+            return {}
         try:
-            res = subprocess.run(cmd, capture_output=True, text=True)
-            # Parse stderr for crop=w:h:x:y
-            # We look for the most frequent crop or the last one
-            import re
-            matches = re.findall(r"crop=(\d+):(\d+):(\d+):(\d+)", res.stderr)
-            if matches:
-                last = matches[-1]
-                return {
-                    "status": "success",
-                    "w": int(last[0]),
-                    "h": int(last[1]),
-                    "x": int(last[2]),
-                    "y": int(last[3])
-                }
-            return {"status": "no_crop_detected"}
-        except Exception as e:
-             return {"status": "error", "error": str(e)}
+            with open(self.output_file, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        metadata = data.get("metadata", {})
+        if (metadata.get("mode") != self.mode
+                or metadata.get("analysis_version") != ANALYSIS_VERSION
+                or metadata.get("use_gpu") != self.use_gpu):
+            return {}
+        previous = {}
+        for entry in data.get("files", []):
+            analyses = (entry.get("signals", {}), entry.get("interlace", {}), entry.get("geometry", {}))
+            if "fingerprint" in entry and all(a.get("status") != "error" for a in analyses):
+                previous[entry["fingerprint"]] = entry
+        return previous
 
     def execute(self):
         files = self._get_files()
         print(f"Found {len(files)} files to process in {self.input_dir}")
         
-        for f in files:
-            print(f"Processing {f.name}...")
-            file_data = {
-                "filename": f.name, 
-                "path": str(f),
-                "signals": {},
-                "interlace": {},
-                "geometry": {}
-            }
-            
-            # 1. Signal Stats (VREP)
-            print("  - Running SignalStats...")
-            file_data["signals"] = self.run_signalstats(f)
-            
-            # 2. Interlace (SSIM)
-            print("  - Running Interlace/SSIM analysis...")
-            file_data["interlace"] = self.run_ssim_interlace_check(f)
-            
-            # 3. Geometry
-            print("  - Running CropDetect...")
-            file_data["geometry"] = self.run_cropdetect(f)
-            
-            self.results["files"].append(file_data)
+        # Unchanged files keep their entry from the last report
+        previous = self._load_previous()
+        fingerprints = [_fingerprint(f) for f in files]
+        file_results = [None] * len(files)
+        pending = []
+        for i, (f, fp) in enumerate(zip(files, fingerprints)):
+            if fp in previous:
+                file_results[i] = dict(previous[fp], filename=f.name, path=str(f))
+            else:
+                pending.append(i)
+        if len(pending) < len(files):
+            print(f"Reusing results for {len(files) - len(pending)} unchanged file(s)")
+        
+        # Each file keeps ~2 jobs busy, so this keeps the total near the core count
+        workers = max(1, (os.cpu_count() or 1) // 2)
+        # forkserver: workers never inherit a parent that already runs native
+        # thread pools (forking those can deadlock)
+        ctx = multiprocessing.get_context("forkserver") if sys.platform.startswith("linux") else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_worker_init) as executor:
+            futures = {executor.submit(self._process_file, files[i]): i for i in pending}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    file_results[i] = future.result()
+                except Exception as e:
+                    # Worker died or the file could not be read: record it, keep going.
+                    # Error entries are not reused, so the next run retries the file.
+                    print(f"  ! Failed {files[i].name}: {e}")
+                    error = {"status": "error", "error": str(e)}
+                    file_results[i] = {
+                        "filename": files[i].name,
+                        "path": str(files[i]),
+                        "signals": error,
+                        "interlace": dict(error),
+                        "geometry": dict(error)
+                    }
+                else:
+                    print(f"  + Finished {files[i].name}")
+                file_results[i]["fingerprint"] = fingerprints[i]
+
+        # Input order, regardless of completion order
+        self.results["files"].extend(file_results)
             
         # Write Output
         with open(self.output_file, "w") as f:
@@ -289,7 +699,5 @@ if __name__ == "__main__":
         if not args.input:
             print("Error: --input required unless mode is mock")
             sys.exit(1)
-        runner = CalibrationRunner(args.input, args.output, args.mode)
-        # In a real impl, we would pass args.gpu to the runner
-        # runner.use_gpu = args.gpu 
+        runner = CalibrationRunner(args.input, args.output, args.mode, use_gpu=args.gpu)
         runner.execute()
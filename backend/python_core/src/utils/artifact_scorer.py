@@ -1,7 +1,9 @@
 import cv2
+import logging
 import os
 import numpy as np
 from typing import List, Dict, Optional, Any
+from src.utils import brisque_nss
 from src.utils.frame_sampler import sample_frames
 from src.utils.logger import setup_logger
 
@@ -16,7 +18,9 @@ class ArtifactScorer:
     compression artifacts, blur, and noise without a reference video.
     
     Attributes:
-        _brisque (cv2.quality.QualityBRISQUE): The loaded OpenCV model.
+        _brisque: The loaded model; a brisque_nss.BrisqueModel when Numba is
+            available, else cv2.quality.QualityBRISQUE.
+        _score: Frame -> raw score callable for whichever model was loaded.
         _initialized (bool): Flag indicating if the model loaded successfully.
     """
     
@@ -28,6 +32,7 @@ class ArtifactScorer:
     def __init__(self):
         """Initializes the ArtifactScorer and attempts to load model weights."""
         self._brisque = None
+        self._score = None
         self._initialized = False
         self._load_model()
 
@@ -35,24 +40,35 @@ class ArtifactScorer:
         """
         Loads BRISQUE model files from the local filesystem.
         
-        Logs an error if files are missing or the cv2.quality module is unavailable.
+        Prefers the Numba NSS implementation (src.utils.brisque_nss), which
+        reads the same files; falls back to cv2.quality.
+        Logs an error if files are missing or no implementation is available.
         """
         if not (os.path.exists(self._MODEL_FILE) and os.path.exists(self._RANGE_FILE)):
-            logger.error(f"BRISQUE model files not found at {self._MODEL_DIR}")
+            logger.error("BRISQUE model files not found at %s", self._MODEL_DIR)
             return
 
         try:
-            if hasattr(cv2, 'quality'):
+            if brisque_nss.HAS_NUMBA:
+                self._brisque = brisque_nss.BrisqueModel(self._MODEL_FILE, self._RANGE_FILE)
+                self._score = self._brisque.compute
+                # Compile (or load from cache) now so the first real frame isn't compile-bound
+                self._score(np.random.randint(0, 255, (64, 64, 3), dtype=np.uint8))
+                self._initialized = True
+                logger.info("BRISQUE model loaded successfully (Numba NSS)")
+            elif hasattr(cv2, 'quality'):
                 self._brisque = cv2.quality.QualityBRISQUE_create(
                     self._MODEL_FILE, 
                     self._RANGE_FILE
                 )
+                # compute returns a tuple (score, details...), we want index 0
+                self._score = lambda frame: self._brisque.compute(frame)[0]
                 self._initialized = True
                 logger.info("BRISQUE model loaded successfully")
             else:
                 logger.error("cv2.quality module missing. Install opencv-contrib-python-headless.")
         except Exception as e:
-            logger.error(f"Failed to initialize BRISQUE model: {e}")
+            logger.error("Failed to initialize BRISQUE model: %s", e)
 
     def _is_valid_frame(self, frame: np.ndarray) -> bool:
         """
@@ -75,9 +91,12 @@ class ArtifactScorer:
             return False
             
         # Check for solid color (variance ~ 0)
-        # We convert to grayscale for a quick check.
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        variance = np.var(gray)
+        # A solid frame stays solid when subsampled, so the check runs on a
+        # 64x64 nearest-neighbour thumbnail instead of the full frame.
+        small = cv2.resize(frame, (64, 64), interpolation=cv2.INTER_NEAREST)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        _, stddev = cv2.meanStdDev(gray)
+        variance = float(stddev[0, 0]) ** 2
         
         # If variance is near zero, it's a solid color (black, white, blue screen).
         # BRISQUE requires texture to calculate natural scene statistics.
@@ -106,9 +125,7 @@ class ArtifactScorer:
                 return -1.0 # Skip invalid frames silently
             
             # 2. Compute Score
-            # compute returns a tuple (score, details...), we want index 0
-            score_vec = self._brisque.compute(frame)
-            score = float(score_vec[0])
+            score = float(self._score(frame))
             
             # 3. Sanity Check Result
             # OpenCV implementation can sometimes return inf/nan on edge cases
@@ -119,7 +136,7 @@ class ArtifactScorer:
             
         except Exception as e:
             # Log debug only to avoid flooding logs during processing
-            logger.debug(f"BRISQUE scoring skipped frame: {e}")
+            logger.debug("BRISQUE scoring skipped frame: %s", e)
             return -1.0
 
     def classify_severity(self, score: float, thresholds: Optional[Dict[str, float]] = None) -> str:
@@ -159,7 +176,7 @@ class ArtifactScorer:
             logger.error("BRISQUE uninitialized. Skipping analysis.")
             return results
 
-        logger.info(f"Starting ML analysis on {os.path.basename(video_path)}")
+        logger.info("Starting ML analysis on %s", os.path.basename(video_path))
         
         try:
             # frame_sampler returns iterator of (timestamp, frame)
@@ -178,7 +195,7 @@ class ArtifactScorer:
                     })
                     
         except Exception as e:
-            logger.error(f"Critical error in video analysis: {e}")
+            logger.error("Critical error in video analysis: %s", e)
             
         return results
 
@@ -0,0 +1,171 @@
+import math
+import cv2
+import numpy as np
+from typing import Tuple
+
+# Numba is optional; without it ArtifactScorer keeps using cv2.quality
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+# 7x7 Gaussian window (sigma 7/6) used for the local mean/variance, as in
+# OpenCV's QualityBRISQUE; separable, so kept as one 1-D tap vector
+_TAPS = np.exp(-np.arange(-3, 4, dtype=np.float64) ** 2 / (2 * (7.0 / 6.0) ** 2))
+GAUSS_TAPS = (_TAPS / _TAPS.sum()).astype(np.float32)
+
+# Pair-product orientations (H, V, D1, D2) as (row, col) shifts
+SHIFTS = np.array([[0, 1], [1, 0], [1, 1], [-1, 1]], dtype=np.int64)
+
+# r(gamma) = G(2/g)^2 / (G(1/g) G(3/g)) on OpenCV's search grid (0.2..10, step 0.001).
+# It is monotonic, so the AGGD shape fit is a nearest-value lookup.
+_GAMMA_GRID = np.arange(0.2, 10.0, 0.001)
+_R_GAMMA = np.array([math.gamma(2 / g) ** 2 / (math.gamma(1 / g) * math.gamma(3 / g)) for g in _GAMMA_GRID])
+
+def _mscn(img, taps):
+    """
+    MSCN coefficients of a float32 image in [0, 1]: (I - mu) / (sigma + 1/255),
+    with mu and sigma from a separable Gaussian window. Borders are clamped
+    (cv2.BORDER_REPLICATE): QualityBRISQUE passes that mode explicitly rather
+    than GaussianBlur's BORDER_REFLECT_101 default, so reflecting here would
+    drift from its scores. Blurs I and I^2 together, one row per parallel iteration.
+    """
+    h, w = img.shape
+    r = len(taps) // 2
+    mu_h = np.empty((h, w), dtype=np.float32)
+    sq_h = np.empty((h, w), dtype=np.float32)
+    for y in prange(h):
+        for x in range(w):
+            m = np.float32(0.0)
+            s = np.float32(0.0)
+            for k in range(-r, r + 1):
+                xx = min(max(x + k, 0), w - 1)
+                v = img[y, xx]
+                m += taps[k + r] * v
+                s += taps[k + r] * v * v
+            mu_h[y, x] = m
+            sq_h[y, x] = s
+
+    out = np.empty((h, w), dtype=np.float32)
+    for y in prange(h):
+        for x in range(w):
+            m = np.float32(0.0)
+            s = np.float32(0.0)
+            for k in range(-r, r + 1):
+                yy = min(max(y + k, 0), h - 1)
+                m += taps[k + r] * mu_h[yy, x]
+                s += taps[k + r] * sq_h[yy, x]
+            sigma = math.sqrt(abs(s - m * m)) + np.float32(1.0 / 255.0)
+            out[y, x] = (img[y, x] - m) / sigma
+    return out
+
+def _aggd_moments(mscn, shifts):
+    """
+    Moments for the AGGD fits of the MSCN image and its four pair products,
+    without materializing the shifted images. Out-of-range neighbours count
+    as 0, as in OpenCV.
+
+    Returns a (5, 5) float64 array, one row per signal (MSCN, H, V, D1, D2):
+    positive count, negative count, positive sum of squares, negative sum of
+    squares, sum of absolute values.
+    """
+    h, w = mscn.shape
+    # Per-row partials (rows x signals x moments), summed after the parallel loop
+    acc = np.zeros((h, 5, 5), dtype=np.float64)
+    for y in prange(h):
+        for x in range(w):
+            c = np.float64(mscn[y, x])
+            for s in range(5):
+                if s == 0:
+                    v = c
+                else:
+                    yy = y + shifts[s - 1, 0]
+                    xx = x + shifts[s - 1, 1]
+                    if yy < 0 or yy >= h or xx >= w:
+                        continue
+                    v = c * mscn[yy, xx]
+                if v > 0:
+                    acc[y, s, 0] += 1
+                    acc[y, s, 2] += v * v
+                    acc[y, s, 4] += v
+                elif v < 0:
+                    acc[y, s, 1] += 1
+                    acc[y, s, 3] += v * v
+                    acc[y, s, 4] -= v
+    return acc.sum(axis=0)
+
+if HAS_NUMBA:
+    _mscn = njit(parallel=True, cache=True, fastmath=True)(_mscn)
+    _aggd_moments = njit(parallel=True, cache=True)(_aggd_moments)
+
+def _aggd_fit(m: np.ndarray, total: int) -> Tuple[float, float, float]:
+    """Closed-form AGGD fit from one row of _aggd_moments: (gamma, lsigma, rsigma)."""
+    pos, neg, possq, negsq, abssum = m
+    lsigma = math.sqrt(negsq / neg) if neg else 0.0
+    rsigma = math.sqrt(possq / pos) if pos else 0.0
+    gammahat = lsigma / rsigma if rsigma else 0.0
+    meansq = (negsq + possq) / total
+    rhat = (abssum / total) ** 2 / meansq if meansq else 0.0
+    rhatnorm = rhat * (gammahat ** 3 + 1) * (gammahat + 1) / (gammahat ** 2 + 1) ** 2
+    gamma = float(_GAMMA_GRID[np.argmin(np.abs(_R_GAMMA - rhatnorm))])
+    return gamma, lsigma, rsigma
+
+def compute_features(frame: np.ndarray) -> np.ndarray:
+    """
+    The 36 BRISQUE features (2 scales x [MSCN shape/variance + 4 pair
+    products x (shape, mean, left var, right var)]) of a BGR or gray frame,
+    in the layout QualityBRISQUE's model expects. Requires Numba.
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    img = gray.astype(np.float32) * np.float32(1.0 / 255.0)
+
+    features = np.empty(36, dtype=np.float32)
+    i = 0
+    for scale in range(2):
+        if scale:
+            img = cv2.resize(img, (img.shape[1] // 2, img.shape[0] // 2), interpolation=cv2.INTER_CUBIC)
+        moments = _aggd_moments(_mscn(img, GAUSS_TAPS), SHIFTS)
+        total = img.size
+
+        gamma, lsigma, rsigma = _aggd_fit(moments[0], total)
+        features[i:i + 2] = (gamma, (lsigma ** 2 + rsigma ** 2) / 2)
+        i += 2
+        for s in range(1, 5):
+            gamma, lsigma, rsigma = _aggd_fit(moments[s], total)
+            g1, g2, g3 = math.gamma(1 / gamma), math.gamma(2 / gamma), math.gamma(3 / gamma)
+            mean = (rsigma - lsigma) * (g2 / g1) * math.sqrt(g1) / math.sqrt(g3)
+            features[i:i + 4] = (gamma, mean, lsigma ** 2, rsigma ** 2)
+            i += 4
+    return features
+
+class BrisqueModel:
+    """
+    The LIVE-trained BRISQUE SVR, held as NumPy arrays so a prediction is
+    one RBF kernel evaluation against all support vectors and a dot product.
+    Reads the same model/range YAML files as cv2.quality.QualityBRISQUE.
+    """
+    def __init__(self, model_file: str, range_file: str):
+        svm = cv2.ml.SVM_load(model_file)
+        rho, alpha, sv_idx = svm.getDecisionFunction(0)
+        self.support_vectors = svm.getSupportVectors()[sv_idx.ravel()].astype(np.float32)
+        self.alpha = alpha.ravel().astype(np.float32)
+        self.rho = float(rho)
+        self.gamma = float(svm.getGamma())
+
+        fs = cv2.FileStorage(range_file, cv2.FILE_STORAGE_READ)
+        feature_range = fs.getNode("range").mat()
+        fs.release()
+        self.lo = feature_range[0].astype(np.float32)
+        self.span = (feature_range[1] - feature_range[0]).astype(np.float32)
+
+    def score(self, features: np.ndarray) -> float:
+        """BRISQUE score (0 best .. 100 worst) of one feature vector."""
+        x = -1.0 + 2.0 * (features - self.lo) / self.span
+        d2 = ((self.support_vectors - x) ** 2).sum(axis=1)
+        value = float(self.alpha @ np.exp(-self.gamma * d2)) - self.rho
+        return min(max(value, 0.0), 100.0)
+
+    def compute(self, frame: np.ndarray) -> float:
+        return self.score(compute_features(frame))
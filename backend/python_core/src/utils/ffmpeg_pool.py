@@ -0,0 +1,115 @@
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+# PyAV is optional; without it validators keep spawning the ffmpeg CLI
+try:
+    import av
+    import av.filter
+    HAS_AV = True
+except ImportError:
+    HAS_AV = False
+
+# One filter of a chain: (name, args), e.g. ("blackdetect", "d=2.0:pix_th=0.10")
+FilterSpec = Tuple[str, str]
+
+# 8-bit pixel formats whose first plane is the luma (Y) plane, one byte per sample
+LUMA8_FORMATS = frozenset({
+    "gray", "nv12", "nv21", "yuv410p", "yuv411p", "yuv420p", "yuv422p", "yuv440p", "yuv444p",
+    "yuvj411p", "yuvj420p", "yuvj422p", "yuvj440p", "yuvj444p", "yuva420p", "yuva422p", "yuva444p",
+})
+
+def container_duration(path) -> float:
+    """
+    Duration in seconds from the container header (0.0 if unknown). Opens
+    the demuxer only; nothing is decoded and no ffprobe process is spawned.
+    """
+    with av.open(str(path)) as container:
+        return container.duration / av.time_base if container.duration else 0.0
+
+def filter_metadata(path, chain: Sequence[FilterSpec], media: str = "video",
+                    start_time: Optional[float] = None, max_frames: Optional[int] = None,
+                    keyframes_only: bool = False) -> Iterator[Tuple[float, Dict[str, str]]]:
+    """
+    Decodes the first `media` ("video" / "audio") stream of `path` in-process,
+    pushes it through `chain` and yields (time, metadata) for every filtered
+    frame. The filters' lavfi.* tags are read straight off each frame, so no
+    ffmpeg process is spawned and no log text is parsed.
+
+    `start_time` seeks like ffmpeg's input -ss (frames before it are decoded
+    but not filtered); `max_frames` stops after that many filtered frames.
+    `keyframes_only` makes the decoder skip everything but keyframes, like
+    ffmpeg's -skip_frame nokey.
+    Yields nothing when the file has no stream of that type.
+    Raises av.error.FFmpegError if the file or a filter cannot be opened.
+    """
+    with av.open(str(path)) as container:
+        streams = container.streams.video if media == "video" else container.streams.audio
+        if not streams:
+            # No such stream: nothing to measure, as with the CLI
+            return
+        stream = streams[0]
+        stream.thread_type = "AUTO"
+        if keyframes_only:
+            stream.codec_context.skip_frame = "NONKEY"
+
+        graph = av.filter.Graph()
+        source = graph.add_buffer(template=stream) if media == "video" else graph.add_abuffer(template=stream)
+        sink = "buffersink" if media == "video" else "abuffersink"
+        graph.link_nodes(source, *(graph.add(name, args) for name, args in chain), graph.add(sink)).configure()
+
+        if start_time:
+            container.seek(int(start_time / stream.time_base), stream=stream)
+
+        produced = 0
+
+        def drain():
+            nonlocal produced
+            while max_frames is None or produced < max_frames:
+                try:
+                    out = graph.pull()
+                except (av.error.BlockingIOError, av.error.EOFError):
+                    return
+                produced += 1
+                yield float(out.time or 0.0), dict(out.metadata)
+
+        for frame in container.decode(stream):
+            if start_time and frame.time is not None and frame.time < start_time:
+                continue
+            graph.push(frame)
+            yield from drain()
+            if max_frames is not None and produced >= max_frames:
+                return
+        graph.push(None)
+        yield from drain()
+
+def luma_frames(path, start_time: Optional[float] = None) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Decodes the first video stream of `path` in-process and yields
+    (time, luma) per frame, where luma is a (height, width) uint8 view of the
+    decoder's Y plane: no pixel format conversion and no copy, so values are
+    the coded ones (limited range stays limited), as ffmpeg filters see them.
+    The view is only valid until the next frame is requested.
+
+    `start_time` seeks like filter_metadata's (earlier frames are decoded
+    but not yielded).
+    Yields nothing when the file has no video stream.
+    Raises ValueError for pixel formats without an 8-bit luma plane, and
+    av.error.FFmpegError if the file cannot be opened.
+    """
+    with av.open(str(path)) as container:
+        if not container.streams.video:
+            return
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        if start_time:
+            container.seek(int(start_time / stream.time_base), stream=stream)
+        for frame in container.decode(stream):
+            if start_time and frame.time is not None and frame.time < start_time:
+                continue
+            if frame.format.name not in LUMA8_FORMATS:
+                raise ValueError(f"no 8-bit luma plane in pixel format {frame.format.name}")
+            plane = frame.planes[0]
+            # Rows are line_size bytes apart (padding included); slice it off
+            luma = np.frombuffer(plane, np.uint8).reshape(-1, plane.line_size)[:plane.height, :plane.width]
+            yield float(frame.time or 0.0), luma
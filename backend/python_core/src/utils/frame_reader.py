@@ -0,0 +1,82 @@
+import queue
+import threading
+from typing import Callable, Iterator, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Frames buffered ahead of the consumer. Decoded HD frames are ~6 MB each,
+# so keep this small; it only needs to cover decode jitter.
+DEFAULT_PREFETCH = 8
+
+_EOF = None
+
+def read_frames(cap: "cv2.VideoCapture",
+                prefetch: int = DEFAULT_PREFETCH,
+                max_frames: Optional[int] = None,
+                step: int = 1,
+                transform: Optional[Callable[[np.ndarray], np.ndarray]] = None) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Yields (pos_msec, frame) from an opened VideoCapture while a daemon thread
+    keeps decoding ahead into a bounded queue.
+
+    OpenCV releases the GIL inside read/resize/cvtColor, so decode overlaps
+    with the caller's analysis. The caller's loop stays single-threaded.
+
+    Args:
+        cap: Opened capture, already positioned (caller seeks if needed).
+        prefetch: Max decoded frames held in the queue.
+        max_frames: Stop after this many frames (None = until EOF).
+        step: >1 seeks forward `step` frames between reads (sparse sampling).
+        transform: Optional per-frame function run on the reader thread
+                   (e.g. resize / grayscale) to shrink what crosses the queue.
+    """
+    buf: "queue.Queue" = queue.Queue(maxsize=max(1, prefetch))
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buf.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _reader():
+        try:
+            count = 0
+            next_idx = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+            while max_frames is None or count < max_frames:
+                if step > 1:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, next_idx)
+                    next_idx += step
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                pos_msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+                if transform is not None:
+                    frame = transform(frame)
+                if not _put((pos_msec, frame)):
+                    return
+                count += 1
+        except Exception as e:
+            _put(e)
+            return
+        _put(_EOF)
+
+    worker = threading.Thread(target=_reader, name="frame-reader", daemon=True)
+    worker.start()
+
+    try:
+        while True:
+            item = buf.get()
+            if item is _EOF:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Consumer stopped early (break / exception): unblock the reader
+        stop.set()
+        worker.join()
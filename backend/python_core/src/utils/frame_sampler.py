@@ -5,6 +5,8 @@ import logging
 from typing import List, Tuple, Optional
 from tqdm import tqdm
 
+from src.utils.frame_reader import read_frames
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
@@ -56,21 +58,14 @@ def sample_frames(video_path: str, sample_rate_fps: float = 1.0) -> List[Tuple[f
         # Initialize progress bar
         pbar = tqdm(total=int(total_frames / step), desc="Extracting frames", unit="frame")
         
-        current_frame_idx = 0
-        while cap.isOpened():
-            # Efficient Seeking:
-            # Instead of reading every frame, we calculate the next frame index
-            target_frame_idx = current_frame_idx
-            
-            # Set the position
-            cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame_idx)
-            
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
+        # Efficient Seeking:
+        # The reader thread seeks to every `step`-th frame and decodes ahead
+        # of this loop, stopping at the end of stream.
+        max_samples = -(-total_frames // step) if total_frames > 0 else 1
+        
+        for pos_msec, frame in read_frames(cap, max_frames=max_samples, step=step):
             # Calculate timestamp
-            timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            timestamp = pos_msec / 1000.0
             
             # Validation: Ensure frame is valid
             if frame is not None and frame.size > 0:
@@ -78,13 +73,6 @@ def sample_frames(video_path: str, sample_rate_fps: float = 1.0) -> List[Tuple[f
             
             # Update progress
             pbar.update(1)
-            
-            # Move to next target
-            current_frame_idx += step
-            
-            # Safety break for end of stream
-            if current_frame_idx >= total_frames:
-                break
 
         pbar.close()
         
@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+from typing import Any, Union
+
+# Optional fast codec: orjson emits bytes directly and is several times faster
+# than the stdlib on large event arrays. Falls back to `json` when missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+PathLike = Union[str, Path]
+
+def _default(obj):
+    # NumPy scalars / arrays leak into reports from the CV/audio validators
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serializes `obj` to UTF-8 JSON bytes (2-space indent when `indent`).
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except TypeError:
+            # e.g. non-str dict keys; the stdlib is more permissive
+            pass
+    return json.dumps(obj, indent=2 if indent else None, default=_default).encode("utf-8")
+
+def read_json(path: PathLike) -> Any:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+def write_json(path: PathLike, obj: Any, indent: bool = True) -> None:
+    with open(path, "wb") as f:
+        f.write(dumps(obj, indent=indent))
@@ -0,0 +1,109 @@
+import os
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.utils import json_io
+
+# Path of the on-disk probe blob, exported by the orchestrator so that
+# pool workers and isolated validator subprocesses reuse it.
+PROBE_CACHE_ENV = "AQC_PROBE_CACHE"
+PROBE_CACHE_FILENAME = ".probe_cache.json"
+
+# In-process cache: resolved input path -> ffprobe JSON
+_CACHE: Dict[str, Dict[str, Any]] = {}
+
+def _key(path) -> str:
+    return str(Path(path).resolve())
+
+def run_ffprobe(path) -> Optional[Dict[str, Any]]:
+    """
+    Runs a single `ffprobe -show_streams -show_format` query.
+    """
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-print_format", "json",
+        "-show_format", "-show_streams",
+        str(path)
+    ]
+    try:
+        # Raw stdout bytes go straight to the (orjson) decoder, no str round trip
+        res = subprocess.run(cmd, capture_output=True)
+        data = json_io.loads(res.stdout)
+        if "streams" not in data and "format" not in data:
+            return None
+        return data
+    except Exception:
+        return None
+
+def _load_from_disk(key: str) -> Optional[Dict[str, Any]]:
+    cache_file = os.environ.get(PROBE_CACHE_ENV)
+    if not cache_file:
+        return None
+    try:
+        blob = json_io.read_json(cache_file)
+        if blob.get("source") == key:
+            return blob.get("probe")
+    except Exception:
+        pass
+    return None
+
+def peek(path) -> Optional[Dict[str, Any]]:
+    """
+    Returns the ffprobe JSON for `path` only if it is already cached
+    (memory or AQC_PROBE_CACHE file); never runs ffprobe.
+    """
+    key = _key(path)
+    if key in _CACHE:
+        return _CACHE[key]
+
+    data = _load_from_disk(key)
+    if data is not None:
+        _CACHE[key] = data
+    return data
+
+def probe(path) -> Optional[Dict[str, Any]]:
+    """
+    Returns the ffprobe JSON for `path`, probing at most once per file.
+    Lookup order: memory -> AQC_PROBE_CACHE file -> ffprobe.
+    """
+    data = peek(path)
+    if data is None:
+        data = run_ffprobe(path)
+        if data is not None:
+            _CACHE[_key(path)] = data
+    return data
+
+def prime(path, outdir) -> Optional[Path]:
+    """
+    Probes `path` once and publishes the result to `<outdir>/.probe_cache.json`.
+    Sets AQC_PROBE_CACHE so child processes started afterwards pick it up.
+    """
+    data = probe(path)
+    if data is None:
+        return None
+
+    cache_file = Path(outdir) / PROBE_CACHE_FILENAME
+    try:
+        json_io.write_json(cache_file, {"source": _key(path), "probe": data}, indent=False)
+    except OSError:
+        return None
+
+    os.environ[PROBE_CACHE_ENV] = str(cache_file)
+    return cache_file
+
+def get_stream(path, codec_type: str = "video") -> Optional[Dict[str, Any]]:
+    """
+    First stream of the given codec_type ('video' / 'audio'), or None.
+    """
+    data = probe(path)
+    if not data:
+        return None
+    for stream in data.get("streams", []):
+        if stream.get("codec_type") == codec_type:
+            return stream
+    return None
+
+def get_format(path) -> Dict[str, Any]:
+    data = probe(path)
+    return (data or {}).get("format", {})
@@ -1,12 +1,27 @@
 import os
 import sys
 import subprocess
-import json
 from pathlib import Path
+from src.utils import json_io
 from src.utils.logger import setup_logger
 
 logger = setup_logger("aqc_spark_worker")
 
+# In-process validator entry points, imported once per worker process
+_ENTRY_POINTS = None
+
+def _entry_points():
+    """
+    Imports every validator once per Spark worker (see main.load_validators)
+    so segments after the first skip interpreter startup and imports.
+    Isolated or unimportable validators are absent and run as subprocesses.
+    """
+    global _ENTRY_POINTS
+    if _ENTRY_POINTS is None:
+        import main
+        _ENTRY_POINTS = main.load_validators()
+    return _ENTRY_POINTS
+
 def analyze_segment(segment_data, validators, profile_mode):
     """
     Function to be executed by Spark workers for a specific video segment.
@@ -35,28 +50,38 @@ def analyze_segment(segment_data, validators, profile_mode):
         "reports": []
     }
     
+    entry_points = _entry_points()
+    
+    # Per-segment constants, built once; the subprocess fallback only fills
+    # the module and output slots of `cmd` per validator
+    segment_str = str(segment_path)
+    report_dir_str = str(report_dir)
+    # Determine the python executable (absolute path to avoid issues on workers)
+    cmd = [
+        sys.executable, "-m", None,
+        "--input", segment_str,
+        "--output", None,
+        "--mode", profile_mode
+    ]
+    
     # Run validators on the segment
     for category, module in validators:
-        report_path = report_dir / f"report_{module}.json"
-        module_path = f"src.validators.{category}.{module}"
-        
-        # Determine the python executable (absolute path to avoid issues on workers)
-        python_exe = sys.executable
-        
-        cmd = [
-            python_exe, "-m", module_path,
-            "--input", str(segment_path),
-            "--output", str(report_path),
-            "--mode", profile_mode
-        ]
+        report_path = os.path.join(report_dir_str, "report_" + module + ".json")
         
         try:
+            validator_fn = entry_points.get(module)
+            if validator_fn is not None:
+                report_data = validator_fn(segment_str, report_path, profile_mode, None)
+                if report_data is not None:
+                    segment_results["reports"].append(report_data)
+                continue
+            
+            cmd[2] = "src.validators." + category + "." + module
+            cmd[6] = report_path
             # We use a shorter timeout for segments
             subprocess.run(cmd, check=True, capture_output=True, text=True)
-            if report_path.exists():
-                with open(report_path, "r", encoding="utf-8") as f:
-                    report_data = json.load(f)
-                    segment_results["reports"].append(report_data)
+            if os.path.exists(report_path):
+                segment_results["reports"].append(json_io.read_json(report_path))
         except Exception as e:
             # Create a crash report for this module in this segment
             crash_report = {
@@ -0,0 +1,52 @@
+import multiprocessing
+import os
+from typing import Optional
+
+# Native thread pools that NumPy/SciPy/OpenCV spin up per process. With N pool
+# workers each defaulting to N threads, the box runs N*N threads.
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+def limit_native_threads(n: int = 1) -> None:
+    """
+    Caps BLAS/OpenMP/OpenCV threads in the current process.
+    Env vars cover libraries loaded after this call; threadpoolctl and
+    cv2.setNumThreads cover the ones already loaded (e.g. inherited via fork).
+    """
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(n)
+
+    try:
+        import cv2
+        cv2.setNumThreads(n)
+    except ImportError:
+        pass
+
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(n)
+    except ImportError:
+        pass
+
+def pin_to_core() -> Optional[int]:
+    """
+    Pins the current pool worker to one core, chosen round-robin from the
+    cores this process may use. No-op outside pool workers or on platforms
+    without sched_setaffinity (macOS, Windows).
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return None
+
+    identity = multiprocessing.current_process()._identity
+    if not identity:
+        return None
+
+    cores = sorted(os.sched_getaffinity(0))
+    core = cores[(identity[0] - 1) % len(cores)]
+    os.sched_setaffinity(0, {core})
+    return core
+
+def init_worker(pin: bool = True) -> None:
+    """ProcessPoolExecutor initializer: one native thread per worker, optionally pinned."""
+    limit_native_threads(1)
+    if pin:
+        pin_to_core()
@@ -1,9 +1,11 @@
-import json
 import subprocess
 import sys
 import numpy as np
 from pathlib import Path
 
+from src.config import threshold_registry
+from src.utils import json_io
+
 # Try to import config, fallback to defaults if running standalone validation without full env
 try:
     from src.utils.logger import setup_logger
@@ -26,19 +28,9 @@ def load_profile(mode="strict"):
     }
     
     try:
-        config_path = Path(__file__).parent.parent.parent / "config" / "signal_profiles.json"
-        if config_path.exists():
-            with open(config_path, "r") as f:
-                data = json.load(f)
-                profiles = data.get("profiles", {})
-                
-                # Map mode to profile key
-                key = "STRICT"
-                if mode.lower() == "netflix": key = "NETFLIX_HD"
-                if mode.lower() == "youtube": key = "YOUTUBE"
-                
-                if key in profiles:
-                    return profiles[key].get("validate_signal", default_profile)
+        profile = threshold_registry.get_signal_profile(mode, "validate_signal")
+        if profile is not None:
+            return profile
     except Exception as e:
         logger.warning(f"Could not load signal_profiles.json: {e}. Using defaults.")
         
@@ -100,14 +92,14 @@ def validate_signal(input_path, output_path, config=None, mode="strict"):
         if result.returncode != 0:
             raise Exception(f"FFprobe failed: {result.stderr}")
 
-        data = json.loads(result.stdout)
+        data = json_io.loads(result.stdout)
         frames = data.get("frames", [])
 
         if not frames:
             report["status"] = "WARNING"
             report["details"]["issues"].append("No frame data extracted.")
-            with open(output_path, "w") as f: json.dump(report, f, indent=4)
-            return
+            json_io.write_json(output_path, report)
+            return report
 
         illegal_count = 0
         sat_warn_count = 0
@@ -194,8 +186,12 @@ def validate_signal(input_path, output_path, config=None, mode="strict"):
         report["status"] = "CRASHED"
         report["details"]["error"] = str(e)
 
-    with open(output_path, "w") as f:
-        json.dump(report, f, indent=4)
+    json_io.write_json(output_path, report)
+    return report
+
+def run(input_path, output_path, mode="strict", hwaccel=None):
+    """In-process entry point used by the pipeline orchestrator."""
+    return validate_signal(input_path, output_path, None, mode)
 
 if __name__ == "__main__":
     import argparse
@@ -1,53 +1,37 @@
 import argparse
-import json
+from bisect import bisect_right
 import subprocess
 import re
 from pathlib import Path
 
+from src.utils import json_io, probe_cache
+
+# One pass over ffmpeg's stderr; the outer group name says which line matched.
+# A sum-to-mono detector (silencedetect mono=1) tags its lines "channel: N |".
+_SIGNAL_RE = re.compile(
+    r"(?P<dc>lavfi\.astats\.Overall\.DC_offset=(?P<dc_val>[-\d.eE+]+))"
+    r"|(?P<dr>lavfi\.astats\.Overall\.Dynamic_range=(?P<dr_val>[-\d.eE+]+))"
+    r"|(?P<peak>max_volume:\s*(?P<peak_val>-?\d[\d.]*)\s*dB)"
+    r"|(?P<silence>(?P<channel>channel:\s*\d+\s*\|\s*)?silence_end:\s*(?P<end>-?\d[\d.]*)\s*\|\s*silence_duration:\s*(?P<dur>-?\d[\d.]*))"
+)
+
 def get_audio_info(input_path):
     """
     Get basic audio metadata (channels, duration).
     """
     try:
-        cmd = [
-            "ffprobe", "-v", "error", "-select_streams", "a:0",
-            "-show_entries", "stream=channels,duration", 
-            "-of", "json", str(input_path)
-        ]
-        res = subprocess.run(cmd, capture_output=True, text=True)
-        data = json.loads(res.stdout)
-        if not data.get("streams"):
+        stream = probe_cache.get_stream(input_path, "audio")
+        if not stream:
             return 0, 0.0
-        return int(data["streams"][0].get("channels", 0)), float(data["streams"][0].get("duration", 0))
+        return int(stream.get("channels", 0)), float(stream.get("duration", 0))
     except:
         return 0, 0.0
 
-def parse_silencedetect(log_text):
-    """
-    Parses silencedetect output into a list of [start, end] intervals.
-    """
-    silences = []
-    for line in log_text.split('\n'):
-        if "silence_end" in line:
-            try:
-                # [silencedetect] silence_end: 15.0 | silence_duration: 2.5
-                parts = line.split("|")
-                dur_str = parts[1].strip() 
-                duration = float(dur_str.split(":")[1])
-                
-                end_time_str = parts[0].split(":")[1]
-                end_time = float(end_time_str)
-                start_time = end_time - duration
-                silences.append((round(start_time, 2), round(end_time, 2)))
-            except:
-                pass
-    return silences
-
 def analyze_signal(input_path):
     """
-    Two-Pass Analysis:
+    Single-decode analysis of two filter chains over an asplit:
     1. Signal Health (Clipping, DC, Dropouts) on Source.
-    2. Phase Health (Cancellation Check) on Sum-to-Mono.
+    2. Phase Health (Cancellation Check) on Sum-to-Mono, when channels >= 2.
     """
     events = []
     metrics = {
@@ -64,98 +48,107 @@ def analyze_signal(input_path):
         return events, metrics
 
     # ---------------------------------------------------------
-    # PASS 1: Signal Health (Clipping, DC, Dropouts)
+    # CHAIN 1: Signal Health (Clipping, DC, Dropouts)
     # ---------------------------------------------------------
-    # - aphasemeter: just for logging (we don't parse it deeply here)
     # - silencedetect: threshold -50dB (finds real silence)
     # - astats: DC offset / Dynamic Range
     # - volumedetect: True Peak
-    cmd_pass1 = [
-        "ffmpeg", "-v", "info", "-i", str(input_path),
-        "-filter_complex", 
-        "silencedetect=n=-50dB:d=0.1,astats=metadata=1:reset=1:measure_overall=DC_offset+Dynamic_range,volumedetect",
-        "-f", "null", "-"
-    ]
-    
-    source_silences = []
-    
-    try:
-        process = subprocess.run(
-            cmd_pass1, capture_output=True, text=True, encoding="utf-8", errors="replace"
-        )
-        log = process.stderr
-        
-        # 1. Parse Source Silence (Real Dropouts)
-        source_silences = parse_silencedetect(log)
-        for s, e in source_silences:
-            events.append({
-                "type": "audio_dropout",
-                "details": f"Audio Silence detected ({e-s:.2f}s).",
-                "start_time": s,
-                "end_time": e
-            })
-
-        # 2. Parse Metrics (DC, DR, Peak)
-        for line in log.split('\n'):
-            if "lavfi.astats.Overall.DC_offset" in line:
-                try: metrics["dc_offset_max"] = max(metrics["dc_offset_max"], abs(float(line.split("=")[1])))
-                except: pass
-            if "lavfi.astats.Overall.Dynamic_range" in line:
-                try: metrics["dynamic_range_db"] = float(line.split("=")[1])
-                except: pass
-                
-        # Parse Volumedetect
-        match = re.search(r"max_volume:\s*([-0-9\.]+)\s*dB", log)
-        if match:
-            metrics["peak_volume_db"] = float(match.group(1))
-
-    except Exception as e:
-        print(f"[WARN] Pass 1 failed: {e}")
+    source_chain = "silencedetect=n=-50dB:d=0.1,astats=metadata=1:reset=1:measure_overall=DC_offset+Dynamic_range,volumedetect"
 
     # ---------------------------------------------------------
-    # PASS 2: Phase Cancellation Check (The "Sum-to-Mono" Trick)
+    # CHAIN 2: Phase Cancellation Check (The "Sum-to-Mono" Trick)
     # ---------------------------------------------------------
     # If channels >= 2, we mix Left + Right. 
     # If they are out of phase, they cancel to Silence (-inf).
     # We check for silence on the SUM. If Sum is silent but Source wasn't, it's a Phase Error.
-    
+    # Note: We focus on L+R (c0+c1) even for 5.1 as it's the primary risk.
+    # mono=1 makes this detector prefix its lines with "channel: N |", so both
+    # chains can share one decode and one stderr.
     if channels >= 2:
-        # Downmix L+R to Mono. 
-        # Note: We focus on L+R (c0+c1) even for 5.1 as it's the primary risk.
-        cmd_pass2 = [
-            "ffmpeg", "-v", "info", "-i", str(input_path),
-            "-filter_complex", "pan=mono|c0=c0+c1,silencedetect=n=-50dB:d=0.1",
-            "-f", "null", "-"
+        cmd = [
+            "ffmpeg", "-nostats", "-hide_banner", "-v", "info",
+            "-threads", "0", "-i", str(input_path),
+            "-filter_complex",
+            f"[0:a]asplit=2[src][mix];[src]{source_chain}[a1];"
+            "[mix]pan=mono|c0=c0+c1,silencedetect=n=-50dB:d=0.1:mono=1[a2]",
+            "-map", "[a1]", "-vn", "-f", "null", "-",
+            "-map", "[a2]", "-vn", "-f", "null", "-"
         ]
-        
-        try:
-            process2 = subprocess.run(
-                cmd_pass2, capture_output=True, text=True, encoding="utf-8", errors="replace"
-            )
-            phase_silences = parse_silencedetect(process2.stderr)
-            
-            # Compare Phase Silence vs Source Silence
-            for ps, pe in phase_silences:
-                # Check if this timespan was already silent in the source
-                is_source_silent = False
-                for ss, se in source_silences:
-                    # Simple overlap check
-                    if (ps < se) and (pe > ss):
-                        is_source_silent = True
-                        break
-                
-                # If Sum is Silent but Source is NOT Silent -> Phase Cancellation
-                if not is_source_silent:
-                    events.append({
-                        "type": "phase_inversion_detected",
-                        "details": f"Phase Cancellation detected ({pe-ps:.2f}s). L+R Sum resulted in silence.",
-                        "start_time": ps,
-                        "end_time": pe,
-                        "severity": "CRITICAL"
-                    })
+    else:
+        cmd = [
+            "ffmpeg", "-nostats", "-hide_banner", "-v", "info",
+            "-threads", "0", "-i", str(input_path),
+            "-filter_complex", source_chain,
+            "-vn", "-f", "null", "-"
+        ]
+    
+    # One scan of stderr as ffmpeg writes it: Source Silence (Real Dropouts),
+    # Sum Silence, Metrics (DC, DR, Peak)
+    source_silences = []
+    phase_silences = []
+    # Loop-invariant lookup, bound once rather than per stderr line
+    search = _SIGNAL_RE.search
+    try:
+        with subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, encoding="utf-8", errors="replace", bufsize=1
+        ) as process:
+            for line in process.stderr:
+                m = search(line)
+                if m is None:
+                    continue
+                kind = m.lastgroup
+                try:
+                    if kind == "silence":
+                        end_time = float(m.group("end"))
+                        interval = (round(end_time - float(m.group("dur")), 2), round(end_time, 2))
+                        if m.group("channel") is None:
+                            source_silences.append(interval)
+                        else:
+                            phase_silences.append(interval)
+                    elif kind == "dc":
+                        metrics["dc_offset_max"] = max(metrics["dc_offset_max"], abs(float(m.group("dc_val"))))
+                    elif kind == "dr":
+                        metrics["dynamic_range_db"] = float(m.group("dr_val"))
+                    elif kind == "peak":
+                        # Parse Volumedetect (first report wins)
+                        if metrics["peak_volume_db"] == -99.0:
+                            metrics["peak_volume_db"] = float(m.group("peak_val"))
+                except ValueError:
+                    pass
+    except Exception as e:
+        print(f"[WARN] Signal analysis failed: {e}")
+        return events, metrics
 
-        except Exception as e:
-            print(f"[WARN] Pass 2 failed: {e}")
+    for s, e in source_silences:
+        events.append({
+            "type": "audio_dropout",
+            "details": f"Audio Silence detected ({e-s:.2f}s).",
+            "start_time": s,
+            "end_time": e
+        })
+
+    # Compare Phase Silence vs Source Silence
+    if channels >= 2:
+        # silencedetect emits disjoint intervals in time order, so both starts
+        # and ends are sorted: the first source silence ending after ps is the
+        # only candidate that can overlap [ps, pe)
+        source_starts = [ss for ss, _ in source_silences]
+        source_ends = [se for _, se in source_silences]
+        for ps, pe in phase_silences:
+            # Check if this timespan was already silent in the source
+            i = bisect_right(source_ends, ps)
+            is_source_silent = i < len(source_starts) and source_starts[i] < pe
+            
+            # If Sum is Silent but Source is NOT Silent -> Phase Cancellation
+            if not is_source_silent:
+                events.append({
+                    "type": "phase_inversion_detected",
+                    "details": f"Phase Cancellation detected ({pe-ps:.2f}s). L+R Sum resulted in silence.",
+                    "start_time": ps,
+                    "end_time": pe,
+                    "severity": "CRITICAL"
+                })
 
     return events, metrics
 
@@ -199,8 +192,12 @@ def run_validator(input_path, output_path, mode="strict"):
         }
     }
     
-    with open(output_path, "w") as f:
-        json.dump(report, f, indent=4)
+    json_io.write_json(output_path, report)
+    return report
+
+def run(input_path, output_path, mode="strict", hwaccel=None):
+    """In-process entry point used by the pipeline orchestrator."""
+    return run_validator(input_path, output_path, mode)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -1,17 +1,94 @@
 import argparse
-import json
 import subprocess
 import logging
+import math
+import re
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
 # --- Internal Imports ---
 from src.config import threshold_registry
+from src.utils import ffmpeg_pool, json_io
 from src.utils.logger import setup_logger
 
 # Initialize Standard Logger
 logger = setup_logger("validate_loudness")
 
+# ebur128 summary block, matched in one scan. Anchored to line starts so the
+# per-frame "... I: -23.1 LUFS LRA: ..." log lines are not picked up.
+_SUMMARY_RE = re.compile(
+    r"^\s*(?:I:\s*(?P<i>-?\d[\d.]*)\s*LUFS"
+    r"|LRA:\s*(?P<lra>-?\d[\d.]*)\s*LU\b"
+    r"|True peak:\s*(?P<tp>[^\n]*?)\s*dBTP)",
+    re.MULTILINE
+)
+
+def _measure_cli(file_path: Path, metrics: Dict[str, Any]) -> None:
+    """
+    Fills integrated_lufs / lra / true_peak in `metrics` from the summary
+    block an ffmpeg child prints at the end of its stderr.
+    """
+    # FFmpeg command to run the EBU R.128 filter
+    # We output to null and capture stderr where the stats are printed
+    cmd = [
+        "ffmpeg", "-nostats", "-hide_banner",
+        "-threads", "0",
+        "-i", str(file_path),
+        "-filter_complex", "ebur128=peak=true",
+        "-vn", "-f", "null", "-"
+    ]
+
+    # Parse FFmpeg Output as it is written; stderr is never held whole
+    # Look for the summary block at the end
+    # Example output lines:
+    #   I:         -23.1 LUFS
+    #   LRA:         5.2 LU
+    #   True peak:  -1.5 dBTP
+    with subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, bufsize=1
+    ) as process:
+        for line in process.stderr:
+            m = _SUMMARY_RE.match(line)
+            if m is None:
+                continue
+            if m.group("i") is not None:
+                metrics["integrated_lufs"] = float(m.group("i"))
+            elif m.group("lra") is not None:
+                metrics["lra"] = float(m.group("lra"))
+            else:
+                # Handle multi-channel peak lines (e.g. "-1.2 -1.5 dBTP")
+                # Filter valid float strings and take max
+                peaks = []
+                for p in m.group("tp").split():
+                    try:
+                        peaks.append(float(p))
+                    except ValueError:
+                        continue
+                if peaks:
+                    metrics["true_peak"] = max(peaks)
+
+def _measure_av(file_path: Path, metrics: Dict[str, Any]) -> None:
+    """
+    Same measurements decoded in-process through PyAV. With metadata=1,
+    ebur128 tags each frame that completes a 100 ms block with the running
+    integrated loudness, LRA and (cumulative, linear) true peak, so the last
+    tagged frame carries the summary; frames after it (e.g. a short final
+    frame) have no r128 tags.
+    Rounded to 0.1 like the CLI summary.
+    """
+    tags = None
+    for _, frame_tags in ffmpeg_pool.filter_metadata(file_path, [("ebur128", "peak=true:metadata=1")], media="audio"):
+        if "lavfi.r128.I" in frame_tags:
+            tags = frame_tags
+    if tags is None:
+        return
+
+    metrics["integrated_lufs"] = round(float(tags["lavfi.r128.I"]), 1)
+    metrics["lra"] = round(float(tags.get("lavfi.r128.LRA", 0.0)), 1)
+    peak = float(tags.get("lavfi.r128.true_peak", 0.0))
+    if peak > 0:
+        metrics["true_peak"] = round(20 * math.log10(peak), 1)
+
 def check_loudness(file_path: Path, target_lufs: float = -23.0, true_peak_max: float = -1.0, tolerance: float = 1.0) -> Dict[str, Any]:
     """
     Analyzes audio loudness using FFmpeg's ebur128 filter (ITU-R BS.1770).
@@ -33,50 +110,17 @@ def check_loudness(file_path: Path, target_lufs: float = -23.0, true_peak_max: f
         "events": []
     }
 
-    # FFmpeg command to run the EBU R.128 filter
-    # We output to null and capture stderr where the stats are printed
-    cmd = [
-        "ffmpeg", "-nostats",
-        "-i", str(file_path),
-        "-filter_complex", "ebur128=peak=true",
-        "-f", "null", "-"
-    ]
-
     try:
         logger.info(f"Running EBU R.128 analysis on: {file_path.name}")
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        output = result.stderr
-
-        # Parse FFmpeg Output
-        # Look for the summary block at the end
-        # Example output lines:
-        #   I:         -23.1 LUFS
-        #   LRA:         5.2 LU
-        #   True peak:  -1.5 dBTP
-        
-        for line in output.splitlines():
-            line = line.strip()
-            if line.startswith("I:") and "LUFS" in line:
-                val = line.split("I:")[1].split("LUFS")[0].strip()
-                metrics["integrated_lufs"] = float(val)
-            elif line.startswith("LRA:") and "LU" in line:
-                val = line.split("LRA:")[1].split("LU")[0].strip()
-                metrics["lra"] = float(val)
-            elif line.startswith("True peak:") and "dBTP" in line:
-                # Handle multi-channel peak lines (e.g. "-1.2 -1.5 dBTP")
-                parts = line.split("True peak:")[1].split("dBTP")[0].strip().split()
-                try:
-                    # Filter valid float strings and take max
-                    peaks = []
-                    for p in parts:
-                        try:
-                            peaks.append(float(p))
-                        except ValueError:
-                            continue
-                    if peaks:
-                        metrics["true_peak"] = max(peaks)
-                except Exception:
-                    pass
+        measured = False
+        if ffmpeg_pool.HAS_AV:
+            try:
+                _measure_av(file_path, metrics)
+                measured = True
+            except Exception as e:
+                logger.warning(f"In-process EBU R.128 unavailable ({e}); using ffmpeg CLI")
+        if not measured:
+            _measure_cli(file_path, metrics)
 
         # Logic Check
         lufs = metrics["integrated_lufs"]
@@ -115,7 +159,7 @@ def check_loudness(file_path: Path, target_lufs: float = -23.0, true_peak_max: f
 
     return metrics
 
-def run_validator(input_path: str, output_path: str, mode: str = "strict") -> None:
+def run_validator(input_path: str, output_path: str, mode: str = "strict") -> Dict[str, Any]:
     """
     Main execution point for the module.
     
@@ -158,10 +202,14 @@ def run_validator(input_path: str, output_path: str, mode: str = "strict") -> No
         report["effective_status"] = "PASSED"
 
     # Save
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=4)
+    json_io.write_json(output_path, report)
     
     logger.info(f"Loudness Check Complete. Status: {report['status']} (I: {result['integrated_lufs']} LUFS)")
+    return report
+
+def run(input_path, output_path, mode="strict", hwaccel=None):
+    """In-process entry point used by the pipeline orchestrator."""
+    return run_validator(input_path, output_path, mode)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -1,6 +1,5 @@
 import argparse
 import subprocess
-import json
 import os
 import sys
 from pathlib import Path
@@ -8,6 +7,7 @@ from pathlib import Path
 # Add project root to sys.path for internal imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 from src.config import threshold_registry
+from src.utils import probe_cache, json_io
 
 def validate_audio_phase(input_video, output_report, mode="strict"):
     """
@@ -42,39 +42,28 @@ def validate_audio_phase(input_video, output_report, mode="strict"):
     }
 
     # 1. Pre-check: Does audio exist?
-    has_audio_cmd = [
-        "ffprobe", "-v", "error",
-        "-select_streams", "a",
-        "-show_entries", "stream=index",
-        "-of", "csv=p=0",
-        str(input_video)
-    ]
-    try:
-        audio_check = subprocess.run(has_audio_cmd, capture_output=True, text=True)
-        if not audio_check.stdout.strip():
-            # No audio streams found
-            report["status"] = "WARNING"
-            report["effective_status"] = "WARNING"
-            report["details"]["issue"] = "No audio stream detected."
-            with open(output_report, "w") as f:
-                json.dump(report, f, indent=4)
-            return
-    except Exception:
-        # If ffprobe fails completely, assume bad file
-        pass
+    # Answered from the shared run-wide ffprobe blob (see src.utils.probe_cache)
+    # instead of a dedicated ffprobe call. If the probe fails completely we
+    # can't tell, so the phase scan below still runs.
+    if probe_cache.probe(input_video) is not None and probe_cache.get_stream(input_video, "audio") is None:
+        # No audio streams found
+        report["status"] = "WARNING"
+        report["effective_status"] = "WARNING"
+        report["details"]["issue"] = "No audio stream detected."
+        json_io.write_json(output_report, report)
+        return report
 
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
+        data = json_io.loads(result.stdout)
         
         frames = data.get("frames", [])
         if not frames:
             report["status"] = "WARNING"
             report["effective_status"] = "WARNING"
             report["details"]["error"] = "No audio phase data extracted. Possibly mono source?"
-            with open(output_report, "w") as f:
-                json.dump(report, f, indent=4)
-            return
+            json_io.write_json(output_report, report)
+            return report
 
         phases = []
         for frame in frames:
@@ -109,8 +98,12 @@ def validate_audio_phase(input_video, output_report, mode="strict"):
         report["effective_status"] = "CRASHED"
         report["details"]["error"] = str(e)
 
-    with open(output_report, "w") as f:
-        json.dump(report, f, indent=4)
+    json_io.write_json(output_report, report)
+    return report
+
+def run(input_path, output_path, mode="strict", hwaccel=None):
+    """In-process entry point used by the pipeline orchestrator."""
+    return validate_audio_phase(Path(input_path), Path(output_path), mode)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -1,9 +1,11 @@
 import argparse
-import json
+import asyncio
 import subprocess
 from pathlib import Path
 
-def get_ffprobe_data(file_path):
+from src.utils import json_io
+
+async def get_ffprobe_data(file_path):
     """
     Extracts deep metadata using ffprobe JSON output.
     """
@@ -18,12 +20,15 @@ def get_ffprobe_data(file_path):
         str(file_path)
     ]
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return json.loads(result.stdout)
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        stdout, _ = await proc.communicate()
+        return json_io.loads(stdout)
     except Exception:
         return None
 
-def check_eof_integrity(file_path, hwaccel="none"):
+async def check_eof_integrity(file_path, hwaccel="none"):
     """
     1.1 Early EOF Detection
     Attempts to decode the stream logic to ensure it's not truncated.
@@ -41,11 +46,27 @@ def check_eof_integrity(file_path, hwaccel="none"):
             "-"
         ])
         # Quick scan of container structure
-        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
         return True, "File structure is valid."
     except subprocess.CalledProcessError as e:
         err_msg = e.stderr.decode('utf-8')[:200] if e.stderr else "Unknown Error"
         return False, f"Integrity Check Failed: {err_msg}"
+    except OSError as e:
+        # e.g. no ffmpeg binary; the failed probe already rejects the file
+        return False, f"Integrity Check Failed: {e}"
+
+async def _deep_scan(file_path, hwaccel):
+    """
+    Runs the frame-counting ffprobe and the integrity decode side by side:
+    both read the whole file and neither needs the other's result, so wall
+    time is the slower of the two rather than their sum.
+    """
+    return await asyncio.gather(get_ffprobe_data(file_path), check_eof_integrity(file_path, hwaccel=hwaccel))
 
 def analyze_structure(input_path, output_path, mode="strict", hwaccel="none"):
     input_path = Path(input_path)
@@ -63,15 +84,15 @@ def analyze_structure(input_path, output_path, mode="strict", hwaccel="none"):
         report["status"] = "CRASHED"
         report["events"].append({"type": "file_missing", "details": "File not found."})
         _save(output_path, report)
-        return
+        return report
 
-    # 2. Corrupt Header Check
-    probe = get_ffprobe_data(input_path)
+    # 2. Corrupt Header Check (the integrity decode of step 5 runs alongside)
+    probe, (valid_integrity, msg) = asyncio.run(_deep_scan(input_path, hwaccel))
     if not probe or "format" not in probe:
         report["status"] = "REJECTED"
         report["events"].append({"type": "corrupt_header", "details": "Could not parse container header."})
         _save(output_path, report)
-        return
+        return report
 
     # --- METRICS EXTRACTION ---
     fmt = probe["format"]
@@ -122,8 +143,7 @@ def analyze_structure(input_path, output_path, mode="strict", hwaccel="none"):
                 "details": "Audio track missing language tag."
             })
 
-    # 5. Integrity Check (Deep Scan)
-    valid_integrity, msg = check_eof_integrity(input_path, hwaccel=hwaccel)
+    # 5. Integrity Check (Deep Scan, run in step 2)
     if not valid_integrity:
         report["status"] = "REJECTED"
         report["events"].append({
@@ -140,10 +160,14 @@ def analyze_structure(input_path, output_path, mode="strict", hwaccel="none"):
         report["effective_status"] = "PASSED"
 
     _save(output_path, report)
+    return report
 
 def _save(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+    json_io.write_json(path, data)
+
+def run(input_path, output_path, mode="strict", hwaccel=None):
+    """In-process entry point used by the pipeline orchestrator."""
+    return analyze_structure(input_path, output_path, mode, hwaccel or "none")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
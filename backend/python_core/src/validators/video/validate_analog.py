@@ -1,8 +1,20 @@
 import argparse
-import json
 import subprocess
 import sys
-from pathlib import Path
+import cv2
+import numpy as np
+from typing import Optional
+from array import array
+
+from src.config import threshold_registry
+from src.utils import ffmpeg_pool, json_io
+
+# Numba is optional; without it VREP is computed with whole-array OpenCV ops
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 # Try to import config, fallback to defaults
 try:
@@ -18,96 +30,184 @@ def load_profile(mode="strict"):
         "vrep_persistence_frames": 3
     }
     try:
-        config_path = Path(__file__).parent.parent.parent / "config" / "signal_profiles.json"
-        if config_path.exists():
-            with open(config_path, "r") as f:
-                data = json.load(f)
-                profiles = data.get("profiles", {})
-                key = "STRICT"
-                if mode.lower() == "netflix": key = "NETFLIX_HD"
-                if mode.lower() == "youtube": key = "YOUTUBE"
-                if key in profiles:
-                    return profiles[key].get("validate_signal", default_profile) # Use signal profile for VREP
+        profile = threshold_registry.get_signal_profile(mode, "validate_signal")
+        if profile is not None:
+            return profile
     except Exception:
         pass
     return default_profile
 
-def get_vrep_metrics(input_path: str, profile: dict):
+# signalstats compares each luma row with the row VREP_LAG lines above it
+VREP_LAG = 4
+
+def _vrep_rows(luma, lag):
     """
-    Uses FFmpeg's 'signalstats' filter to calculate Vertical Repetition (VREP).
-    Research Standard: VREP > 5.0 indicates analog TBC dropout / Head Clog.
+    Row-by-row VREP kernel: a row stops being summed as soon as its
+    difference reaches the width, so picture content costs a few pixels per
+    row and only repeated (e.g. black) rows are read in full.
     """
-    safe_path = Path(input_path).as_posix().replace(":", "\\:")
-    
+    h, w = luma.shape
+    count = 0
+    for y in range(lag, h):
+        total = 0
+        for x in range(w):
+            total += abs(np.int32(luma[y, x]) - np.int32(luma[y - lag, x]))
+            if total >= w:
+                break
+        else:
+            count += 1
+    return count / h
+
+if HAS_NUMBA:
+    _vrep_rows = njit(cache=True)(_vrep_rows)
+
+def vrep(luma: np.ndarray, scratch: Optional[np.ndarray] = None) -> float:
+    """
+    signalstats' VREP for one frame's luma plane: the fraction of rows that
+    repeat the row VREP_LAG lines above (summed absolute difference below one
+    code value per pixel).
+
+    Without Numba the row differences go through `scratch`, a uint8 array of
+    (height - VREP_LAG, width) reused across frames (allocated if None).
+    """
+    if HAS_NUMBA:
+        return _vrep_rows(luma, VREP_LAG)
+    h, w = luma.shape
+    # |a - b| is exact in uint8; only the per-row sums need 32 bits
+    diff = cv2.absdiff(luma[VREP_LAG:], luma[:-VREP_LAG], dst=scratch)
+    row_sums = cv2.reduce(diff, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S)
+    return np.count_nonzero(row_sums < w) / h
+
+def _vrep_series_cli(input_path: str):
+    """
+    Per-frame (times, vreps) from an ffmpeg child process.
+    """
+    # signalstats only computes VREP when asked (stat=vrep); the metadata filter
+    # prints it per frame to stdout so it can be consumed as it is produced
     cmd = [
-        "ffprobe",
+        "ffmpeg", "-nostats",
         "-v", "error",
-        "-f", "lavfi",
-        "-i", f"movie={safe_path},signalstats",
-        "-show_entries", "frame=pkt_pts_time:frame_tags=lavfi.signalstats.VREP",
-        "-of", "json"
+        "-threads", "0",
+        "-i", str(input_path),
+        "-vf", "signalstats=stat=vrep,metadata=mode=print:key=lavfi.signalstats.VREP:direct=1:file=pipe\\:1",
+        "-an",
+        "-f", "null", "-"
     ]
 
+    # Per-frame values, collected flat; spike runs are found afterwards
+    times = array("d")
+    vreps = array("d")
+    time = 0.0
+    
+    # Output is line pairs: "frame:N pts:P pts_time:T" then "lavfi.signalstats.VREP=X"
+    # stderr is discarded rather than piped: decode errors on damaged tapes
+    # could fill an unread pipe and stall ffmpeg
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1)
+    for line in proc.stdout:
+        if line.startswith("frame:"):
+            try: time = float(line.rsplit("pts_time:", 1)[1])
+            except ValueError: pass
+        elif line.startswith("lavfi.signalstats.VREP="):
+            times.append(time)
+            vreps.append(float(line.split("=", 1)[1]))
+    
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return times, vreps
+
+def _vrep_series_luma(input_path: str):
+    """
+    Per-frame (times, vreps) computed in NumPy on the decoded Y planes.
+    Raises ValueError for sources that are not 8-bit.
+    """
+    times = array("d")
+    vreps = array("d")
+    scratch = None
+    for time, luma in ffmpeg_pool.luma_frames(input_path):
+        if not HAS_NUMBA and (scratch is None or scratch.shape != (luma.shape[0] - VREP_LAG, luma.shape[1])):
+            scratch = np.empty((luma.shape[0] - VREP_LAG, luma.shape[1]), dtype=np.uint8)
+        times.append(time)
+        vreps.append(vrep(luma, scratch))
+    return times, vreps
+
+def _vrep_series_signalstats(input_path: str):
+    """
+    Per-frame (times, vreps) from the signalstats filter, run in-process.
+    """
+    times = array("d")
+    vreps = array("d")
+    for time, tags in ffmpeg_pool.filter_metadata(input_path, [("signalstats", "stat=vrep")]):
+        times.append(time)
+        vreps.append(float(tags.get("lavfi.signalstats.VREP", 0.0)))
+    return times, vreps
+
+def _vrep_series(input_path: str):
+    """
+    Per-frame (times, vreps): in-process through PyAV when available (no
+    ffmpeg process per file), else from the ffmpeg CLI.
+    """
+    if ffmpeg_pool.HAS_AV:
+        try:
+            try:
+                return _vrep_series_luma(input_path)
+            except ValueError:
+                # Deeper than 8 bits: leave the sample math to signalstats
+                return _vrep_series_signalstats(input_path)
+        except Exception as e:
+            logger.warning(f"In-process VREP scan unavailable ({e}); using ffmpeg CLI")
+    return _vrep_series_cli(input_path)
+
+def get_vrep_metrics(input_path: str, profile: dict):
+    """
+    Calculates FFmpeg signalstats' Vertical Repetition (VREP) per frame.
+    Research Standard: VREP > 5.0 indicates analog TBC dropout / Head Clog.
+    """
     logger.info(f"Scanning for Analog Artifacts (VREP)...")
     
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-        
-        frames = data.get("frames", [])
-        issues = []
-        
         # State detection
         TH_VREP = profile.get("vrep_threshold", 5.0)
         TH_PERSIST = profile.get("vrep_persistence_frames", 3)
         
-        spike_sequence = []
-        timeseries = [] # For Plotly Dashboard
+        times, vreps = _vrep_series(input_path)
         
-        for f in frames:
-            tags = f.get("tags", {})
-            vrep = float(tags.get("lavfi.signalstats.VREP", 0.0))
-            time = float(f.get("pkt_pts_time", 0.0))
-            
-            # Sub-sample timeseries to avoid huge JSON (e.g., store only if > 2.0 or every 10th frame)
-            # OR store all for short clips. 
-            if vrep > 2.0:
-                 timeseries.append({"t": time, "val": vrep})
-            
-            if vrep > TH_VREP:
-                spike_sequence.append((time, vrep))
-            else:
-                # Sequence ended, check if it was a dropout event
-                if len(spike_sequence) >= TH_PERSIST:
-                    # Log event
-                    start = spike_sequence[0][0]
-                    peak = max([x[1] for x in spike_sequence])
-                    issues.append({
-                        "timestamp": start,
-                        "metric": "VREP",
-                        "value": peak,
-                        "duration_frames": len(spike_sequence),
-                        "details": f"Analog Dropout / TBC Compensation (VREP Spikes: {len(spike_sequence)} frames)"
-                    })
-                spike_sequence = []
-                
-        # Trailing
-        if len(spike_sequence) >= TH_PERSIST:
-             start = spike_sequence[0][0]
-             peak = max([x[1] for x in spike_sequence])
-             issues.append({
-                "timestamp": start,
-                "metric": "VREP",
-                "value": peak,
-                "duration_frames": len(spike_sequence),
-                "details": f"Analog Dropout / TBC Compensation (VREP Spikes: {len(spike_sequence)} frames)"
-            })
+        t = np.frombuffer(times, dtype=np.float64)
+        v = np.frombuffer(vreps, dtype=np.float64)
+        
+        # Sub-sample timeseries to avoid huge JSON (e.g., store only if > 2.0 or every 10th frame)
+        # OR store all for short clips. For Plotly Dashboard.
+        # Column layout (x/y arrays, as Plotly takes them), not one dict per point
+        shown = v > 2.0
+        timeseries = {"t": t[shown].tolist(), "val": v[shown].tolist()}
+        
+        # Spike runs: rising/falling edges of the over-threshold mask, padded so
+        # runs touching either end of the tape are closed
+        edges = np.diff((v > TH_VREP).astype(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        # A dropout event must persist for TH_PERSIST frames
+        keep = (ends - starts) >= TH_PERSIST
+        starts, ends = starts[keep], ends[keep]
+        
+        issues = []
+        if len(starts):
+            # Peak per run: reduce over [start, end) pairs; the sentinel keeps
+            # an end index of len(v) in range
+            peaks = np.maximum.reduceat(np.append(v, 0.0), np.column_stack((starts, ends)).ravel())[::2]
+            for start, n, peak in zip(t[starts].tolist(), (ends - starts).tolist(), peaks.tolist()):
+                issues.append({
+                    "timestamp": start,
+                    "metric": "VREP",
+                    "value": peak,
+                    "duration_frames": n,
+                    "details": f"Analog Dropout / TBC Compensation (VREP Spikes: {n} frames)"
+                })
 
         return issues, timeseries
 
     except Exception as e:
         logger.error(f"VREP Analysis Failed: {e}")
-        return [], []
+        return [], {"t": [], "val": []}
 
 def run_validator(input_path, output_path, mode="strict"):
     profile = load_profile(mode)
@@ -117,7 +217,7 @@ def run_validator(input_path, output_path, mode="strict"):
         "status": "PASSED",
         "events": [],
         "metrics": {"vrep_spikes": 0},
-        "timeseries": []
+        "timeseries": {"t": [], "val": []}
     }
     
     # Run Analysis
@@ -134,8 +234,12 @@ def run_validator(input_path, output_path, mode="strict"):
             report["status"] = "REJECTED"
             
     # Write Report
-    with open(output_path, "w") as f:
-        json.dump(report, f, indent=4)
+    json_io.write_json(output_path, report)
+    return report
+
+def run(input_path, output_path, mode="strict", hwaccel=None):
+    """In-process entry point used by the pipeline orchestrator."""
+    return run_validator(input_path, output_path, mode)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -1,5 +1,4 @@
 import argparse
-import json
 import subprocess
 import os
 import logging
@@ -10,6 +9,7 @@ from typing import Dict, List, Any, Optional
 # --- Import Core Modules ---
 from src.config import threshold_registry
 from src.utils.logger import setup_logger
+from src.utils import probe_cache, json_io
 
 # Initialize Standard Logger
 logger = setup_logger("validate_artifacts")
@@ -34,17 +34,10 @@ def get_bitrate_metrics(input_path: Path) -> Optional[Dict[str, float]]:
         Optional[Dict]: Dictionary with 'bpp', 'bitrate', 'width', 'height', or None on failure.
     """
     try:
-        cmd = [
-            "ffprobe", "-v", "error", "-select_streams", "v:0",
-            "-show_entries", "stream=width,height,bit_rate", 
-            "-of", "json", str(input_path)
-        ]
-        # Use full path for subprocess safety
-        res = subprocess.run(cmd, capture_output=True, text=True)
-        data = json.loads(res.stdout)
-        if not data.get("streams"): return None
+        # Shared run-wide ffprobe blob instead of a dedicated probe
+        stream = probe_cache.get_stream(input_path, "video")
+        if not stream: return None
         
-        stream = data["streams"][0]
         w = int(stream.get("width", 0))
         h = int(stream.get("height", 0))
         br = int(stream.get("bit_rate", 0))
@@ -149,7 +142,7 @@ def stitch_ml_events(raw_results: List[Dict[str, Any]], min_duration: float = 1.
         
     return final_events
 
-def run_validator(input_path: str, output_path: str, mode: str = "strict") -> None:
+def run_validator(input_path: str, output_path: str, mode: str = "strict") -> Dict[str, Any]:
     """
     Main entry point for Artifact Validation Module.
     Combines Heuristic checks (Bitrate) with ML checks (BRISQUE).
@@ -231,10 +224,14 @@ def run_validator(input_path: str, output_path: str, mode: str = "strict") -> No
         report["effective_status"] = "WARNING"
 
     # Save Report
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=4)
+    json_io.write_json(output_path, report)
         
     logger.info(f"Artifact QC Complete. Status: {report['status']}")
+    return report
+
+def run(input_path, output_path, mode="strict", hwaccel=None):
+    """In-process entry point used by the pipeline orchestrator."""
+    return run_validator(input_path, output_path, mode)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -1,12 +1,14 @@
 import sys
 import argparse
-import json
 import cv2
 import numpy as np
 import librosa
 from scipy import signal
 from pathlib import Path
 
+from src.utils import ffmpeg_pool, json_io
+from src.utils.frame_reader import read_frames
+
 # -------------------------------------------------
 # CONFIGURATION
 # -------------------------------------------------
@@ -16,6 +18,53 @@ HOP_LENGTH = 512          # Audio frame size
 SYNC_TOLERANCE_MS = 40.0  # EBU R37 standard
 ANALYSIS_WINDOW_SEC = 60  # Duration of chunks to analyze
 
+def _motion_thumbnail(frame):
+    return cv2.cvtColor(cv2.resize(frame, (64, 64)), cv2.COLOR_BGR2GRAY)
+
+def _motion_energy_luma(input_path, start_sec, duration_sec):
+    """
+    Frame-to-frame motion energy from the decoder's Y plane: no BGR frame is
+    built and no cvtColor runs. Raises ValueError for non-8-bit pixel formats.
+    """
+    end_sec = start_sec + duration_sec
+    energy = []
+    prev = None
+    for t, luma in ffmpeg_pool.luma_frames(input_path, start_time=start_sec):
+        # Inclusive, like the BGR path's frames_to_read + 1
+        if t > end_sec:
+            break
+        # resize copies out of the decoder's buffer, so prev stays valid
+        small = cv2.resize(luma, (64, 64))
+        if prev is not None:
+            energy.append(np.sum(cv2.absdiff(small, prev)))
+        prev = small
+    return energy if prev is not None else None
+
+def _motion_energy_bgr(input_path, start_sec, duration_sec):
+    """Same as _motion_energy_luma through cv2.VideoCapture (BGR decode + cvtColor)."""
+    cap = cv2.VideoCapture(str(input_path))
+    if not cap.isOpened(): return None
+
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    
+    # Seek to start
+    start_frame = int(start_sec * fps)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+    
+    frames_to_read = int(duration_sec * fps)
+    visual_energy = []
+    
+    # Reader thread decodes and downsamples while we diff
+    prev_gray = None
+    for _, gray in read_frames(cap, max_frames=frames_to_read + 1, transform=_motion_thumbnail):
+        if prev_gray is not None:
+            diff = np.sum(cv2.absdiff(gray, prev_gray))
+            visual_energy.append(diff)
+        prev_gray = gray
+        
+    cap.release()
+    return visual_energy if prev_gray is not None else None
+
 class AVSyncValidator:
     def __init__(self, input_path, output_path, mode):
         self.input_path = input_path
@@ -54,36 +103,21 @@ class AVSyncValidator:
             return None, None, None
 
         # 2. Visual Features
-        cap = cv2.VideoCapture(str(self.input_path))
-        if not cap.isOpened(): return None, None, None
-
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        
-        # Seek to start
-        start_frame = int(start_sec * fps)
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-        
-        frames_to_read = int(duration_sec * fps)
-        visual_energy = []
-        
-        ret, prev_frame = cap.read()
-        if not ret: 
-            cap.release()
+        # Luma only (motion energy is normalized below, so limited-range Y
+        # scores like BGR->gray); OpenCV decode when PyAV can't provide it
+        visual_energy = None
+        if ffmpeg_pool.HAS_AV:
+            try:
+                visual_energy = _motion_energy_luma(self.input_path, start_sec, duration_sec)
+            except Exception:
+                # e.g. 10-bit input (no 8-bit Y plane)
+                visual_energy = None
+        if visual_energy is None:
+            visual_energy = _motion_energy_bgr(self.input_path, start_sec, duration_sec)
+
+        if visual_energy is None:
             return None, None, None
         
-        prev_gray = cv2.cvtColor(cv2.resize(prev_frame, (64, 64)), cv2.COLOR_BGR2GRAY)
-
-        for _ in range(frames_to_read):
-            ret, frame = cap.read()
-            if not ret: break
-            
-            gray = cv2.cvtColor(cv2.resize(frame, (64, 64)), cv2.COLOR_BGR2GRAY)
-            diff = np.sum(cv2.absdiff(gray, prev_gray))
-            visual_energy.append(diff)
-            prev_gray = gray
-            
-        cap.release()
-        
         v_signal = np.array(visual_energy)
         
         # Normalize
@@ -176,10 +210,14 @@ class AVSyncValidator:
         }
 
         self._save()
+        return self.report
 
     def _save(self):
-        with open(self.output_path, "w", encoding="utf-8") as f:
-            json.dump(self.report, f, indent=4)
+        json_io.write_json(self.output_path, self.report)
+
+def run(input_path, output_path, mode="strict", hwaccel=None):
+    """In-process entry point used by the pipeline orchestrator."""
+    return AVSyncValidator(Path(input_path), Path(output_path), mode).run()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
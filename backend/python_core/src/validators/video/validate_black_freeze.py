@@ -1,95 +1,175 @@
 import argparse
-import json
+import re
 import subprocess
 import sys
 import os
 from pathlib import Path
 
-def detect_black_freeze(input_path, duration_sec):
+from src.utils import ffmpeg_pool, json_io, probe_cache
+
+# blackdetect summaries and freezedetect metadata lines, matched in one scan
+_EVENT_RE = re.compile(
+    r"black_start:\s*(?P<black_start>-?\d[\d.]*)\s+black_end:\s*(?P<black_end>-?\d[\d.]*)\s+black_duration:\s*(?P<black_dur>-?\d[\d.]*)"
+    r"|lavfi\.freezedetect\.freeze_(?P<freeze>start|end):\s*(?P<freeze_time>-?\d[\d.]*)"
+)
+
+# Input banner ffmpeg prints before any filter output: "Duration: 00:01:02.50,"
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+# 1. Black Detect: black_min_duration=2.0 (ignores flash frames)
+# 2. Freeze Detect: noise=-60dB (ignores grain), duration=2.0
+BLACK_MIN_DURATION = 2.0
+FILTERS = [
+    ("blackdetect", f"d={BLACK_MIN_DURATION}:pix_th=0.10"),
+    ("freezedetect", "n=-60dB:d=2.0"),
+]
+
+def _black_event(start, end, dur, duration_sec):
+    # Fade Exclusion Logic
+    # If black starts at 0.0 -> Fade In
+    # If black ends near total duration -> Fade Out
+    if start < 1.0:
+        ev_type = "fade_in"
+        desc = "Intentional Fade-In detected."
+    elif end > (duration_sec - 1.0):
+        ev_type = "fade_out"
+        desc = "Intentional Fade-Out detected."
+    else:
+        ev_type = "black_frame_error"
+        desc = f"Unexpected Black Screen for {dur}s."
+
+    return {
+        "type": ev_type,
+        "details": desc,
+        "start_time": start,
+        "end_time": end
+    }
+
+def _close_freeze(events, end):
+    # Find matching start
+    for e in reversed(events):
+        if e.get("type") == "freeze_start" and "end_time" not in e:
+            e["type"] = "video_freeze"
+            e["start_time"] = e["time"]
+            e["end_time"] = end
+            e["details"] = f"Video Freeze detected for {round(end - e['time'], 2)}s."
+            del e["time"]
+            break
+
+def _scan_cli(input_path, duration_sec, events, hwaccel="none"):
     """
-    Detects Black frames and Freezes.
-    Smart Logic: Ignores Black frames at strict start/end (Fades).
+    Events parsed from an ffmpeg child's stderr. When `duration_sec` is None
+    it is read from the input banner, which precedes every event line.
+    `hwaccel` other than "none" decodes on that device (e.g. cuda, vaapi);
+    ffmpeg downloads the frames for the software filters.
     """
-    # 1. Black Detect: black_min_duration=2.0 (ignores flash frames)
-    # 2. Freeze Detect: noise=-60dB (ignores grain), duration=2.0
-    cmd = [
-        "ffmpeg",
-        "-v", "info",
+    # Stays at info: the event lines and the Duration banner are log output
+    cmd = ["ffmpeg", "-nostats", "-v", "info", "-threads", "0"]
+    if hwaccel != "none":
+        cmd.extend(["-hwaccel", hwaccel])
+    cmd.extend([
         "-i", str(input_path),
-        "-vf", "blackdetect=d=2.0:pix_th=0.10,freezedetect=n=-60dB:d=2.0",
+        "-vf", ",".join(f"{name}={args}" for name, args in FILTERS),
+        "-an",
         "-f", "null",
         "-"
-    ]
+    ])
     
-    events = []
-    try:
-        process = subprocess.run(
-            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, 
-            text=True, encoding="utf-8", errors="replace"
-        )
-        log = process.stderr
-        
-        # Parse FFmpeg Log
-        for line in log.split('\n'):
+    # Parse FFmpeg Log as it is written; stderr is never held whole
+    with subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, 
+        text=True, encoding="utf-8", errors="replace", bufsize=1
+    ) as process:
+        for line in process.stderr:
+            if duration_sec is None:
+                d = _DURATION_RE.search(line)
+                if d:
+                    h, mins, secs = d.groups()
+                    duration_sec = int(h) * 3600 + int(mins) * 60 + float(secs)
+                    continue
+            m = _EVENT_RE.search(line)
+            if m is None:
+                continue
+            if duration_sec is None:
+                # No banner (e.g. unknown duration): same as a failed probe
+                duration_sec = 0.0
             # --- BLACK DETECT ---
-            if "black_start" in line:
+            if m.group("black_start") is not None:
                 # Format: black_start:12.5 black_end:15.5 black_duration:3.0
-                parts = line.split()
-                start = float(parts[3].split(':')[1])
-                end = float(parts[4].split(':')[1])
-                dur = float(parts[5].split(':')[1])
-                
-                # Fade Exclusion Logic
-                # If black starts at 0.0 -> Fade In
-                # If black ends near total duration -> Fade Out
-                if start < 1.0:
-                    ev_type = "fade_in"
-                    desc = "Intentional Fade-In detected."
-                elif end > (duration_sec - 1.0):
-                    ev_type = "fade_out"
-                    desc = "Intentional Fade-Out detected."
-                else:
-                    ev_type = "black_frame_error"
-                    desc = f"Unexpected Black Screen for {dur}s."
-
-                events.append({
-                    "type": ev_type,
-                    "details": desc,
-                    "start_time": start,
-                    "end_time": end
-                })
+                start, end, dur = map(float, m.group("black_start", "black_end", "black_dur"))
+                events.append(_black_event(start, end, dur, duration_sec))
 
             # --- FREEZE DETECT ---
-            if "lavfi.freezedetect.freeze_start" in line:
-                start = float(line.split(": ")[1])
+            elif m.group("freeze") == "start":
+                start = float(m.group("freeze_time"))
                 events.append({"type": "freeze_start", "time": start})
-            if "lavfi.freezedetect.freeze_end" in line:
-                end = float(line.split(": ")[1])
-                # Find matching start
-                for e in reversed(events):
-                    if e.get("type") == "freeze_start" and "end_time" not in e:
-                        e["type"] = "video_freeze"
-                        e["start_time"] = e["time"]
-                        e["end_time"] = end
-                        e["details"] = f"Video Freeze detected for {round(end - e['time'], 2)}s."
-                        del e["time"]
-                        break
+            else:
+                _close_freeze(events, float(m.group("freeze_time")))
 
+def _scan_av(input_path, duration_sec, events):
+    """
+    Same events from the filters' frame tags, decoded in-process by PyAV.
+    blackdetect tags every black run, so the minimum duration is applied here
+    (the CLI log only reports runs that meet it).
+    """
+    if duration_sec is None:
+        duration_sec = ffmpeg_pool.container_duration(input_path)
+    black_start = None
+    last_time = 0.0
+    for time, tags in ffmpeg_pool.filter_metadata(input_path, FILTERS):
+        last_time = time
+        # --- BLACK DETECT ---
+        if "lavfi.black_start" in tags:
+            black_start = float(tags["lavfi.black_start"])
+        if "lavfi.black_end" in tags and black_start is not None:
+            end = float(tags["lavfi.black_end"])
+            if end - black_start >= BLACK_MIN_DURATION:
+                events.append(_black_event(black_start, end, round(end - black_start, 6), duration_sec))
+            black_start = None
+
+        # --- FREEZE DETECT ---
+        if "lavfi.freezedetect.freeze_start" in tags:
+            events.append({"type": "freeze_start", "time": float(tags["lavfi.freezedetect.freeze_start"])})
+        if "lavfi.freezedetect.freeze_end" in tags:
+            _close_freeze(events, float(tags["lavfi.freezedetect.freeze_end"]))
+
+    # A black run reaching the end of the file never gets an end tag
+    if black_start is not None and last_time - black_start >= BLACK_MIN_DURATION:
+        events.append(_black_event(black_start, last_time, round(last_time - black_start, 6), duration_sec))
+
+def detect_black_freeze(input_path, duration_sec, hwaccel="none"):
+    """
+    Detects Black frames and Freezes.
+    Smart Logic: Ignores Black frames at strict start/end (Fades).
+    Decodes in-process through PyAV when available, else via the ffmpeg CLI;
+    a hardware decoder (`hwaccel`) always goes through the CLI.
+    `duration_sec` None means "take it from the decode's own container".
+    """
+    events = []
+    try:
+        if ffmpeg_pool.HAS_AV and hwaccel == "none":
+            try:
+                _scan_av(input_path, duration_sec, events)
+            except Exception:
+                # e.g. a PyAV build without these filters
+                events = None
+        if not ffmpeg_pool.HAS_AV or hwaccel != "none" or events is None:
+            events = []
+            _scan_cli(input_path, duration_sec, events, hwaccel)
     except Exception as e:
         return []
 
     return [e for e in events if "time" not in e] # Clean up temp objects
 
-def run_validator(input_path, output_path, mode="strict"):
-    # Get Duration first for Fade Logic
-    probe_cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", str(input_path)]
+def run_validator(input_path, output_path, mode="strict", hwaccel="none"):
+    # Get Duration first for Fade Logic: from the run-wide probe when the
+    # orchestrator already made one, else from the scan itself (no extra ffprobe)
     try:
-        dur_str = subprocess.check_output(probe_cmd, text=True).strip()
-        total_duration = float(dur_str)
+        total_duration = float((probe_cache.peek(input_path) or {})["format"]["duration"])
     except:
-        total_duration = 0.0
+        total_duration = None
 
-    events = detect_black_freeze(input_path, total_duration)
+    events = detect_black_freeze(input_path, total_duration, hwaccel)
     
     # Filter: Strict mode rejects freezes, but allows fades
     status = "PASSED"
@@ -105,13 +185,18 @@ def run_validator(input_path, output_path, mode="strict"):
         }
     }
     
-    with open(output_path, "w") as f:
-        json.dump(report, f, indent=4)
+    json_io.write_json(output_path, report)
+    return report
+
+def run(input_path, output_path, mode="strict", hwaccel=None):
+    """In-process entry point used by the pipeline orchestrator."""
+    return run_validator(input_path, output_path, mode, hwaccel or "none")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", required=True)
     parser.add_argument("--output", required=True)
     parser.add_argument("--mode", default="strict")
+    parser.add_argument("--hwaccel", default="none")
     args = parser.parse_args()
-    run_validator(args.input, args.output, args.mode)
\ No newline at end of file
+    run_validator(args.input, args.output, args.mode, args.hwaccel)
\ No newline at end of file
@@ -1,11 +1,13 @@
 import argparse
-import json
 import subprocess
 import re
 import cv2
 import numpy as np
 from pathlib import Path
 
+from src.utils import json_io
+from src.utils.frame_reader import read_frames
+
 # Config
 DUPLICATE_THRESHOLD = 1.0  # Pixel diff sum
 GAP_TOLERANCE_PCT = 0.5    # Allow 50% deviation in frame duration before flagging Gap
@@ -56,6 +58,9 @@ def parse_ffmpeg_errors(log_text):
                     })
     return events
 
+def _thumbnail(frame):
+    return cv2.resize(frame, (64, 64))
+
 def scan_visual_integrity(input_path):
     """
     2.1 Visual Scan (Duplicates, Gaps, Drift)
@@ -80,12 +85,8 @@ def scan_visual_integrity(input_path):
     in_dup_seq = False
     dup_start_time = 0.0
 
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-            
-        current_pts = cap.get(cv2.CAP_PROP_POS_MSEC)
+    # Decode + 64x64 downscale run on a reader thread, ahead of this loop
+    for current_pts, frame in read_frames(cap, transform=_thumbnail):
         
         # --- A. Gap & Drift Detection ---
         if frame_idx > 0 and prev_pts >= 0:
@@ -111,11 +112,8 @@ def scan_visual_integrity(input_path):
 
         # --- B. Duplicate Detection ---
         if prev_frame is not None:
-            # Resize for speed (64x64 is enough)
-            curr_small = cv2.resize(frame, (64, 64))
-            prev_small = cv2.resize(prev_frame, (64, 64))
-            
-            diff = cv2.absdiff(curr_small, prev_small)
+            # Frames arrive pre-resized to 64x64 (enough for dup detection)
+            diff = cv2.absdiff(frame, prev_frame)
             non_zero_count = np.count_nonzero(diff)
             
             is_dup = (non_zero_count < 50) # Strict threshold
@@ -185,8 +183,12 @@ def run_validator(input_path, output_path, mode="strict", hwaccel="none"):
     elif any(e["type"] == "frame_gap" for e in report["details"]["events"]):
         report["status"] = "WARNING"
 
-    with open(output_path, "w") as f:
-        json.dump(report, f, indent=4)
+    json_io.write_json(output_path, report)
+    return report
+
+def run(input_path, output_path, mode="strict", hwaccel=None):
+    """In-process entry point used by the pipeline orchestrator."""
+    return run_validator(input_path, output_path, mode, hwaccel or "none")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -1,9 +1,14 @@
 import argparse
-import json
 import subprocess
 import re
 from fractions import Fraction
-from pathlib import Path
+
+from src.config import threshold_registry
+from src.utils import ffmpeg_pool, json_io, probe_cache
+
+# cropdetect's tags as printed by the metadata filter; matched on raw stdout
+# bytes, no UTF-8 decode
+_CROP_RE = re.compile(rb"^lavfi\.cropdetect\.([whxy])=(\d+)", re.MULTILINE)
 
 def load_profile(mode="strict"):
     default_profile = {
@@ -11,34 +16,16 @@ def load_profile(mode="strict"):
         "ar_tolerance": 0.05
     }
     try:
-        config_path = Path(__file__).parent.parent.parent / "config" / "signal_profiles.json"
-        if config_path.exists():
-            with open(config_path, "r") as f:
-                data = json.load(f)
-                profiles = data.get("profiles", {})
-                key = "STRICT"
-                if mode.lower() == "netflix": key = "NETFLIX_HD"
-                if mode.lower() == "youtube": key = "YOUTUBE"
-                if key in profiles:
-                    return profiles[key].get("validate_geometry", default_profile)
+        profile = threshold_registry.get_signal_profile(mode, "validate_geometry")
+        if profile is not None:
+            return profile
     except Exception:
         pass
     return default_profile
 
 def get_geometry_metadata(input_path):
-    try:
-        cmd = [
-            "ffprobe", "-v", "error", "-select_streams", "v:0",
-            "-show_entries", "stream=width,height,sample_aspect_ratio,display_aspect_ratio,duration", 
-            "-of", "json", str(input_path)
-        ]
-        res = subprocess.run(cmd, capture_output=True, text=True)
-        data = json.loads(res.stdout)
-        if not data.get("streams"):
-            return None
-        return data["streams"][0]
-    except Exception:
-        return None
+    # Shared run-wide ffprobe blob (see src.utils.probe_cache)
+    return probe_cache.get_stream(input_path, "video")
 
 def parse_ratio(ratio_str):
     try:
@@ -50,16 +37,36 @@ def parse_ratio(ratio_str):
         return 0.0
 
 def detect_active_area(input_path, start_time):
+    # Keyframes only: a keyframe needs no reference frames, so neither the
+    # seek nor the sample pays for decoding the rest of each GOP
+    # In-process first (PyAV): five frames do not justify an ffmpeg process
+    if ffmpeg_pool.HAS_AV:
+        try:
+            crop = None
+            for _, tags in ffmpeg_pool.filter_metadata(input_path, [("cropdetect", "24:16:0")], start_time=start_time,
+                                                       max_frames=5, keyframes_only=True):
+                if "lavfi.cropdetect.w" in tags:
+                    crop = tags
+            if crop:
+                return tuple(int(crop[f"lavfi.cropdetect.{k}"]) for k in "whxy")
+            return None
+        except Exception:
+            # e.g. a PyAV build without cropdetect
+            pass
+
+    # Tags go to stdout via the metadata filter; stderr carries errors only
     cmd = [
-        "ffmpeg", "-ss", str(start_time), "-i", str(input_path),
-        "-vf", "cropdetect=24:16:0", "-frames:v", "5", "-f", "null", "-"
+        "ffmpeg", "-nostats", "-v", "error", "-threads", "0",
+        "-skip_frame", "nokey", "-ss", str(start_time), "-i", str(input_path),
+        "-vf", "cropdetect=24:16:0,metadata=mode=print:file=pipe\\:1",
+        "-frames:v", "5", "-an", "-f", "null", "-"
     ]
     try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, errors="replace")
-        matches = re.findall(r"crop=(\d+):(\d+):(\d+):(\d+)", proc.stderr)
-        if matches:
-            w, h, x, y = map(int, matches[-1])
-            return w, h, x, y
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        # Later frames overwrite earlier ones: the last full crop wins
+        crop = dict(_CROP_RE.findall(proc.stdout))
+        if len(crop) == 4:
+            return tuple(int(crop[k]) for k in (b"w", b"h", b"x", b"y"))
     except:
         pass
     return None
@@ -77,8 +84,8 @@ def run_validator(input_path, output_path, mode="strict"):
     if not meta:
         report["status"] = "SKIPPED"
         report["metrics"]["error"] = "Could not probe video geometry"
-        with open(output_path, "w") as f: json.dump(report, f, indent=4)
-        return
+        json_io.write_json(output_path, report)
+        return report
 
     width = int(meta.get("width", 0))
     height = int(meta.get("height", 0))
@@ -153,8 +160,12 @@ def run_validator(input_path, output_path, mode="strict"):
         else:
              report["metrics"]["note"] = f"Detected blanking ({blanking_pct:.2f}%) within tolerance ({TOL_PCT}%)."
 
-    with open(output_path, "w") as f:
-        json.dump(report, f, indent=4)
+    json_io.write_json(output_path, report)
+    return report
+
+def run(input_path, output_path, mode="strict", hwaccel=None):
+    """In-process entry point used by the pipeline orchestrator."""
+    return run_validator(input_path, output_path, mode)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
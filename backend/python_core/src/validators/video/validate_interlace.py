@@ -1,8 +1,9 @@
 import argparse
-import json
 import cv2
 import numpy as np
-from pathlib import Path
+
+from src.config import threshold_registry
+from src.utils import json_io
 
 # Try to import config, fallback to defaults
 try:
@@ -20,23 +21,17 @@ def load_profile(mode="strict"):
         "min_duration_sec": 0.2
     }
     try:
-        config_path = Path(__file__).parent.parent.parent / "config" / "signal_profiles.json"
-        if config_path.exists():
-            with open(config_path, "r") as f:
-                data = json.load(f)
-                profiles = data.get("profiles", {})
-                key = "STRICT"
-                if mode.lower() == "netflix": key = "NETFLIX_HD"
-                if mode.lower() == "youtube": key = "YOUTUBE"
-                if key in profiles:
-                    return profiles[key].get("validate_interlace", default_profile)
+        profile = threshold_registry.get_signal_profile(mode, "validate_interlace")
+        if profile is not None:
+            return profile
     except Exception:
         pass
     return default_profile
 
 def calculate_psnr(img1, img2):
-    diff = img1 - img2
-    rmse = np.sqrt(np.mean(diff ** 2))
+    # L2 distance straight from the uint8 fields: no wrap-around on
+    # subtraction and no float64 difference image
+    rmse = cv2.norm(img1, img2, cv2.NORM_L2) / np.sqrt(img1.size)
     if rmse == 0:
         return 100.0
     return 20 * np.log10(255.0 / rmse)
@@ -48,14 +43,13 @@ def calculate_ssim_approx(img1, img2):
     C1 = 6.5025
     C2 = 58.5225
     
-    i1 = img1.astype(np.float64)
-    i2 = img2.astype(np.float64)
-    
-    mu1 = np.mean(i1)
-    mu2 = np.mean(i2)
-    sig1 = np.var(i1)
-    sig2 = np.var(i2)
-    covar = np.mean((i1 - mu1) * (i2 - mu2))
+    # One meanStdDev sweep per field for mean and variance; covariance as
+    # E[xy] - mu1*mu2 over an int32 product instead of float64 centred copies
+    mu1, sd1 = (float(v[0, 0]) for v in cv2.meanStdDev(img1))
+    mu2, sd2 = (float(v[0, 0]) for v in cv2.meanStdDev(img2))
+    sig1 = sd1 * sd1
+    sig2 = sd2 * sd2
+    covar = cv2.sumElems(cv2.multiply(img1, img2, dtype=cv2.CV_32S))[0] / img1.size - mu1 * mu2
     
     numerator = (2 * mu1 * mu2 + C1) * (2 * covar + C2)
     denominator = (mu1**2 + mu2**2 + C1) * (sig1 + sig2 + C2)
@@ -161,8 +155,12 @@ def run_validator(input_path, output_path, mode="strict"):
         }
     }
     
-    with open(output_path, "w") as f:
-        json.dump(report, f, indent=4)
+    json_io.write_json(output_path, report)
+    return report
+
+def run(input_path, output_path, mode="strict", hwaccel=None):
+    """In-process entry point used by the pipeline orchestrator."""
+    return run_validator(input_path, output_path, mode)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -19,11 +19,12 @@ logger = logging.getLogger("visualize_report")
 def format_time(seconds):
     return TimecodeHelper.seconds_to_smpte(seconds, fps=24) # Defaulting to 24fps for display
 
-def create_interactive_dashboard(report_path, output_path):
+def create_interactive_dashboard(report_path, output_path, report_data=None):
     logger.info(f"Generating dashboard from: {report_path}")
     
     standardizer = ReportStandardizer()
-    data = standardizer.load_report(report_path)
+    # report_data: the Master Report as generate_master returned it (skips the re-read)
+    data = standardizer.load_report(report_path, report_data)
     
     if not data:
         logger.error("No data found in report")
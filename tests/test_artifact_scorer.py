@@ -55,5 +55,35 @@ class TestArtifactScorer:
         assert self.scorer.classify_severity(85.0) == "SEVERE"
         assert self.scorer.classify_severity(-1.0) == "UNKNOWN"
 
+    def test_nss_matches_opencv_brisque(self):
+        """Verify the Numba NSS implementation reproduces cv2.quality's BRISQUE score."""
+        import cv2
+        from src.utils import brisque_nss
+        if not (brisque_nss.HAS_NUMBA and hasattr(cv2, "quality")):
+            pytest.skip("needs numba and opencv-contrib")
+
+        reference = cv2.quality.QualityBRISQUE_create(ArtifactScorer._MODEL_FILE, ArtifactScorer._RANGE_FILE)
+        model = brisque_nss.BrisqueModel(ArtifactScorer._MODEL_FILE, ArtifactScorer._RANGE_FILE)
+
+        np.random.seed(7)
+        noise = np.random.randint(0, 255, (240, 320, 3), dtype=np.uint8)
+        smooth = cv2.GaussianBlur(noise, (0, 0), 3)
+        for frame in (noise, smooth):
+            assert model.compute(frame) == pytest.approx(reference.compute(frame)[0], abs=0.05)
+
+    def test_mscn_uses_replicated_borders(self):
+        """The MSCN blur must clamp borders like QualityBRISQUE, not reflect them."""
+        import cv2
+        from src.utils import brisque_nss
+        if not brisque_nss.HAS_NUMBA:
+            pytest.skip("needs numba")
+
+        np.random.seed(3)
+        img = np.random.randint(0, 255, (37, 53), dtype=np.uint8).astype(np.float32) / 255
+        mu = cv2.GaussianBlur(img, (7, 7), 7 / 6, borderType=cv2.BORDER_REPLICATE)
+        sq = cv2.GaussianBlur(img * img, (7, 7), 7 / 6, borderType=cv2.BORDER_REPLICATE)
+        expected = (img - mu) / (np.sqrt(np.abs(sq - mu * mu)) + 1 / 255)
+        np.testing.assert_allclose(brisque_nss._mscn(img, brisque_nss.GAUSS_TAPS), expected, atol=1e-4)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -56,5 +56,16 @@ class TestCalibrationLogic(unittest.TestCase):
         profile = validate_geometry.load_profile("STRICT")
         self.assertEqual(profile["blanking_tolerance_pct"], 0.5)
 
+    def test_vrep_kernel_matches_numpy(self):
+        if not validate_analog.HAS_NUMBA:
+            self.skipTest("needs numba")
+        rng = np.random.default_rng(11)
+        for _ in range(20):
+            luma = rng.integers(0, 3, (64, 48), dtype=np.uint8)
+            luma[rng.integers(0, 64, 8)] = 0  # Some repeated rows
+            h, w = luma.shape
+            diff = np.abs(luma[validate_analog.VREP_LAG:].astype(np.int16) - luma[:-validate_analog.VREP_LAG]).sum(axis=1)
+            self.assertEqual(validate_analog.vrep(luma), np.count_nonzero(diff < w) / h)
+
 if __name__ == '__main__':
     unittest.main()
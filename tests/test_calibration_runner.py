@@ -0,0 +1,98 @@
+import json
+import pytest
+import os
+import sys
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+# Ensure we can import from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.research import calibration_runner
+from src.research.calibration_runner import CalibrationRunner
+
+def _frames_then_fail(n):
+    """Gray-frame source that dies mid-file, like PyAV on a corrupt packet."""
+    for i in range(n):
+        yield i + 1, np.full((8, 8), 16 * i, dtype=np.uint8)
+    raise RuntimeError("Invalid data found when processing input")
+
+def _thread_pool(max_workers, mp_context=None, initializer=None):
+    """In-process stand-in for the forkserver pool, so patches reach the workers."""
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+@pytest.fixture
+def samples(tmp_path):
+    src = tmp_path / "samples"
+    src.mkdir()
+    for name in ("good.mp4", "bad.mp4"):
+        (src / name).write_bytes(name.encode())
+    return src
+
+def test_mid_file_decode_error_is_reported(tmp_path):
+    runner = CalibrationRunner(str(tmp_path), str(tmp_path / "report.json"))
+    with patch.object(calibration_runner, "_open_gray_frames", return_value=_frames_then_fail(3)):
+        result = runner.run_ssim_interlace_check(tmp_path / "clip.mp4")
+    assert result["status"] == "error"
+    assert "after 3 frames" in result["error"]
+    assert "Invalid data" in result["error"]
+
+def test_failed_file_is_recorded_and_run_completes(samples, tmp_path):
+    report = tmp_path / "report.json"
+    good = {"signals": {"status": "success"}, "interlace": {"status": "success"}, "geometry": {"status": "success"}}
+
+    def process(self, f):
+        if f.name == "bad.mp4":
+            raise OSError("worker lost the file")
+        return dict(good, filename=f.name, path=str(f))
+
+    runner = CalibrationRunner(str(samples), str(report))
+    with patch.object(calibration_runner, "ProcessPoolExecutor", _thread_pool), \
+         patch.object(CalibrationRunner, "_process_file", process):
+        runner.execute()
+
+    files = {e["filename"]: e for e in json.loads(report.read_text())["files"]}
+    assert files["good.mp4"]["interlace"]["status"] == "success"
+    bad = files["bad.mp4"]
+    assert all(bad[key]["status"] == "error" for key in ("signals", "interlace", "geometry"))
+    assert "worker lost the file" in bad["signals"]["error"]
+    assert "fingerprint" in bad
+
+    # Only the failed file is redone on the next run
+    assert [e["filename"] for e in CalibrationRunner(str(samples), str(report))._load_previous().values()] == ["good.mp4"]
+
+@pytest.mark.parametrize("field, value", [
+    ("mode", "micro-batch"),
+    ("analysis_version", calibration_runner.ANALYSIS_VERSION - 1),
+    ("use_gpu", True),
+    ("analysis_version", None),  # Report written before versioning
+])
+def test_previous_report_reused_only_for_same_settings(samples, tmp_path, field, value):
+    report = tmp_path / "report.json"
+    runner = CalibrationRunner(str(samples), str(report))
+    entry = {"fingerprint": "abc", "signals": {"status": "success"},
+             "interlace": {"status": "success"}, "geometry": {"status": "success"}}
+    data = {"metadata": dict(runner.results["metadata"]), "files": [entry]}
+    report.write_text(json.dumps(data))
+    assert runner._load_previous() == {"abc": entry}
+
+    if value is None:
+        del data["metadata"][field]
+    else:
+        data["metadata"][field] = value
+    report.write_text(json.dumps(data))
+    assert runner._load_previous() == {}
+
+def test_field_sums_kernel_matches_numpy():
+    if not calibration_runner.HAS_NUMBA:
+        pytest.skip("needs numba")
+    rng = np.random.default_rng(5)
+    prev = rng.integers(0, 256, (30, 41), dtype=np.uint8)
+    gray = rng.integers(0, 256, (30, 41), dtype=np.uint8)
+
+    even, odd = gray[0::2].astype(np.int64), gray[1::2].astype(np.int64)
+    expected = (even.sum(), odd.sum(), (even * even).sum(), (odd * odd).sum(), (even * odd).sum(),
+                ((even - odd) ** 2).sum(), np.abs(odd - prev[1::2]).sum())
+    assert calibration_runner._field_sums(gray, prev, True) == expected
+    assert calibration_runner._field_sums(gray, gray, False)[6] == 0
@@ -0,0 +1,78 @@
+import threading
+import pytest
+import os
+import sys
+import numpy as np
+
+# Ensure we can import from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cv2
+from src.utils.frame_reader import read_frames
+
+class FakeCapture:
+    """Minimal cv2.VideoCapture stand-in: `total` frames at 25 fps (None = endless)."""
+    def __init__(self, total=None, fail_at=None):
+        self.total = total
+        self.fail_at = fail_at
+        self.pos = 0
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.pos)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return (self.pos - 1) * 40.0
+        return 0.0
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.pos = int(value)
+        return True
+
+    def read(self):
+        if self.fail_at is not None and self.pos == self.fail_at:
+            raise RuntimeError("decoder exploded")
+        if self.total is not None and self.pos >= self.total:
+            return False, None
+        frame = np.full((4, 4, 3), self.pos % 256, dtype=np.uint8)
+        self.pos += 1
+        return True, frame
+
+def _reader_threads():
+    return [t for t in threading.enumerate() if t.name == "frame-reader"]
+
+def test_reads_all_frames_in_order():
+    frames = list(read_frames(FakeCapture(total=20), prefetch=3))
+    assert [pts for pts, _ in frames] == [i * 40.0 for i in range(20)]
+    assert [int(f[0, 0, 0]) for _, f in frames] == list(range(20))
+    assert not _reader_threads()
+
+def test_max_frames_step_and_transform():
+    frames = list(read_frames(FakeCapture(total=100), max_frames=5, step=3,
+                              transform=lambda f: f[:, :, 0].copy()))
+    assert [int(f[0, 0]) for _, f in frames] == [0, 3, 6, 9, 12]
+    assert all(f.shape == (4, 4) for _, f in frames)
+
+def test_early_break_stops_reader_thread():
+    # Endless source with a full queue: the reader is blocked in put() when we stop
+    gen = read_frames(FakeCapture(total=None), prefetch=2)
+    for i, _ in enumerate(gen):
+        if i == 3:
+            break
+    gen.close()
+    assert not _reader_threads()
+
+def test_consumer_exception_stops_reader_thread():
+    with pytest.raises(ValueError):
+        for i, _ in enumerate(read_frames(FakeCapture(total=None), prefetch=2)):
+            if i == 2:
+                raise ValueError("consumer failed")
+    assert not _reader_threads()
+
+def test_reader_exception_reaches_consumer():
+    seen = []
+    with pytest.raises(RuntimeError, match="decoder exploded"):
+        for pts, _ in read_frames(FakeCapture(total=None, fail_at=4)):
+            seen.append(pts)
+    assert len(seen) == 4
+    assert not _reader_threads()
@@ -0,0 +1,70 @@
+import json
+import pytest
+import os
+import sys
+import numpy as np
+
+# Ensure we can import from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import json_io
+
+REPORT = {
+    "module": "validate_analog",
+    "status": "PASSED",
+    "details": {
+        "vrep_max": np.float32(0.25),
+        "frames": np.int64(300),
+        "flagged": np.bool_(False),
+        "series": np.array([0.5, 1.5]),
+        "events": [{"start_time": 1.0, "end_time": 2.5}]
+    }
+}
+
+EXPECTED = {
+    "module": "validate_analog",
+    "status": "PASSED",
+    "details": {
+        "vrep_max": 0.25,
+        "frames": 300,
+        "flagged": False,
+        "series": [0.5, 1.5],
+        "events": [{"start_time": 1.0, "end_time": 2.5}]
+    }
+}
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    """Runs a test with orjson (when installed) and with the stdlib fallback."""
+    if request.param == "orjson":
+        if json_io.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(json_io, "orjson", None)
+    return request.param
+
+def test_numpy_values_round_trip(codec):
+    data = json_io.dumps(REPORT)
+    assert isinstance(data, bytes)
+    assert json_io.loads(data) == EXPECTED
+    # Plain JSON, readable by anything
+    assert json.loads(data) == EXPECTED
+
+def test_indent(codec):
+    assert b"\n" not in json_io.dumps(EXPECTED)
+    assert json_io.dumps(EXPECTED, indent=True).startswith(b'{\n  "module"')
+
+def test_non_str_keys_fall_back_to_stdlib(codec):
+    # orjson raises TypeError on int keys; the stdlib writes them as strings
+    assert json_io.loads(json_io.dumps({1: "a", "b": {2: np.int32(3)}})) == {"1": "a", "b": {"2": 3}}
+
+def test_unserializable_still_raises(codec):
+    with pytest.raises(TypeError):
+        json_io.dumps({"x": object()})
+
+def test_file_round_trip(codec, tmp_path):
+    path = tmp_path / "report.json"
+    json_io.write_json(path, REPORT)
+    assert json_io.read_json(path) == EXPECTED
+    json_io.write_json(path, REPORT, indent=False)
+    assert json_io.read_json(str(path)) == EXPECTED
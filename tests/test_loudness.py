@@ -0,0 +1,66 @@
+import pytest
+import shutil
+import os
+import sys
+import numpy as np
+
+# Ensure we can import from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import ffmpeg_pool
+from src.validators.audio import validate_loudness
+
+pytestmark = pytest.mark.skipif(not ffmpeg_pool.HAS_AV, reason="needs PyAV")
+
+RATE = 48000
+LEVEL_DBFS = -23.0
+
+def _write_sine(path, seconds=3.05, frame_size=1000):
+    """Stereo 1 kHz sine at LEVEL_DBFS (EBU Tech 3341 case 1: reads -23.0 LUFS)."""
+    import av
+    n = int(seconds * RATE)
+    t = np.arange(n) / RATE
+    tone = (10 ** (LEVEL_DBFS / 20) * np.sin(2 * np.pi * 1000 * t)).astype(np.float32)
+    with av.open(str(path), "w") as container:
+        stream = container.add_stream("pcm_f32le", rate=RATE)
+        stream.layout = "stereo"
+        for i in range(0, n, frame_size):
+            chunk = np.ascontiguousarray(np.stack([tone[i:i + frame_size]] * 2))
+            frame = av.AudioFrame.from_ndarray(chunk, format="fltp", layout="stereo")
+            frame.sample_rate = RATE
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+def _fresh_metrics():
+    return {"integrated_lufs": -99.0, "true_peak": -99.0, "lra": 0.0}
+
+@pytest.fixture
+def sine_file(tmp_path):
+    path = tmp_path / "sine_1k.wav"
+    _write_sine(path)
+    return path
+
+def test_av_summary_survives_untagged_last_frame(sine_file):
+    """
+    The file ends mid 100 ms block, so ebur128 leaves the final frame
+    without r128 tags; the summary must come from the last tagged frame.
+    """
+    frames = list(ffmpeg_pool.filter_metadata(sine_file, [("ebur128", "peak=true:metadata=1")], media="audio"))
+    assert "lavfi.r128.I" not in frames[-1][1], "fixture no longer ends on an untagged frame"
+
+    metrics = _fresh_metrics()
+    validate_loudness._measure_av(sine_file, metrics)
+    assert metrics["integrated_lufs"] == pytest.approx(LEVEL_DBFS, abs=0.1)
+    assert metrics["true_peak"] == pytest.approx(LEVEL_DBFS, abs=0.2)
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs the ffmpeg CLI")
+def test_av_matches_cli_summary(sine_file):
+    av_metrics = _fresh_metrics()
+    validate_loudness._measure_av(sine_file, av_metrics)
+    cli_metrics = _fresh_metrics()
+    validate_loudness._measure_cli(sine_file, cli_metrics)
+
+    for key in ("integrated_lufs", "lra", "true_peak"):
+        assert av_metrics[key] == pytest.approx(cli_metrics[key], abs=0.1), key
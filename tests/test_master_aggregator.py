@@ -0,0 +1,116 @@
+import copy
+import pytest
+import os
+import sys
+import numpy as np
+
+# Ensure we can import from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.postprocess.master_aggregator import MasterAggregator, _EventBuffer
+
+def reference_stitch(events, tolerance=0.1):
+    """
+    The original per-event stitching loop. Details are compared exactly
+    (the set-based dedupe); test details are chosen so that no detail is a
+    substring of another, where the original substring check would differ.
+    """
+    if not events: return []
+    sorted_events = sorted(events, key=lambda x: (x.get("type", "unknown"), x.get("start_time", 0)))
+    stitched = []
+    current = sorted_events[0]
+    seen = {current.get("details", "")}
+    for next_evt in sorted_events[1:]:
+        if current.get("type") == next_evt.get("type"):
+            curr_end = current.get("end_time", 0)
+            next_start = next_evt.get("start_time", 0)
+            if next_start <= (curr_end + tolerance):
+                current["end_time"] = max(curr_end, next_evt.get("end_time", 0))
+                d = next_evt.get("details")
+                if d not in seen:
+                    seen.add(d)
+                    current["details"] += f" | {d}"
+                continue
+        stitched.append(current)
+        current = next_evt
+        seen = {current.get("details", "")}
+    stitched.append(current)
+    return sorted(stitched, key=lambda x: x.get("start_time", 0))
+
+def _evt(kind, start, end, details):
+    return {"type": kind, "start_time": start, "end_time": end, "details": details}
+
+@pytest.fixture
+def aggregator():
+    return MasterAggregator([], "strict")
+
+def _assert_matches_reference(aggregator, events):
+    expected = reference_stitch(copy.deepcopy(events))
+    assert aggregator._stitch_events(copy.deepcopy(events)) == expected
+    # Same result when the events arrive as the aggregate() buffer
+    assert aggregator._stitch_events(_EventBuffer.from_events(copy.deepcopy(events))) == expected
+
+def test_overlapping_events_merge(aggregator):
+    events = [
+        _evt("black", 1.0, 3.0, "d1"),
+        _evt("black", 2.0, 5.0, "d2"),
+        _evt("black", 4.5, 4.8, "d3"),  # inside the merged run
+        _evt("freeze", 2.5, 3.5, "f1"),
+    ]
+    _assert_matches_reference(aggregator, events)
+    stitched = aggregator._stitch_events(copy.deepcopy(events))
+    assert [(e["type"], e["start_time"], e["end_time"]) for e in stitched] == [
+        ("black", 1.0, 5.0), ("freeze", 2.5, 3.5)
+    ]
+    assert stitched[0]["details"] == "d1 | d2 | d3"
+
+def test_adjacent_within_tolerance(aggregator):
+    events = [
+        _evt("gap", 0.0, 1.0, "a"),
+        _evt("gap", 1.1, 2.0, "b"),   # exactly end + tolerance: merges
+        _evt("gap", 2.25, 3.0, "c"),  # past tolerance: new run
+    ]
+    _assert_matches_reference(aggregator, events)
+    assert len(aggregator._stitch_events(copy.deepcopy(events))) == 2
+
+def test_inverted_intervals(aggregator):
+    # end < start: a run's reach can drop below an earlier run's
+    events = [
+        _evt("sync", 0.0, 10.0, "s1"),
+        _evt("sync", 12.0, 11.0, "s2"),
+        _evt("sync", 11.05, 11.5, "s3"),
+        _evt("sync", 11.2, 5.0, "s4"),
+        _evt("sync", 11.7, 11.8, "s5"),
+    ]
+    _assert_matches_reference(aggregator, events)
+
+def test_duplicate_details_appended_once(aggregator):
+    events = [
+        _evt("freeze", 0.0, 2.0, "frozen"),
+        _evt("freeze", 1.0, 3.0, "frozen"),
+        _evt("freeze", 2.0, 4.0, "stalled"),
+        _evt("freeze", 3.0, 5.0, "stalled"),
+    ]
+    _assert_matches_reference(aggregator, events)
+    assert aggregator._stitch_events(copy.deepcopy(events))[0]["details"] == "frozen | stalled"
+
+def test_random_events_match_reference(aggregator):
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        n = int(rng.integers(1, 40))
+        events = []
+        for _ in range(n):
+            start = round(float(rng.uniform(0, 20)), 1)
+            # Mostly forward intervals, some inverted ones
+            end = round(start + float(rng.uniform(-1.0, 3.0)), 1)
+            events.append(_evt(str(rng.choice(["black", "freeze", "gap"])), start, end,
+                               f"detail-{int(rng.integers(0, 5))}."))
+        _assert_matches_reference(aggregator, events)
+
+def test_event_buffer_grows():
+    buf = _EventBuffer(capacity=2)
+    events = [_evt("black", float(i), float(i) + 0.5, f"d{i}.") for i in range(9)]
+    for e in events:
+        buf.append(e)
+    assert len(buf) == 9
+    assert [e["start_time"] for e in buf.rows["event"]] == [e["start_time"] for e in events]
@@ -0,0 +1,93 @@
+import pytest
+import os
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Ensure we can import from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import json_io, probe_cache
+
+FAKE_PROBE = {
+    "streams": [{"codec_type": "audio", "index": 1}, {"codec_type": "video", "index": 0, "width": 320}],
+    "format": {"duration": "10.0"}
+}
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch):
+    """Empty in-memory cache and no AQC_PROBE_CACHE for every test."""
+    monkeypatch.setattr(probe_cache, "_CACHE", {})
+    monkeypatch.delenv(probe_cache.PROBE_CACHE_ENV, raising=False)
+
+@pytest.fixture
+def media(tmp_path):
+    path = tmp_path / "clip.mkv"
+    path.write_bytes(b"")
+    return path
+
+def _ffprobe_result(payload):
+    return MagicMock(stdout=json_io.dumps(payload))
+
+def test_memory_hit_skips_ffprobe(media):
+    probe_cache._CACHE[probe_cache._key(media)] = FAKE_PROBE
+    with patch("src.utils.probe_cache.subprocess.run") as run:
+        assert probe_cache.probe(media) is FAKE_PROBE
+    run.assert_not_called()
+
+def test_env_file_hit(media, tmp_path, monkeypatch):
+    cache_file = tmp_path / "blob.json"
+    json_io.write_json(cache_file, {"source": probe_cache._key(media), "probe": FAKE_PROBE})
+    monkeypatch.setenv(probe_cache.PROBE_CACHE_ENV, str(cache_file))
+
+    with patch("src.utils.probe_cache.subprocess.run") as run:
+        assert probe_cache.peek(media) == FAKE_PROBE
+    run.assert_not_called()
+    # Promoted to the in-memory cache
+    assert probe_cache._key(media) in probe_cache._CACHE
+
+def test_env_file_for_other_source_is_ignored(media, tmp_path, monkeypatch):
+    cache_file = tmp_path / "blob.json"
+    json_io.write_json(cache_file, {"source": str(tmp_path / "other.mkv"), "probe": FAKE_PROBE})
+    monkeypatch.setenv(probe_cache.PROBE_CACHE_ENV, str(cache_file))
+
+    assert probe_cache.peek(media) is None
+    fresh = {"streams": [], "format": {"duration": "3.0"}}
+    with patch("src.utils.probe_cache.subprocess.run", return_value=_ffprobe_result(fresh)) as run:
+        assert probe_cache.probe(media) == fresh
+    run.assert_called_once()
+
+def test_ffprobe_runs_once_per_file(media):
+    with patch("src.utils.probe_cache.subprocess.run", return_value=_ffprobe_result(FAKE_PROBE)) as run:
+        assert probe_cache.probe(media) == FAKE_PROBE
+        assert probe_cache.get_stream(media, "video")["index"] == 0
+        assert probe_cache.get_format(media) == {"duration": "10.0"}
+    run.assert_called_once()
+
+@pytest.mark.parametrize("stdout", [b"{}", b"not json", b""])
+def test_unusable_ffprobe_output_is_not_cached(media, stdout):
+    with patch("src.utils.probe_cache.subprocess.run", return_value=MagicMock(stdout=stdout)):
+        assert probe_cache.probe(media) is None
+        assert probe_cache.get_stream(media) is None
+        assert probe_cache.get_format(media) == {}
+    assert probe_cache._CACHE == {}
+
+def test_prime_publishes_blob_and_env(media, tmp_path):
+    with patch("src.utils.probe_cache.subprocess.run", return_value=_ffprobe_result(FAKE_PROBE)):
+        cache_file = probe_cache.prime(media, tmp_path)
+
+    assert cache_file == tmp_path / probe_cache.PROBE_CACHE_FILENAME
+    assert os.environ[probe_cache.PROBE_CACHE_ENV] == str(cache_file)
+    assert json_io.read_json(cache_file) == {"source": probe_cache._key(media), "probe": FAKE_PROBE}
+
+    # A fresh process (empty memory cache) resolves it from the file alone
+    probe_cache._CACHE.clear()
+    with patch("src.utils.probe_cache.subprocess.run") as run:
+        assert probe_cache.probe(media) == FAKE_PROBE
+    run.assert_not_called()
+
+def test_prime_without_probe_leaves_env_unset(media, tmp_path):
+    with patch("src.utils.probe_cache.subprocess.run", return_value=MagicMock(stdout=b"")):
+        assert probe_cache.prime(media, tmp_path) is None
+    assert probe_cache.PROBE_CACHE_ENV not in os.environ
+    assert not (tmp_path / probe_cache.PROBE_CACHE_FILENAME).exists()
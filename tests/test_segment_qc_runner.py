@@ -0,0 +1,116 @@
+import pytest
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# Ensure we can import from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.distributed import segment_qc_runner as runner
+
+SEGMENTS_CSV = (
+    b'clip_000.mp4,-0.021333,299.978667\n'
+    b'"Show, Ep1_001.mp4",299.978667,599.978667\n'
+    b'"say ""hi""_002.mp4",599.978667,612.500000\r\n'
+    b'\n'
+)
+
+@pytest.mark.parametrize("row, expected", [
+    (b'clip_000.mp4,-0.021333,299.978667', ("clip_000.mp4", -0.021333)),
+    (b'"Show, Ep1_001.mp4",299.978667,599.978667', ("Show, Ep1_001.mp4", 299.978667)),
+    (b'"say ""hi""_002.mp4",599.978667,612.500000\r', ('say "hi"_002.mp4', 599.978667)),
+    (b'', None),
+    (b'clip_000.mp4', None),
+    (b'clip_000.mp4,n/a,1.0', None),
+])
+def test_parse_segment_row(row, expected):
+    assert runner._parse_segment_row(row) == expected
+
+NAMES = ["clip_000.mp4", "Show, Ep1_001.mp4", 'say "hi"_002.mp4']
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "Show, Ep1.mp4"
+    path.write_bytes(b"not really a video")
+    return path
+
+def _fill_entry(entry, size=0):
+    """A completed cache entry holding NAMES (plus `size` bytes of padding)."""
+    entry.mkdir(parents=True)
+    for name in NAMES:
+        (entry / name).write_bytes(name.encode())
+    (entry / "padding.bin").write_bytes(b"\0" * size)
+    (entry / "segments.csv").write_bytes(SEGMENTS_CSV)
+    (entry / ".complete").touch()
+
+def _fake_split(input_path, segment_dir, segment_time=300):
+    """iter_segments without ffmpeg: writes NAMES into segment_dir."""
+    segment_dir = segment_dir.resolve()
+    segment_dir.mkdir(parents=True, exist_ok=True)
+    for i, name in enumerate(NAMES):
+        (segment_dir / name).write_bytes(name.encode())
+        yield segment_dir / name, float(i)
+
+def test_cache_hit_parses_quoted_rows(source, tmp_path):
+    cache = tmp_path / "cache"
+    _fill_entry(cache / runner._input_fingerprint(source.resolve(), 300))
+
+    work = tmp_path / "work"
+    with patch.object(runner, "iter_segments") as split:
+        segments = list(runner.iter_cached_segments(source, work, cache))
+    split.assert_not_called()
+
+    assert [(p.name, t) for p, t in segments] == list(zip(NAMES, [-0.021333, 299.978667, 599.978667]))
+    assert all(p.parent == work.resolve() and p.read_bytes() == p.name.encode() for p, _ in segments)
+    assert not list(cache.glob("*.lock"))
+
+def test_cache_is_opt_in(source, tmp_path, monkeypatch):
+    monkeypatch.delenv(runner.CACHE_DIR_ENV, raising=False)
+    with patch.object(runner, "iter_segments", side_effect=_fake_split) as split, \
+         patch.object(runner, "iter_cached_segments") as cached:
+        list(runner._segment_source(source, tmp_path / "work"))
+    split.assert_called_once()
+    cached.assert_not_called()
+
+    monkeypatch.setenv(runner.CACHE_DIR_ENV, str(tmp_path / "cache"))
+    with patch.object(runner, "iter_segments", side_effect=_fake_split):
+        list(runner._segment_source(source, tmp_path / "work"))
+    assert (tmp_path / "cache" / runner._input_fingerprint(source.resolve(), 300) / ".complete").exists()
+
+def test_locked_entry_splits_uncached(source, tmp_path):
+    cache = tmp_path / "cache"
+    key = runner._input_fingerprint(source.resolve(), 300)
+    cache.mkdir()
+    (cache / f"{key}.lock").touch()
+
+    work = tmp_path / "work"
+    with patch.object(runner, "iter_segments", side_effect=_fake_split):
+        segments = list(runner.iter_cached_segments(source, work, cache))
+    assert [p.parent for p, _ in segments] == [work.resolve()] * len(NAMES)
+    assert not (cache / key).exists()
+    # The other run's lock is untouched
+    assert (cache / f"{key}.lock").exists()
+
+def test_stale_lock_is_taken_over(tmp_path):
+    lock = tmp_path / "entry.lock"
+    lock.touch()
+    assert not runner._acquire_lock(lock)
+    old = time.time() - runner.CACHE_LOCK_STALE_SEC - 1
+    os.utime(lock, (old, old))
+    assert runner._acquire_lock(lock)
+
+def test_new_split_evicts_least_recently_used(source, tmp_path):
+    cache = tmp_path / "cache"
+    for age, name in [(300, "oldest"), (200, "older"), (100, "recent")]:
+        _fill_entry(cache / name, size=1000)
+        stamp = time.time() - age
+        os.utime(cache / name / ".complete", (stamp, stamp))
+    (cache / "older.lock").touch()  # In use by another run: skipped
+
+    with patch.object(runner, "iter_segments", side_effect=_fake_split):
+        list(runner.iter_cached_segments(source, tmp_path / "work", cache, max_bytes=1500))
+
+    # oldest goes first; older is locked, so recent goes next; the new entry is kept
+    key = runner._input_fingerprint(source.resolve(), 300)
+    assert sorted(p.name for p in cache.iterdir() if p.is_dir()) == sorted(["older", key])
@@ -9,7 +9,7 @@ from pathlib import Path
 
 # 1. Install Dependencies
 print("Installing dependencies...")
-subprocess.run([sys.executable, "-m", "pip", "install", "pyspark", "opencv-contrib-python-headless", "numpy", "scipy", "librosa", "pandas", "plotly", "tqdm", "scikit-image", "Pillow", "requests"], check=True)
+subprocess.run([sys.executable, "-m", "pip", "install", "pyspark", "opencv-contrib-python-headless", "numpy", "scipy", "librosa", "pandas", "plotly", "tqdm", "scikit-image", "Pillow", "requests", "requests-toolbelt"], check=True)
 
 # 2. Clone Repository
 # NOTE: If the repository is private, you may need to use a Personal Access Token (PAT)
@@ -39,6 +39,7 @@ print("Setup Complete.")
 import requests
 import time
 import json
+from requests_toolbelt import MultipartEncoder
 
 # CONFIGURATION
 # In Colab, the user will set this env var or we defaults to the production URL
@@ -288,8 +289,10 @@ def upload_remediation_result(job_id, file_path):
     print(f"Uploading fixed video to {url}...")
     try:
         with open(file_path, 'rb') as f:
-            files = {'file': (file_path.name, f, 'video/mp4')}
-            resp = requests.post(url, files=files)
+            # Streamed from the open file as the request is sent; `files=`
+            # would build the whole multipart body (the entire video) in memory
+            body = MultipartEncoder(fields={'file': (file_path.name, f, 'video/mp4')})
+            resp = requests.post(url, data=body, headers={'Content-Type': body.content_type})
             if resp.status_code != 200:
                 raise Exception(f"Upload failed: {resp.status_code} - {resp.text}")
             print(f"Remediation upload complete for Job {job_id}")